@@ -0,0 +1,67 @@
+# This file is part of the Open Data Cube, see https://opendatacube.org for more information
+#
+# Copyright (c) 2015-2024 ODC Contributors
+# SPDX-License-Identifier: Apache-2.0
+"""
+Compare throughput of the document loaders in :mod:`datacube.utils.documents`.
+
+Usage::
+
+    python benchmarks/document_loading.py [--repeat N] [DOCUMENT ...]
+
+Defaults to the EO3 dataset documents used by the integration tests. Every
+document is also converted to JSON so that JSON parsing is measured on the
+same content.
+"""
+import argparse
+import json
+import time
+from io import BytesIO
+from pathlib import Path
+
+from datacube.utils.documents import (
+    DOCUMENT_LOADERS,
+    set_document_loader,
+    load_from_yaml,
+    load_from_json,
+    orjson,
+)
+
+DEFAULT_DOCS = sorted((Path(__file__).parent.parent / 'integration_tests' / 'data' / 'eo3').glob('*dataset*.yaml'))
+
+
+def _time_it(load, blobs, repeat):
+    t0 = time.perf_counter()
+    n = 0
+    for _ in range(repeat):
+        for blob in blobs:
+            n += len(list(load(BytesIO(blob))))
+    return n, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n', 1)[0])
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('paths', nargs='*', type=Path, default=DEFAULT_DOCS)
+    args = parser.parse_args()
+
+    yaml_blobs = [p.read_bytes() for p in args.paths]
+    set_document_loader('python')
+    json_blobs = [json.dumps(doc).encode('utf8')
+                  for blob in yaml_blobs
+                  for doc in load_from_yaml(BytesIO(blob))]
+    nbytes = {'yaml': sum(map(len, yaml_blobs)), 'json': sum(map(len, json_blobs))}
+
+    print(f'{len(args.paths)} files, {nbytes["yaml"]} bytes of YAML, repeated {args.repeat} times '
+          f'(orjson {"available" if orjson is not None else "not installed"})')
+    for fmt, load, blobs in [('yaml', load_from_yaml, yaml_blobs),
+                             ('json', load_from_json, json_blobs)]:
+        for name in DOCUMENT_LOADERS:
+            set_document_loader(name)
+            ndocs, elapsed = _time_it(load, blobs, args.repeat)
+            print(f'{fmt:4} {name:6} {ndocs / elapsed:10.1f} docs/s '
+                  f'{nbytes[fmt] * args.repeat / elapsed / 1e6:8.2f} MB/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+# This file is part of the Open Data Cube, see https://opendatacube.org for more information
+#
+# Copyright (c) 2015-2024 ODC Contributors
+# SPDX-License-Identifier: Apache-2.0
+"""
+Compare grouping of datasets with and without the vectorised path of :meth:`Datacube.group_datasets`.
+
+Usage::
+
+    python benchmarks/group_datasets.py [--datasets N] [--days N]
+
+Synthetic compact datasets are spread over the given number of days and over
+longitudes -180..180, and grouped by ``time`` and by ``solar_day``.
+"""
+import argparse
+import datetime
+import random
+import time
+import uuid
+from copy import copy
+
+from datacube import Datacube
+from datacube.api.query import query_group_by
+from datacube.model import CompactDataset, Range
+from datacube.testutils import mk_sample_product
+
+
+def mk_datasets(n, days):
+    product = mk_sample_product('bench')
+    rnd = random.Random(42)
+    t0 = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+    datasets = []
+    for _ in range(n):
+        t = t0 + datetime.timedelta(days=rnd.randrange(days), seconds=rnd.randrange(86400))
+        datasets.append(CompactDataset(uuid.UUID(int=rnd.getrandbits(128)), product,
+                                       Range(t, t), crs=None, extent=None,
+                                       mid_longitude=rnd.uniform(-180, 180)))
+    return datasets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n', 1)[0])
+    parser.add_argument('--datasets', type=int, default=500_000)
+    parser.add_argument('--days', type=int, default=365)
+    args = parser.parse_args()
+
+    datasets = mk_datasets(args.datasets, args.days)
+    print(f'{args.datasets} datasets over {args.days} days')
+    for name in ('time', 'solar_day'):
+        fast = query_group_by(name)
+        slow = copy(fast)
+        slow.key_arrays = None
+        for path, group_by in (('python', slow), ('numpy', fast)):
+            t0 = time.perf_counter()
+            sources = Datacube.group_datasets(datasets, group_by)
+            print(f'{name:9} {path:6} {time.perf_counter() - t0:7.2f}s  {sources.shape[0]} groups')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+# This file is part of the Open Data Cube, see https://opendatacube.org for more information
+#
+# Copyright (c) 2015-2024 ODC Contributors
+# SPDX-License-Identifier: Apache-2.0
+"""
+Time the planning part of a lazy ``dc.load`` over many datasets.
+
+Usage::
+
+    python benchmarks/load_planning.py [--datasets N] [--tiles N] [--chunk N]
+
+Synthetic datasets are spread over a square of Albers tiles, grouped with
+:meth:`Datacube.group_datasets` and turned into a dask graph with
+:meth:`Datacube._dask_load`, no data is read. Timings are reported for
+datasets that parse ``crs``/``grid_spatial`` on every access (as before they
+were memoised), for fresh datasets and for a second pass over the same datasets.
+"""
+import argparse
+import time
+import uuid
+
+from datacube import Datacube
+from datacube.api.query import query_group_by
+from datacube.model import Dataset
+from datacube.testutils import mk_sample_product, geobox_to_gridspatial
+from datacube.testutils.geom import AlbersGS
+from datacube.utils import geometry
+from datacube.utils.geometry import crs_cache_clear, crs_cache_info
+
+
+class _UnmemoisedDataset(Dataset):
+    @property
+    def _gs(self):
+        try:
+            return self.metadata.grid_spatial
+        except AttributeError:
+            return None
+
+    @property
+    def crs(self):
+        projection = self._gs
+        if not projection:
+            return None
+        crs = projection.get('spatial_reference', None)
+        if crs:
+            return geometry.CRS(str(crs))
+        return None
+
+
+def mk_datasets(product, n, ntiles, cls=Dataset):
+    grid_spatial = [geobox_to_gridspatial(AlbersGS.tile_geobox((10 + i, -40 + j)))
+                    for i in range(ntiles) for j in range(ntiles)]
+    return [cls(product, {'id': str(uuid.UUID(int=i + 1)),
+                          'format': {'name': 'GeoTiff'},
+                          'image': {'bands': {'a': {'path': f'{i}.tif'}}},
+                          'time': f'2020-01-{1 + i % 28:02d}T00:{i % 60:02d}:00',
+                          **grid_spatial[i % len(grid_spatial)]},
+                uris=[f'file:///data/{i}.yaml'])
+            for i in range(n)]
+
+
+def plan(datasets, geobox, measurements, chunk):
+    t0 = time.perf_counter()
+    sources = Datacube.group_datasets(datasets, query_group_by('time'))
+    t1 = time.perf_counter()
+    Datacube._dask_load(sources, geobox, measurements, {'time': 1, 'x': chunk, 'y': chunk})
+    return t1 - t0, time.perf_counter() - t1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n', 1)[0])
+    parser.add_argument('--datasets', type=int, default=100_000)
+    parser.add_argument('--tiles', type=int, default=10, help='datasets cover a square of this many tiles a side')
+    parser.add_argument('--chunk', type=int, default=1000, help='dask chunk size in pixels')
+    args = parser.parse_args()
+
+    product = mk_sample_product('bench', measurements=[dict(name='a', dtype='int16', nodata=-1, units='1')])
+    measurements = list(product.lookup_measurements(['a']).values())
+    extent = geometry.unary_union(AlbersGS.tile_geobox((10 + i, -40 + j)).extent
+                                  for i in range(args.tiles) for j in range(args.tiles))
+    geobox = geometry.GeoBox.from_geopolygon(extent, resolution=(-250, 250))
+
+    print(f'{args.datasets} datasets over {args.tiles}x{args.tiles} tiles, '
+          f'output {geobox.shape} in {args.chunk}px chunks')
+    runs = [('unmemoised', lambda: mk_datasets(product, args.datasets, args.tiles, _UnmemoisedDataset)),
+            ('fresh', lambda: mk_datasets(product, args.datasets, args.tiles))]
+    for name, mk in runs:
+        datasets = mk()
+        crs_cache_clear()
+        group_s, dask_s = plan(datasets, geobox, measurements, args.chunk)
+        print(f'{name:12} group_datasets {group_s:7.2f}s  _dask_load {dask_s:7.2f}s')
+        if name == 'fresh':
+            group_s, dask_s = plan(datasets, geobox, measurements, args.chunk)
+            print(f'{"second pass":12} group_datasets {group_s:7.2f}s  _dask_load {dask_s:7.2f}s')
+            interned = crs_cache_info()['interned']
+            print(f'interned CRS: {interned.currsize} objects, {interned.hits} hits')
+
+
+if __name__ == '__main__':
+    main()
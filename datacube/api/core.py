@@ -2,8 +2,13 @@
 #
 # Copyright (c) 2015-2024 ODC Contributors
 # SPDX-License-Identifier: Apache-2.0
+import copy
+import logging
 import uuid
+import operator
+import threading
 import collections.abc
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
 from itertools import groupby
 from typing import Set, Union, Optional, Dict, Tuple, cast
 import datetime
@@ -11,21 +16,24 @@ import datetime
 import numpy
 import xarray
 from dask import array as da
+from dask.highlevelgraph import HighLevelGraph, Layer, MaterializedLayer
 
 from datacube.config import LocalConfig
-from datacube.storage import reproject_and_fuse, BandInfo
+from datacube.storage import reproject_and_fuse, share_open_files, BandInfo
 from datacube.utils import ignore_exceptions_if
 from datacube.utils import geometry
 from datacube.utils.dates import normalise_dt
 from datacube.utils.geometry import intersects, GeoBox
 from datacube.utils.geometry.gbox import GeoboxTiles
-from datacube.model import ExtraDimensions
+from datacube.model import ExtraDimensions, materialise_datasets
 from datacube.model.utils import xr_apply
 
 from .query import Query, query_group_by, query_geopolygon
 from ..index import index_connect
 from ..drivers import new_datasource
 
+_LOG = logging.getLogger(__name__)
+
 
 class TerminateCurrentLoad(Exception):  # noqa: N818
     """ This exception is raised by user code from `progress_cbk`
@@ -198,7 +206,8 @@ class Datacube(object):
     #: pylint: disable=too-many-arguments, too-many-locals
     def load(self, product=None, measurements=None, output_crs=None, resolution=None, resampling=None,
              skip_broken_datasets=False, dask_chunks=None, like=None, fuse_func=None, align=None,
-             datasets=None, dataset_predicate=None, progress_cbk=None, patch_url=None, **query):
+             datasets=None, dataset_predicate=None, progress_cbk=None, patch_url=None,
+             max_concurrent_reads=None, overview_mode=None, dask_group_bands=False, **query):
         r"""
         Load data as an ``xarray.Dataset`` object.
         Each measurement will be a data variable in the :class:`xarray.Dataset`.
@@ -342,16 +351,38 @@ class Datacube(object):
             .. seealso::
                :meth:`load_data`
 
+        :param str|dict overview_mode:
+            How to pick the overview level of the source images when loading at a coarser resolution.
+            This could be a string or a dictionary mapping band name to mode, just like ``resampling``.
+
+            Valid values are: ::
+
+              'auto', 'nearest-finer', 'nearest', 'off'
+
+            ``'nearest-finer'`` reads the coarsest overview that is still at least as fine as the output,
+            ``'nearest'`` reads the overview closest to the output resolution, ``'off'`` always reads
+            full resolution data. Default is ``'auto'``, which leaves the choice of overview to GDAL.
+
+            When loading without ``dask_chunks`` the shrink factors source images were read at are recorded
+            in the ``dc_read_scale`` attribute of every band, ``1`` is full resolution and with
+            ``'nearest-finer'`` or ``'nearest'`` these are the decimation factors of the overviews read.
+
         :param (float,float) align:
             Load data such that point 'align' lies on the pixel boundary.
             Units are in the coordinate space of ``output_crs``.
 
             Default is ``(0, 0)``
 
-        :param dict dask_chunks:
+        :param dict|str dask_chunks:
             If the data should be lazily loaded using :class:`dask.array.Array`,
             specify the chunking size in each output dimension.
 
+            Spatial dimensions can be set to ``'auto-native'``, or supply ``dask_chunks='auto-native'`` to do so
+            for all of them: chunks are then picked to be multiples of the internal tile size of the source files
+            (as seen in output pixels) that fit within dask's ``array.chunk-size`` memory budget.
+            Working out the tile size opens a few of the source files when the load is planned,
+            before any data is read, files that fail to open are logged and skipped.
+
             See the documentation on using `xarray with dask <http://xarray.pydata.org/en/stable/dask.html>`_
             for more information.
 
@@ -402,6 +433,17 @@ class Datacube(object):
             if supplied, will be used to patch/sign the url(s), as required to access some commercial archives
             (e.g. Microsoft Planetary Computer).
 
+        :param int max_concurrent_reads:
+            Optional. If greater than 1, up to this many time slices/bands are read concurrently from a
+            pool of threads. Data is still fused into the output in the same order as a sequential load.
+            This is only applicable to non-lazy loads, ignored when using dask.
+
+        :param bool dask_group_bands:
+            Optional. When using dask, load all measurements of a chunk in a single task instead of one task per
+            measurement. Files are opened once for all the bands they hold and reprojection is set up once,
+            at the cost of reading all measurements whenever any of them is computed.
+            Ignored for non-lazy loads.
+
         :return:
             Requested data in a :class:`xarray.Dataset`
 
@@ -461,7 +503,10 @@ class Datacube(object):
                                 skip_broken_datasets=skip_broken_datasets,
                                 progress_cbk=progress_cbk,
                                 extra_dims=extra_dims,
-                                patch_url=patch_url)
+                                patch_url=patch_url,
+                                max_concurrent_reads=max_concurrent_reads,
+                                overview_mode=overview_mode,
+                                dask_group_bands=dask_group_bands)
 
         return result
 
@@ -477,7 +522,8 @@ class Datacube(object):
         """
         return list(self.find_datasets_lazy(**search_terms))
 
-    def find_datasets_lazy(self, limit=None, ensure_location=False, dataset_predicate=None, **kwargs):
+    def find_datasets_lazy(self, limit=None, ensure_location=False, dataset_predicate=None, compact=False,
+                           **kwargs):
         """
         Find datasets matching query.
 
@@ -485,6 +531,9 @@ class Datacube(object):
         :param ensure_location: only return datasets that have locations
         :param limit: if provided, limit the maximum number of datasets returned
         :param dataset_predicate: an optional predicate to filter datasets
+        :param compact: return :class:`datacube.model.CompactDataset` objects, that only keep the fields
+                        needed to group and load datasets. The rest is read back from the index on access,
+                        or in bulk for all datasets of a :meth:`load_data` call.
         :return: iterator of datasets
         :rtype: __generator[:class:`datacube.model.Dataset`]
 
@@ -494,8 +543,12 @@ class Datacube(object):
         if not query.product:
             raise ValueError("must specify a product")
 
-        datasets = self.index.datasets.search(limit=limit,
-                                              **query.search_terms)
+        if compact:
+            datasets = self.index.datasets.search_compact(limit=limit,
+                                                          **query.search_terms)
+        else:
+            datasets = self.index.datasets.search(limit=limit,
+                                                  **query.search_terms)
 
         if query.geopolygon is not None:
             datasets = select_datasets_inside_polygon(datasets, query.geopolygon)
@@ -514,7 +567,8 @@ class Datacube(object):
         """
         Group datasets along defined non-spatial dimensions (ie. time).
 
-        :param datasets: a list of datasets, typically from :meth:`find_datasets`
+        :param datasets: a list of datasets, typically from :meth:`find_datasets`. Compact datasets
+            (``find_datasets(compact=True)``) are grouped without reading their documents.
         :param GroupBy group_by: Contains:
             - a function that returns a label for a dataset
             - name of the new dimension
@@ -527,31 +581,14 @@ class Datacube(object):
         if isinstance(group_by, str):
             group_by = query_group_by(group_by=group_by)
 
-        def ds_sorter(ds):
-            return group_by.sort_key(ds), getattr(ds, 'id', 0)
-
-        def norm_axis_value(x):
-            if isinstance(x, datetime.datetime):
-                # For datetime we convert to UTC, then strip timezone info
-                # to avoid numpy/pandas warning about timezones
-                return numpy.datetime64(normalise_dt(x), 'ns')
-            return x
-
-        def mk_group(group):
-            dss = tuple(sorted(group, key=ds_sorter))
-            return (norm_axis_value(group_by.group_key(dss)), dss)
-
-        datasets = sorted(datasets, key=group_by.group_by_func)
-
-        groups = [mk_group(group)
-                  for _, group in groupby(datasets, group_by.group_by_func)]
-
-        groups.sort(key=lambda x: x[0])
-
-        coords = numpy.asarray([coord for coord, _ in groups])
-        data = numpy.empty(len(coords), dtype=object)
-        for i, (_, dss) in enumerate(groups):
-            data[i] = dss
+        datasets = list(datasets)
+        key_arrays = getattr(group_by, 'key_arrays', None)
+        grouped = None
+        if key_arrays is not None and datasets:
+            grouped = _group_by_key_arrays(datasets, key_arrays)
+        if grouped is None:
+            grouped = _group_by_funcs(datasets, group_by)
+        coords, data = grouped
 
         sources = xarray.DataArray(data,
                                    dims=[group_by.dimension],
@@ -657,27 +694,41 @@ class Datacube(object):
 
     @staticmethod
     def _dask_load(sources, geobox, measurements, dask_chunks,
-                   skip_broken_datasets=False, extra_dims=None, patch_url=None):
-        chunk_sizes = _calculate_chunk_sizes(sources, geobox, dask_chunks, extra_dims)
+                   skip_broken_datasets=False, extra_dims=None, patch_url=None,
+                   dask_group_bands=False):
+        chunk_sizes = _calculate_chunk_sizes(sources, geobox, dask_chunks, extra_dims, measurements,
+                                             patch_url=patch_url)
         needed_irr_chunks = chunk_sizes[0]
         if extra_dims:
             extra_dim_chunks = chunk_sizes[1]
         grid_chunks = chunk_sizes[-1]
         gbt = GeoboxTiles(geobox, grid_chunks)
         dsk = {}
+        dsk_name_datasets = 'dc_datasets-{}'.format(uuid.uuid4().hex)
 
         def chunk_datasets(dss, gbt):
             out = {}
             for ds in dss:
                 dsk[_tokenize_dataset(ds)] = ds
-                for idx in gbt.tiles(ds.extent):
-                    out.setdefault(idx, []).append(ds)
+            ipoly, tiles = gbt.tiles_incidence([ds.extent for ds in dss])
+            for i, idx in zip(ipoly.tolist(), tiles.tolist()):
+                out.setdefault(tuple(idx), []).append(dss[i])
             return out
 
         chunked_srcs = xr_apply(sources,
                                 lambda _, dss: chunk_datasets(dss, gbt),
                                 dtype=object)
 
+        bands_layer = None
+        if dask_group_bands:
+            # extra dimension measurements are still loaded one task per index
+            grouped = [m for m in measurements if 'extra_dim' not in m]
+            if len(grouped) > 1:
+                bands_layer = _BandsLoadLayer('dc_load_bands-{}'.format(uuid.uuid4().hex),
+                                              chunked_srcs, gbt, grouped,
+                                              skip_broken_datasets=skip_broken_datasets,
+                                              patch_url=patch_url)
+
         def data_func(measurement, shape):
             if 'extra_dim' in measurement:
                 chunks = needed_irr_chunks + extra_dim_chunks + grid_chunks
@@ -688,7 +739,10 @@ class Datacube(object):
                                     chunks=chunks,
                                     skip_broken_datasets=skip_broken_datasets,
                                     extra_dims=extra_dims,
-                                    patch_url=patch_url)
+                                    patch_url=patch_url,
+                                    dsk_name_datasets=dsk_name_datasets,
+                                    bands_layer=(bands_layer if bands_layer is not None
+                                                 and measurement.name in bands_layer.band_names else None))
 
         return Datacube.create_storage(sources.coords, geobox, measurements, data_func, extra_dims)
 
@@ -696,64 +750,96 @@ class Datacube(object):
     def _xr_load(sources, geobox, measurements,
                  skip_broken_datasets=False,
                  progress_cbk=None, extra_dims=None,
-                 patch_url=None):
+                 patch_url=None, max_concurrent_reads=None):
+        stop = threading.Event()
 
         def mk_cbk(cbk):
             if cbk is None:
                 return None
             n = 0
+            lock = threading.Lock()
             t_size = sum(len(x) for x in sources.values.ravel())
-            n_total = 0
-            for m in measurements:
-                if 'extra_dim' in m:
-                    index_subset = extra_dims.measurements_slice(m.extra_dim)
-                    n_total += t_size*len(m.extra_dim.get('measurement_map')[index_subset])
-                else:
-                    n_total += t_size
+            n_total = t_size*len(measurements)
 
             def _cbk(*ignored):
                 nonlocal n
-                n += 1
-                return cbk(n, n_total)
+                with lock:
+                    if stop.is_set():
+                        raise TerminateCurrentLoad()
+                    n += 1
+                    try:
+                        return cbk(n, n_total)
+                    except (TerminateCurrentLoad, KeyboardInterrupt):
+                        # stop other reads before the main thread gets to see the failure
+                        stop.set()
+                        raise
             return _cbk
 
         data = Datacube.create_storage(sources.coords, geobox, measurements, extra_dims=extra_dims)
         _cbk = mk_cbk(progress_cbk)
+        read_scales = {m.name: set() for m in measurements}
+
+        def done(partial=False):
+            for name, scales in read_scales.items():
+                if scales:
+                    data[name].attrs['dc_read_scale'] = tuple(sorted(scales.copy()))
+            if partial:
+                data.attrs['dc_partial_load'] = True
+            return data
 
         # Create a list of read IO operations
         read_ios = []
         for index, datasets in numpy.ndenumerate(sources.values):
             for m in measurements:
                 if 'extra_dim' in m:
-                    # When we want to support 3D native reads, we can start by replacing the for loop with
-                    # read_ios.append(((index + extra_dim_index), (datasets, m, index_subset)))
-                    index_subset = extra_dims.measurements_index(m.extra_dim)
-                    for result_index, extra_dim_index in enumerate(range(*index_subset)):
-                        read_ios.append(((index + (result_index,)), (datasets, m, extra_dim_index)))
+                    # Native 3D read: whole range of the extra dimension is read from each file at once
+                    read_ios.append((index, (datasets, m, extra_dims.measurements_slice(m.extra_dim))))
                 else:
                     # Get extra_dim index if available
                     extra_dim_index = m.get('extra_dim_index', None)
                     read_ios.append((index, (datasets, m, extra_dim_index)))
 
         # Perform the read IO operations
-        for index, (datasets, m, extra_dim_index) in read_ios:
-            data_slice = data[m.name].values[index]
+        if max_concurrent_reads is None or max_concurrent_reads <= 1:
+            for index, (datasets, m, extra_dim_index) in read_ios:
+                data_slice = data[m.name].values[index]
+                try:
+                    _fuse_measurement(data_slice, datasets, geobox, m,
+                                      skip_broken_datasets=skip_broken_datasets,
+                                      progress_cbk=_cbk, extra_dim_index=extra_dim_index,
+                                      patch_url=patch_url, read_scale_cbk=read_scales[m.name].add)
+                except (TerminateCurrentLoad, KeyboardInterrupt):
+                    return done(partial=True)
+
+            return done()
+
+        # Every read IO operation writes into its own slice of the output, fusing of
+        # datasets within a slice still happens sequentially in the worker thread.
+        with ThreadPoolExecutor(max_workers=max_concurrent_reads) as pool:
+            futures = [pool.submit(_fuse_measurement,
+                                   data[m.name].values[index], datasets, geobox, m,
+                                   skip_broken_datasets=skip_broken_datasets,
+                                   progress_cbk=_cbk, extra_dim_index=extra_dim_index,
+                                   patch_url=patch_url, read_scale_cbk=read_scales[m.name].add)
+                       for index, (datasets, m, extra_dim_index) in read_ios]
             try:
-                _fuse_measurement(data_slice, datasets, geobox, m,
-                                  skip_broken_datasets=skip_broken_datasets,
-                                  progress_cbk=_cbk, extra_dim_index=extra_dim_index,
-                                  patch_url=patch_url)
+                finished, _ = wait(futures, return_when=FIRST_EXCEPTION)
+                for f in finished:
+                    f.result()
             except (TerminateCurrentLoad, KeyboardInterrupt):
-                data.attrs['dc_partial_load'] = True
-                return data
+                _cancel_reads(futures, stop)
+                return done(partial=True)
+            except Exception:
+                _cancel_reads(futures, stop)
+                raise
 
-        return data
+        return done()
 
     @staticmethod
     def load_data(sources, geobox, measurements, resampling=None,
                   fuse_func=None, dask_chunks=None, skip_broken_datasets=False,
                   progress_cbk=None, extra_dims=None, patch_url=None,
-                  **extra):
+                  max_concurrent_reads=None, overview_mode=None, dask_group_bands=False, **extra):
         """
         Load data from :meth:`group_datasets` into an :class:`xarray.Dataset`.
 
@@ -780,11 +866,17 @@ class Datacube(object):
         :param fuse_func:
             function to merge successive arrays as an output. Can be a dictionary just like resampling.
 
-        :param dict dask_chunks:
+        :param str|dict overview_mode:
+            How to pick the overview level when loading at a coarser resolution, one of
+            ``'auto', 'nearest-finer', 'nearest', 'off'``. Can be a dictionary just like resampling.
+
+        :param dict|str dask_chunks:
             If provided, the data will be loaded on demand using using :class:`dask.array.Array`.
             Should be a dictionary specifying the chunking size for each output dimension.
             Unspecified dimensions will be auto-guessed, currently this means use chunk size of 1 for non-spatial
             dimensions and use whole dimension (no chunking unless specified) for spatial dimensions.
+            Use ``'auto-native'`` for spatial dimensions (or as the whole value) to align chunks with the
+            internal tiling of the source files, a few of the source files are opened to find it.
 
             See the documentation on using `xarray with dask <http://xarray.pydata.org/en/stable/dask.html>`_
             for more information.
@@ -799,23 +891,36 @@ class Datacube(object):
         :param Callable[[str], str], patch_url:
             if supplied, will be used to patch/sign the url(s), as required to access some commercial archives.
 
+        :param int max_concurrent_reads:
+            if greater than 1, read up to this many time slices/bands concurrently. This is only applicable
+            to non-lazy loads, ignored when using dask.
+
+        :param bool dask_group_bands:
+            if ``True`` load all measurements of a chunk in one dask task, see :meth:`load`.
+
         :rtype: xarray.Dataset
 
         .. seealso:: :meth:`find_datasets` :meth:`group_datasets`
         """
-        measurements = per_band_load_data_settings(measurements, resampling=resampling, fuse_func=fuse_func)
+        measurements = per_band_load_data_settings(measurements, resampling=resampling, fuse_func=fuse_func,
+                                                   overview_mode=overview_mode)
+
+        # Read compact datasets back in bulk, rather than one at a time as they are read or pickled
+        materialise_datasets(ds for dss in sources.values.ravel() for ds in dss)
 
         if dask_chunks is not None:
             return Datacube._dask_load(sources, geobox, measurements, dask_chunks,
                                        skip_broken_datasets=skip_broken_datasets,
                                        extra_dims=extra_dims,
-                                       patch_url=patch_url)
+                                       patch_url=patch_url,
+                                       dask_group_bands=dask_group_bands)
         else:
             return Datacube._xr_load(sources, geobox, measurements,
                                      skip_broken_datasets=skip_broken_datasets,
                                      progress_cbk=progress_cbk,
                                      extra_dims=extra_dims,
-                                     patch_url=patch_url)
+                                     patch_url=patch_url,
+                                     max_concurrent_reads=max_concurrent_reads)
 
     def __str__(self):
         return "Datacube<index={!r}>".format(self.index)
@@ -836,12 +941,17 @@ class Datacube(object):
         self.close()
 
 
-def per_band_load_data_settings(measurements, resampling=None, fuse_func=None):
+def per_band_load_data_settings(measurements, resampling=None, fuse_func=None, overview_mode=None):
     def with_resampling(m, resampling, default=None):
         m = m.copy()
         m['resampling_method'] = resampling.get(m.name, default)
         return m
 
+    def with_overview_mode(m, overview_mode, default=None):
+        m = m.copy()
+        m['overview_mode'] = overview_mode.get(m.name, default)
+        return m
+
     def with_fuser(m, fuser, default=None):
         m = m.copy()
         m['fuser'] = fuser.get(m.name, default)
@@ -850,6 +960,9 @@ def per_band_load_data_settings(measurements, resampling=None, fuse_func=None):
     if isinstance(resampling, str):
         resampling = {'*': resampling}
 
+    if isinstance(overview_mode, str):
+        overview_mode = {'*': overview_mode}
+
     if not isinstance(fuse_func, dict):
         fuse_func = {'*': fuse_func}
 
@@ -864,6 +977,10 @@ def per_band_load_data_settings(measurements, resampling=None, fuse_func=None):
         measurements = [with_fuser(m, fuse_func, default=fuse_func.get('*'))
                         for m in measurements]
 
+    if overview_mode is not None:
+        measurements = [with_overview_mode(m, overview_mode, default=overview_mode.get('*', 'auto'))
+                        for m in measurements]
+
     return measurements
 
 
@@ -950,11 +1067,42 @@ def fuse_lazy(datasets, geobox, measurement,
     return data.reshape(prepend_shape + geobox.shape)
 
 
+def fuse_lazy_bands(datasets, geobox, measurements,
+                    skip_broken_datasets=False, prepend_dims=0, patch_url=None):
+    """
+    Load several measurements of the same datasets in one go.
+
+    Files are opened once for all the bands they contain.
+
+    :returns: Tuple of arrays, one per measurement
+    """
+    prepend_shape = (1,) * prepend_dims
+    out = []
+    with share_open_files():
+        for m in measurements:
+            data = numpy.full(geobox.shape, m.nodata, dtype=m.dtype)
+            _fuse_measurement(data, datasets, geobox, m,
+                              skip_broken_datasets=skip_broken_datasets,
+                              extra_dim_index=m.get('extra_dim_index', None),
+                              patch_url=patch_url)
+            out.append(data.reshape(prepend_shape + geobox.shape))
+    return tuple(out)
+
+
+def _cancel_reads(futures, stop):
+    """ Cancel read IO operations that haven't started yet, and signal running ones to stop.
+    """
+    stop.set()
+    for f in futures:
+        f.cancel()
+
+
 def _fuse_measurement(dest, datasets, geobox, measurement,
                       skip_broken_datasets=False,
                       progress_cbk=None,
                       extra_dim_index=None,
-                      patch_url=None):
+                      patch_url=None,
+                      read_scale_cbk=None):
     srcs = []
     for ds in datasets:
         src = None
@@ -977,7 +1125,9 @@ def _fuse_measurement(dest, datasets, geobox, measurement,
                        fuse_func=measurement.get('fuser', None),
                        skip_broken_datasets=skip_broken_datasets,
                        progress_cbk=progress_cbk,
-                       extra_dim_index=extra_dim_index)
+                       extra_dim_index=extra_dim_index,
+                       overview_mode=measurement.get('overview_mode', 'auto'),
+                       read_scale_cbk=read_scale_cbk)
 
 
 def get_bounds(datasets, crs):
@@ -985,15 +1135,106 @@ def get_bounds(datasets, crs):
     return geometry.box(*bbox, crs=crs)
 
 
+def _sample_datasets(sources: xarray.DataArray, n: int):
+    """ Return up to ``n`` distinct datasets from grouped sources, spread across the groups.
+    """
+    groups = [dss for dss in sources.values.ravel() if dss]
+    if not groups:
+        return []
+
+    step = max(1, len(groups) // n)
+    seen = {}
+    for dss in groups[::step]:
+        ds = dss[0]
+        seen.setdefault(ds.id, ds)
+        if len(seen) >= n:
+            break
+    return list(seen.values())
+
+
+def _native_tile_shape(datasets, geobox: GeoBox, measurements,
+                       patch_url=None) -> Optional[Tuple[int, int]]:
+    """ Size of the source tiles/blocks expressed in output pixels.
+
+    Opens band files of the supplied datasets and looks at internal block layout,
+    accounting for the change of resolution between source and output. Largest
+    tile size seen is reported, ``None`` if block layout couldn't be established.
+    Files that can not be opened are logged as warnings and skipped.
+    """
+    from datacube.storage._read import rdr_geobox
+    from datacube.utils.geometry import compute_reproject_roi
+
+    tile = None
+    for ds in datasets:
+        for m in measurements:
+            try:
+                src = new_datasource(BandInfo(ds, m.name, patch_url=patch_url))
+                if src is None:
+                    continue
+                with src.open() as rdr:
+                    block_shape = rdr.block_shape
+                    if block_shape is None:
+                        continue
+                    sx, sy = compute_reproject_roi(rdr_geobox(rdr), geobox).scale2
+            except Exception as e:  # pylint: disable=broad-except
+                _LOG.warning("Failed to read tile shape of band %s of dataset %s: %s", m.name, ds.id, e)
+                continue
+
+            by, bx = block_shape
+            ty, tx = max(1, int(round(by/sy))), max(1, int(round(bx/sx)))
+            if tile is None or ty*tx > tile[0]*tile[1]:
+                tile = (ty, tx)
+    return tile
+
+
+def _native_chunk_shape(sources: xarray.DataArray,
+                        geobox: GeoBox,
+                        measurements,
+                        other_chunk_elements: int = 1,
+                        budget: Optional[int] = None,
+                        sample_size: int = 3,
+                        patch_url=None) -> Tuple[int, int]:
+    """ Pick spatial chunk shape that is a multiple of the source tile size.
+
+    Chunks are square-ish multiples of the source tile shape (see :func:`_native_tile_shape`)
+    as large as possible while staying under ``budget`` bytes per chunk, by default
+    dask's ``array.chunk-size`` configuration is used as a budget.
+    """
+    import dask
+    from dask.utils import parse_bytes
+
+    if budget is None:
+        budget = parse_bytes(dask.config.get('array.chunk-size'))
+
+    measurements = [m for m in measurements if 'extra_dim' not in m] or list(measurements)
+    itemsize = max((numpy.dtype(m.dtype).itemsize for m in measurements), default=1)
+
+    tile = _native_tile_shape(_sample_datasets(sources, sample_size), geobox, measurements, patch_url=patch_url)
+    ty, tx = tile if tile is not None else (1, 1)
+
+    max_pixels = max(1, budget // (itemsize*max(1, other_chunk_elements)))
+    k = max(1, int((max_pixels / (ty*tx))**0.5))
+
+    ny, nx = geobox.shape
+    return (min(k*ty, ny), min(k*tx, nx))
+
+
 def _calculate_chunk_sizes(sources: xarray.DataArray,
                            geobox: GeoBox,
-                           dask_chunks: Dict[str, Union[str, int]],
-                           extra_dims: Optional[ExtraDimensions] = None):
+                           dask_chunks: Union[str, Dict[str, Union[str, int]]],
+                           extra_dims: Optional[ExtraDimensions] = None,
+                           measurements=None,
+                           patch_url=None):
     extra_dim_names: Tuple[str, ...] = ()
     extra_dim_shapes: Tuple[int, ...] = ()
     if extra_dims is not None:
         extra_dim_names, extra_dim_shapes = extra_dims.chunk_size()
 
+    if isinstance(dask_chunks, str):
+        if dask_chunks != "auto-native":
+            raise ValueError("dask_chunks should be a dictionary or 'auto-native'")
+        dask_chunks = {str(dim): "auto-native" for dim in geobox.dimensions}
+
     valid_keys = sources.dims + extra_dim_names + geobox.dimensions
     bad_keys = cast(Set[str], set(dask_chunks)) - cast(Set[str], set(valid_keys))
     if bad_keys:
@@ -1006,18 +1247,33 @@ def _calculate_chunk_sizes(sources: xarray.DataArray,
     chunk_defaults = dict([(dim, 1) for dim in sources.dims] + [(dim, 1) for dim in extra_dim_names]
                           + [(dim, -1) for dim in geobox.dimensions])
 
+    native: Dict[str, int] = {}
+
     def _resolve(k, v: Optional[Union[str, int]]) -> int:
         if v is None or v == "auto":
             v = _resolve(k, chunk_defaults[k])
 
+        if v == "auto-native":
+            if k not in native:
+                raise ValueError("'auto-native' chunking is only supported for spatial dimensions")
+            return native[k]
+
         if isinstance(v, int):
             if v < 0:
                 return chunk_maxsz[k]
             return v
-        raise ValueError("Chunk should be one of int|'auto'")
+        raise ValueError("Chunk should be one of int|'auto'|'auto-native'")
 
     irr_chunks = tuple(_resolve(dim, dask_chunks.get(str(dim))) for dim in sources.dims)
     extra_dim_chunks = tuple(_resolve(dim, dask_chunks.get(str(dim))) for dim in extra_dim_names)
+
+    if any(dask_chunks.get(str(dim)) == "auto-native" for dim in geobox.dimensions):
+        other_chunk_elements = int(numpy.prod(irr_chunks + extra_dim_chunks))
+        native.update(zip(geobox.dimensions,
+                          _native_chunk_shape(sources, geobox, measurements or [],
+                                              other_chunk_elements=other_chunk_elements,
+                                              patch_url=patch_url)))
+
     grid_chunks = tuple(_resolve(dim, dask_chunks.get(str(dim))) for dim in geobox.dimensions)
 
     if extra_dim_chunks:
@@ -1026,11 +1282,251 @@ def _calculate_chunk_sizes(sources: xarray.DataArray,
         return irr_chunks, grid_chunks
 
 
+def _group_by_funcs(datasets, group_by):
+    def ds_sorter(ds):
+        return group_by.sort_key(ds), getattr(ds, 'id', 0)
+
+    def norm_axis_value(x):
+        if isinstance(x, datetime.datetime):
+            # For datetime we convert to UTC, then strip timezone info
+            # to avoid numpy/pandas warning about timezones
+            return numpy.datetime64(normalise_dt(x), 'ns')
+        return x
+
+    def mk_group(group):
+        dss = tuple(sorted(group, key=ds_sorter))
+        return (norm_axis_value(group_by.group_key(dss)), dss)
+
+    datasets = sorted(datasets, key=group_by.group_by_func)
+
+    groups = [mk_group(group)
+              for _, group in groupby(datasets, group_by.group_by_func)]
+
+    groups.sort(key=lambda x: x[0])
+
+    coords = numpy.asarray([coord for coord, _ in groups])
+    data = numpy.empty(len(coords), dtype=object)
+    for i, (_, dss) in enumerate(groups):
+        data[i] = dss
+    return coords, data
+
+
+def _group_by_key_arrays(datasets, key_arrays):
+    """
+    Same grouping as :func:`_group_by_funcs`, sorting once on arrays of keys.
+
+    Datasets are ordered by group identifier, sort key and id, the coordinate of a group is
+    the sort key of its first dataset.
+
+    Returns ``None`` when dataset ids can not be ordered against each other, the caller
+    should then fall back to :func:`_group_by_funcs`.
+    """
+    ids = numpy.empty(len(datasets), dtype=object)
+    ids[:] = [getattr(ds, 'id', 0) for ds in datasets]
+    try:
+        _, id_rank = numpy.unique(ids, return_inverse=True)
+    except TypeError:
+        return None
+
+    group_keys, sort_keys = key_arrays(datasets)
+    order = numpy.lexsort((id_rank.ravel(), sort_keys, group_keys))
+    group_keys = group_keys[order]
+    starts = numpy.flatnonzero(numpy.r_[True, group_keys[1:] != group_keys[:-1]])
+    ends = numpy.r_[starts[1:], len(order)]
+
+    coords = sort_keys[order][starts]
+    by_coord = numpy.argsort(coords, kind='stable')
+
+    ordered = [datasets[i] for i in order.tolist()]
+    data = numpy.empty(len(starts), dtype=object)
+    for i, g in enumerate(by_coord.tolist()):
+        data[i] = tuple(ordered[starts[g]:ends[g]])
+    return coords[by_coord], data
+
+
 def _tokenize_dataset(dataset):
     return 'dataset-{}'.format(dataset.id.hex)
 
 
-# pylint: disable=too-many-locals
+class _LoadLayer(Layer):
+    """
+    Graph layer with one load task per output chunk of a single measurement.
+
+    Only the dataset tokens of non-empty chunks are stored, tasks are generated
+    on access, so size of the layer scales with the number of non-empty chunks.
+    Dataset objects themselves live in a separate layer shared by all measurements.
+    Culling keeps the layer lazy, restricted to the requested chunks.
+    """
+
+    def __init__(self, name, chunked_srcs, gbt, measurement,
+                 skip_broken_datasets=False, extra_dim_indexes=None, patch_url=None,
+                 bands_layer=None):
+        super().__init__()
+        self.name = name
+        self.gbt = gbt
+        self.measurement = measurement
+        self.skip_broken_datasets = skip_broken_datasets
+        self.extra_dim_indexes = extra_dim_indexes
+        self.patch_url = patch_url
+        self.bands = None
+        if bands_layer is not None:
+            # pick this measurement from the output of a multi-band task
+            self.bands = (bands_layer.name, bands_layer.band_names.index(measurement.name))
+
+        extra_shape = () if extra_dim_indexes is None else (len(extra_dim_indexes),)
+        self.block_shape = chunked_srcs.shape + extra_shape + gbt.shape
+        self.srcs = {irr_index + idx: [_tokenize_dataset(ds) for ds in dss]
+                     for irr_index, tiled_dss in numpy.ndenumerate(chunked_srcs.values)
+                     for idx, dss in tiled_dss.items()}
+        # set of keys when culled, otherwise every chunk of block_shape
+        self.culled_keys = None
+
+    def _block_index(self, key):
+        if not (isinstance(key, tuple) and len(key) == len(self.block_shape) + 1 and key[0] == self.name):
+            raise KeyError(key)
+        index = key[1:]
+        if not all(isinstance(i, (int, numpy.integer)) and 0 <= i < n for i, n in zip(index, self.block_shape)):
+            raise KeyError(key)
+        if self.culled_keys is not None and key not in self.culled_keys:
+            raise KeyError(key)
+        return index
+
+    def _src_index(self, index):
+        if self.extra_dim_indexes is None:
+            return index
+        return index[:-3] + index[-2:]
+
+    def __getitem__(self, key):
+        index = self._block_index(key)
+
+        m = self.measurement
+        prepend_dims = len(index) - 2
+        idx = index[-2:]
+
+        tokens = self.srcs.get(self._src_index(index), None)
+        if self.extra_dim_indexes is None:
+            extra_dim_index = m.get('extra_dim_index', None)
+        else:
+            extra_dim_index = self.extra_dim_indexes[index[-3]]
+
+        if tokens is None:
+            return (numpy.full, (1,)*prepend_dims + self.gbt.chunk_shape(idx), m.nodata, m.dtype)
+
+        if self.bands is not None:
+            bands_name, band_index = self.bands
+            return (operator.getitem, (bands_name, *index), band_index)
+
+        return (fuse_lazy,
+                tokens,
+                self.gbt[idx],
+                m,
+                self.skip_broken_datasets,
+                prepend_dims,
+                extra_dim_index,
+                self.patch_url)
+
+    def __iter__(self):
+        if self.culled_keys is not None:
+            return iter(self.culled_keys)
+        return ((self.name, *index) for index in numpy.ndindex(self.block_shape))
+
+    def __len__(self):
+        if self.culled_keys is not None:
+            return len(self.culled_keys)
+        return int(numpy.prod(self.block_shape))
+
+    def is_materialized(self):
+        return False
+
+    def get_output_keys(self):
+        return set(self)
+
+    def get_dependencies(self, key, all_hlg_keys):
+        index = self._block_index(key)
+        tokens = self.srcs.get(self._src_index(index), None)
+        if tokens is None:
+            return set()
+        if self.bands is not None:
+            return {(self.bands[0], *index)}
+        return set(tokens)
+
+    def cull(self, keys, all_hlg_keys):
+        deps = {key: self.get_dependencies(key, all_hlg_keys) for key in keys}
+        if len(keys) == len(self):
+            return self, deps
+
+        culled = copy.copy(self)
+        culled.culled_keys = frozenset(keys)
+        src_indexes = {self._src_index(key[1:]) for key in keys}
+        culled.srcs = {index: tokens for index, tokens in self.srcs.items() if index in src_indexes}
+        return culled, deps
+
+
+class _BandsLoadLayer(Layer):
+    """
+    Graph layer with one task per non-empty chunk loading several measurements at once.
+
+    Each task produces a tuple of arrays, one per measurement, that is split into
+    per measurement arrays by :class:`_LoadLayer` constructed with ``bands_layer=``.
+    Culling keeps the layer lazy, restricted to the requested chunks.
+    """
+
+    def __init__(self, name, chunked_srcs, gbt, measurements,
+                 skip_broken_datasets=False, patch_url=None):
+        super().__init__()
+        self.name = name
+        self.gbt = gbt
+        self.measurements = list(measurements)
+        self.band_names = [m.name for m in self.measurements]
+        self.skip_broken_datasets = skip_broken_datasets
+        self.patch_url = patch_url
+        self.prepend_dims = len(chunked_srcs.shape)
+        self.srcs = {irr_index + idx: [_tokenize_dataset(ds) for ds in dss]
+                     for irr_index, tiled_dss in numpy.ndenumerate(chunked_srcs.values)
+                     for idx, dss in tiled_dss.items()}
+
+    def __getitem__(self, key):
+        if not (isinstance(key, tuple) and key[0] == self.name):
+            raise KeyError(key)
+        tokens = self.srcs.get(key[1:], None)
+        if tokens is None:
+            raise KeyError(key)
+
+        return (fuse_lazy_bands,
+                tokens,
+                self.gbt[key[-2:]],
+                self.measurements,
+                self.skip_broken_datasets,
+                self.prepend_dims,
+                self.patch_url)
+
+    def __iter__(self):
+        return ((self.name, *index) for index in self.srcs)
+
+    def __len__(self):
+        return len(self.srcs)
+
+    def is_materialized(self):
+        return False
+
+    def get_output_keys(self):
+        return set(self)
+
+    def get_dependencies(self, key, all_hlg_keys):
+        if not (isinstance(key, tuple) and key[0] == self.name) or key[1:] not in self.srcs:
+            raise KeyError(key)
+        return set(self.srcs[key[1:]])
+
+    def cull(self, keys, all_hlg_keys):
+        deps = {key: self.get_dependencies(key, all_hlg_keys) for key in keys}
+        if len(keys) == len(self):
+            return self, deps
+
+        culled = copy.copy(self)
+        culled.srcs = {key[1:]: self.srcs[key[1:]] for key in keys}
+        return culled, deps
+
+
 def _make_dask_array(chunked_srcs,
                      dsk,
                      gbt,
@@ -1038,78 +1534,49 @@ def _make_dask_array(chunked_srcs,
                      chunks,
                      skip_broken_datasets=False,
                      extra_dims=None,
-                     patch_url=None):
-    dsk = dsk.copy()  # this contains mapping from dataset id to dataset object
-
+                     patch_url=None,
+                     dsk_name_datasets=None,
+                     bands_layer=None):
+    """
+    :param dsk: Mapping from dataset token to dataset object, shared between measurements
+    :param dsk_name_datasets: Name of the graph layer holding ``dsk``, should be the same
+                              for all measurements of one load so that datasets are not duplicated
+    :param bands_layer: Optional :class:`_BandsLoadLayer` that loads this measurement together with others
+    """
     token = uuid.uuid4().hex
     dsk_name = 'dc_load_{name}-{token}'.format(name=measurement.name, token=token)
+    if dsk_name_datasets is None:
+        dsk_name_datasets = 'dc_datasets-{token}'.format(token=token)
 
     needed_irr_chunks, grid_chunks = chunks[:-2], chunks[-2:]
     actual_irr_chunks = (1,) * len(needed_irr_chunks)
 
-    # we can have up to 4 empty chunk shapes: whole, right edge, bottom edge and
-    # bottom right corner
-    #  W R
-    #  B BR
-    empties = {}  # type Dict[Tuple[int,int], str]
-
-    def _mk_empty(shape: Tuple[int, ...]) -> str:
-        name = empties.get(shape, None)
-        if name is not None:
-            return name
-
-        name = 'empty_{}x{}-{token}'.format(*shape, token=token)
-        dsk[name] = (numpy.full, actual_irr_chunks + shape, measurement.nodata, measurement.dtype)
-        empties[shape] = name
-
-        return name
-
-    for irr_index, tiled_dss in numpy.ndenumerate(chunked_srcs.values):
-        key_prefix = (dsk_name, *irr_index)
-
-        # all spatial chunks
-        for idx in numpy.ndindex(gbt.shape):
-            dss = tiled_dss.get(idx, None)
-
-            if dss is None:
-                val = _mk_empty(gbt.chunk_shape(idx))
-                # 3D case
-                if 'extra_dim' in measurement:
-                    index_subset = extra_dims.measurements_index(measurement.extra_dim)
-                    for result_index, extra_dim_index in numpy.ndenumerate(range(*index_subset)):
-                        dsk[key_prefix + result_index + idx] = val
-                else:
-                    dsk[key_prefix + idx] = val
-            else:
-                val = (fuse_lazy,
-                       [_tokenize_dataset(ds) for ds in dss],
-                       gbt[idx],
-                       measurement,
-                       skip_broken_datasets,
-                       len(needed_irr_chunks))
+    extra_dim_shape = ()
+    extra_dim_indexes = None
+    if 'extra_dim' in measurement:
+        # Do extra_dim subsetting here
+        extra_dim_indexes = range(*extra_dims.measurements_index(measurement.extra_dim))
+        extra_dim_shape += (len(extra_dim_indexes),)
 
-                # 3D case
-                if 'extra_dim' in measurement:
-                    # Do extra_dim subsetting here
-                    index_subset = extra_dims.measurements_index(measurement.extra_dim)
-                    for result_index, extra_dim_index in enumerate(range(*index_subset)):
-                        dsk[key_prefix + (result_index,) + idx] = val + (extra_dim_index, patch_url)
-                else:
-                    # Get extra_dim index if available
-                    extra_dim_index = measurement.get('extra_dim_index', None)
-                    dsk[key_prefix + idx] = val + (extra_dim_index, patch_url)
+    layer = _LoadLayer(dsk_name, chunked_srcs, gbt, measurement,
+                       skip_broken_datasets=skip_broken_datasets,
+                       extra_dim_indexes=extra_dim_indexes,
+                       patch_url=patch_url,
+                       bands_layer=bands_layer)
+    layers = {dsk_name: layer, dsk_name_datasets: MaterializedLayer(dsk)}
+    dependencies = {dsk_name: {dsk_name_datasets}, dsk_name_datasets: set()}
+    if bands_layer is not None:
+        layers[bands_layer.name] = bands_layer
+        dependencies[bands_layer.name] = {dsk_name_datasets}
+        dependencies[dsk_name] = {bands_layer.name}
+    graph = HighLevelGraph(layers, dependencies=dependencies)
 
     y_shapes = [grid_chunks[0]]*gbt.shape[0]
     x_shapes = [grid_chunks[1]]*gbt.shape[1]
 
     y_shapes[-1], x_shapes[-1] = gbt.chunk_shape(tuple(n-1 for n in gbt.shape))
 
-    extra_dim_shape = ()
-    if 'extra_dim' in measurement:
-        dim_name = measurement.extra_dim
-        extra_dim_shape += (len(extra_dims.measurements_values(dim_name)),)
-
-    data = da.Array(dsk, dsk_name,
+    data = da.Array(graph, dsk_name,
                     chunks=actual_irr_chunks + (tuple(y_shapes), tuple(x_shapes)),
                     dtype=measurement.dtype,
                     shape=(chunked_srcs.shape + extra_dim_shape + gbt.base.shape))
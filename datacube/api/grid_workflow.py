@@ -208,31 +208,33 @@ class GridWorkflow(object):
             return cells
         else:
             datasets, query = self._find_datasets(geopolygon, indexers)
+            datasets = list(datasets)
             geobox_cache = {}
 
+            query_tiles = None
             if query.geopolygon:
-                # Get a rough region of tiles
+                # Get a rough region of tiles, tiles are not buffered when querying by polygon
                 query_tiles = set(
-                    tile_index for tile_index, tile_geobox in
+                    tile_index for tile_index, _ in
                     self.grid_spec.tiles_from_geopolygon(query.geopolygon, geobox_cache=geobox_cache))
-
-                for dataset in datasets:
-                    # Go through our datasets and see which tiles each dataset produces, and whether they intersect
-                    # our query geopolygon.
-                    dataset_extent = dataset.extent.to_crs(self.grid_spec.crs)
-                    bbox = dataset_extent.boundingbox
-                    bbox = bbox.buffered(*tile_buffer) if tile_buffer else bbox
-
-                    for tile_index, tile_geobox in self.grid_spec.tiles(bbox, geobox_cache=geobox_cache):
-                        if tile_index in query_tiles and intersects(tile_geobox.extent, dataset_extent):
-                            add_dataset_to_cells(tile_index, tile_geobox, dataset)
-
-            else:
-                for dataset in datasets:
-                    for tile_index, tile_geobox in self.grid_spec.tiles_from_geopolygon(dataset.extent,
-                                                                                        tile_buffer=tile_buffer,
-                                                                                        geobox_cache=geobox_cache):
-                        add_dataset_to_cells(tile_index, tile_geobox, dataset)
+                tile_buffer = None
+
+            def tile_geobox(tile_index):
+                gbox = geobox_cache.get(tile_index)
+                if gbox is None:
+                    gbox = self.grid_spec.tile_geobox(tile_index)
+                    gbox = gbox.buffered(*tile_buffer) if tile_buffer else gbox
+                    geobox_cache[tile_index] = gbox
+                return gbox
+
+            # Tiles of all datasets at once
+            ipoly, tile_indexes = self.grid_spec.tiles_incidence([dataset.extent for dataset in datasets],
+                                                                 tile_buffer=tile_buffer)
+            tile_indexes = [tuple(tile_index) for tile_index in tile_indexes.tolist()]
+
+            for i, tile_index in zip(ipoly.tolist(), tile_indexes):
+                if query_tiles is None or tile_index in query_tiles:
+                    add_dataset_to_cells(tile_index, tile_geobox(tile_index), datasets[i])
 
             return cells
 
@@ -18,7 +18,7 @@ from pandas import to_datetime as pandas_to_datetime
 import numpy as np
 
 
-from ..model import Range, Dataset
+from ..model import Range, Dataset, CompactDataset
 from ..utils import geometry
 from ..utils.dates import normalise_dt, tz_aware
 
@@ -26,7 +26,7 @@ _LOG = logging.getLogger(__name__)
 
 
 class GroupBy:
-    def __init__(self, group_by_func, dimension, units, sort_key=None, group_key=None):
+    def __init__(self, group_by_func, dimension, units, sort_key=None, group_key=None, key_arrays=None):
         """
         GroupBy Object
 
@@ -36,8 +36,13 @@ class GroupBy:
         :param sort_key: how to sort datasets in a group internally
         :param group_key: the coordinate value for a group
                           list[Dataset] -> coord value
+        :param key_arrays: optional vectorised grouping,
+                           list[Dataset] -> (group identifiers, sort keys) as numpy arrays.
+                           Only valid when the coordinate value of a group is the sort key
+                           of its first dataset.
         """
         self.group_by_func = group_by_func
+        self.key_arrays = key_arrays
 
         self.dimension = dimension
         self.units = units
@@ -190,6 +195,23 @@ def _extract_time_from_ds(ds: Dataset) -> datetime.datetime:
     return normalise_dt(ds.center_time)
 
 
+def _time_key_arrays(datasets):
+    times = np.array([_extract_time_from_ds(ds) for ds in datasets], dtype='datetime64[ns]')
+    return times, times
+
+
+def _solar_day_key_arrays(datasets):
+    lons = np.array([_ds_mid_longitude(ds) for ds in datasets], dtype='float64')
+    if np.isnan(lons).any():
+        raise ValueError('Cannot compute solar_day: dataset is missing spatial info')
+    utc = np.array([ds.center_time.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+                    for ds in datasets], dtype='datetime64[ns]')
+    # as in _convert_to_solar_time: offset truncated to whole seconds
+    offsets = np.trunc(lons * 240).astype('int64').astype('timedelta64[s]')
+    days = (utc + offsets).astype('datetime64[D]')
+    return days, _time_key_arrays(datasets)[0]
+
+
 def query_group_by(group_by='time', **kwargs):
     """
     Group by function for loading datasets
@@ -215,13 +237,15 @@ def query_group_by(group_by='time', **kwargs):
 
     time_grouper = GroupBy(group_by_func=_extract_time_from_ds,
                            dimension='time',
-                           units='seconds since 1970-01-01 00:00:00')
+                           units='seconds since 1970-01-01 00:00:00',
+                           key_arrays=_time_key_arrays)
 
     solar_day_grouper = GroupBy(group_by_func=solar_day,
                                 dimension='time',
                                 units='seconds since 1970-01-01 00:00:00',
                                 sort_key=_extract_time_from_ds,
-                                group_key=lambda datasets: _extract_time_from_ds(datasets[0]))
+                                group_key=lambda datasets: _extract_time_from_ds(datasets[0]),
+                                key_arrays=_solar_day_key_arrays)
 
     group_by_map = {
         None: time_grouper,
@@ -352,6 +376,8 @@ def _convert_to_solar_time(utc, longitude):
 
 
 def _ds_mid_longitude(dataset: Dataset) -> Optional[float]:
+    if isinstance(dataset, CompactDataset):
+        return dataset.mid_longitude
     m = dataset.metadata
     if hasattr(m, 'lon'):
         lon = m.lon
@@ -0,0 +1,146 @@
+# This file is part of the Open Data Cube, see https://opendatacube.org for more information
+#
+# Copyright (c) 2015-2024 ODC Contributors
+# SPDX-License-Identifier: Apache-2.0
+"""
+Connection pool configuration and metrics shared by the postgres and postgis drivers.
+"""
+from threading import Lock
+from time import perf_counter
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool
+
+#: ``queue``: keep up to ``pool_size`` (+ ``max_overflow``) connections open and reuse them.
+#: ``null``: open a new connection for every checkout and close it on checkin, for use behind
+#: an external pooler such as pgbouncer (and when many processes each hold an Index).
+POOL_MODES = ('queue', 'null')
+
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 10
+DEFAULT_POOL_WAIT_TIMEOUT = 30
+DEFAULT_POOL_RECYCLE = 60
+
+
+def _as_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ('y', 'yes', 'true', 'on', '1')
+    return bool(value)
+
+
+def pool_options_from_config(config) -> Dict[str, Any]:
+    """
+    Read connection pool settings from a :class:`datacube.config.LocalConfig` (or dict-like).
+
+    Returns keyword arguments for ``PostgresDb.create()``/``PostGisDb.create()``.
+    """
+    return dict(
+        pool_timeout=int(config.get('db_connection_timeout', DEFAULT_POOL_RECYCLE)),
+        pool_mode=config.get('db_pool_mode', 'queue'),
+        pool_size=int(config.get('db_pool_size', DEFAULT_POOL_SIZE)),
+        max_overflow=int(config.get('db_pool_max_overflow', DEFAULT_MAX_OVERFLOW)),
+        pool_wait_timeout=float(config.get('db_pool_wait_timeout', DEFAULT_POOL_WAIT_TIMEOUT)),
+        pool_pre_ping=_as_bool(config.get('db_pool_pre_ping', False)),
+    )
+
+
+def engine_pool_args(pool_mode: str = 'queue',
+                     pool_size: int = DEFAULT_POOL_SIZE,
+                     max_overflow: int = DEFAULT_MAX_OVERFLOW,
+                     pool_wait_timeout: float = DEFAULT_POOL_WAIT_TIMEOUT,
+                     pool_pre_ping: bool = False,
+                     pool_recycle: int = DEFAULT_POOL_RECYCLE) -> Dict[str, Any]:
+    """
+    Pool related keyword arguments for :func:`sqlalchemy.create_engine`.
+    """
+    if pool_mode not in POOL_MODES:
+        raise ValueError(f"Unknown db_pool_mode {pool_mode!r}, expect one of {POOL_MODES}")
+
+    args: Dict[str, Any] = dict(pool_pre_ping=pool_pre_ping, pool_recycle=pool_recycle)
+    if pool_mode == 'null':
+        # NullPool rejects the sizing arguments
+        args['poolclass'] = NullPool
+    else:
+        args.update(pool_size=pool_size, max_overflow=max_overflow, pool_timeout=pool_wait_timeout)
+    return args
+
+
+class PoolMetrics:
+    """
+    Counts connection pool activity of an engine.
+
+    Checkouts, checkins, new connections and invalidations are counted for every use of the pool;
+    wait times are measured for connections borrowed through :meth:`connect`, and include time
+    taken to open a new connection when none is idle.
+    """
+
+    def __init__(self, engine: Engine):
+        self._engine = engine
+        self._lock = Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+        event.listen(engine, 'connect', self._on_connect)
+        event.listen(engine, 'checkout', self._on_checkout)
+        event.listen(engine, 'checkin', self._on_checkin)
+        event.listen(engine, 'invalidate', self._on_invalidate)
+
+    def _incr(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        self._incr('connects')
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        self._incr('checkouts')
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        self._incr('checkins')
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        self._incr('invalidations')
+
+    def connect(self):
+        """
+        ``engine.connect()``, recording how long it took to get a connection from the pool.
+        """
+        t0 = perf_counter()
+        connection = self._engine.connect()
+        elapsed = perf_counter() - t0
+        with self._lock:
+            self.waits += 1
+            self.wait_seconds += elapsed
+            self.max_wait_seconds = max(self.max_wait_seconds, elapsed)
+        return connection
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Current counts, plus the pool's own view of its size where the pool type has one.
+        """
+        pool = self._engine.pool
+        with self._lock:
+            out: Dict[str, Any] = dict(
+                pool=type(pool).__name__,
+                checkouts=self.checkouts,
+                checkins=self.checkins,
+                checked_out=self.checkouts - self.checkins,
+                connects=self.connects,
+                invalidations=self.invalidations,
+                waits=self.waits,
+                wait_seconds=self.wait_seconds,
+                mean_wait_seconds=self.wait_seconds / self.waits if self.waits else 0.0,
+                max_wait_seconds=self.max_wait_seconds,
+            )
+        for name in ('size', 'overflow'):
+            fn = getattr(pool, name, None)
+            if fn is not None:
+                out[f'pool_{name}'] = fn()
+        return out
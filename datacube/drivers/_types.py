@@ -59,6 +59,20 @@ class GeoRasterReader(object, metaclass=ABCMeta):
     def nodata(self) -> Optional[Union[int, float]]:
         ...  # pragma: no cover
 
+    @property
+    def overviews(self) -> Tuple[int, ...]:
+        """ Decimation factors of available overview levels, finest first.
+
+            Readers that can not access overviews report none.
+        """
+        return ()
+
+    @property
+    def block_shape(self) -> Optional[RasterShape]:
+        """ Shape of internal tiles/strips of the image, if known.
+        """
+        return None
+
     @abstractmethod
     def read(self,
              window: Optional[RasterWindow] = None,
@@ -15,6 +15,10 @@ RasterShape = Tuple[int, int]                 # pylint: disable=invalid-name
 RasterWindow = Union[                         # pylint: disable=invalid-name
     Tuple[Tuple[int, int], Tuple[int, int]],
     Tuple[slice, slice]]
+NdRasterWindow = Union[                       # pylint: disable=invalid-name
+    RasterWindow,
+    Tuple[Union[int, slice], slice, slice],
+    Tuple[Union[int, slice]]]
 
 # pylint: disable=pointless-statement
 
@@ -48,10 +52,38 @@ class GeoRasterReader(object, metaclass=ABCMeta):
     def nodata(self) -> Optional[Union[int, float]]:
         ...  # pragma: no cover
 
+    @property
+    def overviews(self) -> Tuple[int, ...]:
+        """ Decimation factors of available overview levels, finest first.
+
+            Readers that can not access overviews report none.
+        """
+        return ()
+
+    @property
+    def block_shape(self) -> Optional[RasterShape]:
+        """ Shape of internal tiles/strips of the image, if known.
+        """
+        return None
+
+    @property
+    def supports_nd_read(self) -> bool:
+        """ Whether ``read`` accepts a ``slice`` as a leading window index.
+
+            Such reads return a 3D array with a layer per index of the slice, readers
+            that don't support it get called once per layer instead.
+        """
+        return False
+
     @abstractmethod
     def read(self,
-             window: Optional[RasterWindow] = None,
+             window: Optional[NdRasterWindow] = None,
              out_shape: Optional[RasterShape] = None) -> Optional[np.ndarray]:
+        """ Read pixels in ``window`` at ``out_shape`` resolution.
+
+            Window is either 2D, or has an extra leading index (or a ``slice`` if
+            ``supports_nd_read``) into the extra dimension of the data.
+        """
         ...  # pragma: no cover
 
 
@@ -23,6 +23,7 @@ from sqlalchemy import select, text, and_, or_, func
 from sqlalchemy.dialects.postgresql import INTERVAL
 from typing import Iterable, Sequence
 
+from datacube.index._instrument import execute_instrumented
 from datacube.index.fields import OrExpression
 from datacube.model import Range
 from datacube.utils.geometry import CRS, Geometry
@@ -41,24 +42,28 @@ from .sql import escape_pg_identifier
 _LOG = logging.getLogger(__name__)
 
 
+def _dataset_uris_field():
+    # All active URIs, from newest to oldest
+    return func.array(
+        select(
+            SelectedDatasetLocation.uri
+        ).where(
+            and_(
+                SelectedDatasetLocation.dataset_ref == Dataset.id,
+                SelectedDatasetLocation.archived == None
+            )
+        ).order_by(
+            SelectedDatasetLocation.added.desc(),
+            SelectedDatasetLocation.id.desc()
+        ).label('uris')
+    ).label('uris')
+
+
 # Make a function because it's broken
 def _dataset_select_fields():
     return (
         Dataset,
-        # All active URIs, from newest to oldest
-        func.array(
-            select(
-                SelectedDatasetLocation.uri
-            ).where(
-                and_(
-                    SelectedDatasetLocation.dataset_ref == Dataset.id,
-                    SelectedDatasetLocation.archived == None
-                )
-            ).order_by(
-                SelectedDatasetLocation.added.desc(),
-                SelectedDatasetLocation.id.desc()
-            ).label('uris')
-        ).label('uris')
+        _dataset_uris_field()
     )
 
 
@@ -66,20 +71,7 @@ def _dataset_bulk_select_fields():
     return (
         Dataset.product_ref,
         Dataset.metadata_doc,
-        # All active URIs, from newest to oldest
-        func.array(
-            select(
-                SelectedDatasetLocation.uri
-            ).where(
-                and_(
-                    SelectedDatasetLocation.dataset_ref == Dataset.id,
-                    SelectedDatasetLocation.archived == None
-                )
-            ).order_by(
-                SelectedDatasetLocation.added.desc(),
-                SelectedDatasetLocation.id.desc()
-            ).label('uris')
-        ).label('uris')
+        _dataset_uris_field()
     )
 
 
@@ -141,6 +133,29 @@ def get_native_fields():
     return fields
 
 
+def get_compact_fields(grid_spatial_offset=None):
+    """
+    Fields selected alongside search fields for compact search results, instead of the full
+    metadata document: active uris and, if the metadata type has one, the grid spatial section.
+    """
+    fields = {
+        'uris': NativeField(
+            'uris',
+            'Active dataset URIs, newest first',
+            Dataset.id,
+            alchemy_expression=_dataset_uris_field()
+        ),
+    }
+    if grid_spatial_offset:
+        fields['grid_spatial'] = NativeField(
+            'grid_spatial',
+            'Grid spatial section of the metadata document',
+            Dataset.metadata_doc,
+            alchemy_expression=Dataset.metadata_doc[tuple(grid_spatial_offset)]
+        )
+    return fields
+
+
 def get_dataset_fields(metadata_type_definition):
     dataset_section = metadata_type_definition['dataset']
 
@@ -239,8 +254,16 @@ class PostgisDbAPI(object):
         self._sqla_txn.rollback()
         self._end_transaction()
 
-    def execute(self, command):
-        return self._connection.execute(command)
+    def execute(self, command, operation=None):
+        """
+        Execute an arbitrary query.
+
+        :param operation: Name to record the query under when query stats are being recorded,
+                          see :meth:`datacube.index.Index.query_stats`
+        """
+        if operation is None:
+            return self._connection.execute(command)
+        return execute_instrumented(self._connection, command, operation)
 
     def insert_dataset(self, metadata_doc, dataset_id, product_id):
         """
@@ -347,9 +370,15 @@ class PostgisDbAPI(object):
         )
         return r.rowcount > 0
 
-    def insert_dataset_search_bulk(self, search_type, values):
+    def insert_dataset_search_bulk(self, search_type, values, upsert=False):
         search_table = search_field_index_map[search_type]
-        r = self._connection.execute(insert(search_table).values(values))
+        query = insert(search_table).values(values)
+        if upsert:
+            query = query.on_conflict_do_update(
+                index_elements=[search_table.dataset_ref, search_table.search_key],
+                set_=dict(search_val=query.excluded.search_val)
+            )
+        r = self._connection.execute(query)
         return r.rowcount
 
     def insert_dataset_spatial(self, dataset_id, crs, extent):
@@ -379,9 +408,15 @@ class PostgisDbAPI(object):
         )
         return r.rowcount > 0
 
-    def insert_dataset_spatial_bulk(self, crs, values):
+    def insert_dataset_spatial_bulk(self, crs, values, upsert=False):
         SpatialIndex = self._db.spatial_index(crs)  # noqa: N806
-        r = self._connection.execute(insert(SpatialIndex).values(values))
+        query = insert(SpatialIndex).values(values)
+        if upsert:
+            query = query.on_conflict_do_update(
+                index_elements=[SpatialIndex.dataset_ref],
+                set_=dict(extent=query.excluded.extent)
+            )
+        r = self._connection.execute(query)
         return r.rowcount
 
     def spatial_extent(self, ids, crs):
@@ -634,17 +669,26 @@ class PostgisDbAPI(object):
     def search_datasets(self, expressions,
                         source_exprs=None, select_fields=None,
                         with_source_ids=False, limit=None,
-                        geom=None):
+                        geom=None, batch_size=0):
         """
         :type with_source_ids: bool
         :type select_fields: tuple[datacube.drivers.postgis._fields.PgField]
         :type expressions: tuple[datacube.drivers.postgis._fields.PgExpression]
+        :param batch_size: Number of streamed rows to fetch from database at once.
+                           Defaults to zero, which means no streaming.
+                           Note streaming is only supported inside a transaction.
         """
+        if batch_size > 0 and not self.in_transaction:
+            raise ValueError("Postgresql streamed reads must occur within a transaction.")
         select_query = self.search_datasets_query(expressions, source_exprs,
                                                   select_fields, with_source_ids,
                                                   limit, geom=geom)
         _LOG.debug("search_datasets SQL: %s", str(select_query))
-        return self._connection.execute(select_query)
+        if batch_size > 0:
+            conn = self._connection.execution_options(stream_results=True, yield_per=batch_size)
+        else:
+            conn = self._connection
+        return execute_instrumented(conn, select_query, 'search_datasets')
 
     def bulk_simple_dataset_search(self, products=None, batch_size=0):
         """
@@ -702,7 +746,7 @@ class PostgisDbAPI(object):
         """
         select_query = self.search_unique_datasets_query(expressions, select_fields, limit)
 
-        return self._connection.execute(select_query)
+        return execute_instrumented(self._connection, select_query, 'search_unique_datasets')
 
     def get_duplicates(self, match_fields: Sequence[PgField], expressions: Sequence[PgExpression]) -> Iterable[tuple]:
         # TODO
@@ -795,7 +839,7 @@ class PostgisDbAPI(object):
                 *raw_expressions
             )
         )
-        return self._connection.scalar(select_query)
+        return execute_instrumented(self._connection, select_query, 'count_datasets').scalar()
 
     def count_datasets_through_time(self, start, end, period, time_field, expressions):
         """
@@ -806,8 +850,10 @@ class PostgisDbAPI(object):
         :rtype: list[((datetime.datetime, datetime.datetime), int)]
         """
 
-        results = self._connection.execute(
-            self.count_datasets_through_time_query(start, end, period, time_field, expressions)
+        results = execute_instrumented(
+            self._connection,
+            self.count_datasets_through_time_query(start, end, period, time_field, expressions),
+            'count_datasets_through_time'
         )
 
         for time_period, dataset_count in results:
@@ -853,11 +899,46 @@ class PostgisDbAPI(object):
 
         return select(time_ranges.c.time_period, count_query.label('dataset_count'))
 
-    def update_search_index(self, product_names: Sequence[str] = [], dsids: Sequence[DSID] = []):
+    @staticmethod
+    def _filter_datasets_for_update(query, product_names: Sequence[str], dsids: Sequence[DSID]):
+        if product_names:
+            query = query.join(Product)
+        if product_names and dsids:
+            query = query.where(
+                or_(
+                    Product.name.in_(product_names),
+                    Dataset.id.in_(dsids)
+                )
+            )
+        elif product_names:
+            query = query.where(
+                Product.name.in_(product_names)
+            )
+        elif dsids:
+            query = query.where(
+                Dataset.id.in_(dsids)
+            )
+        return query
+
+    def _execute_in_batches(self, query, batch_size: int):
+        """
+        Execute query, returning an iterator over lists of up to ``batch_size`` rows.
+
+        Rows are streamed from a server-side cursor when inside a transaction.
+        """
+        if self.in_transaction:
+            conn = self._connection.execution_options(stream_results=True, yield_per=batch_size)
+        else:
+            conn = self._connection
+        return conn.execute(query).partitions(batch_size)
+
+    def update_search_index(self, product_names: Sequence[str] = [], dsids: Sequence[DSID] = [],
+                            batch_size: int = 1000):
         """
         Update search indexes
         :param product_names: Product names to update
         :param dsids: Dataset IDs to update
+        :param batch_size: Number of datasets to read and write per database round trip
 
         if neither product_names nor dataset ids are supplied, update nothing (N.B. NOT all datasets)
 
@@ -873,42 +954,34 @@ class PostgisDbAPI(object):
             Dataset.metadata_doc,
             MetadataType.definition,
         ).select_from(Dataset).join(MetadataType)
-        if product_names:
-            ds_query = ds_query.join(Product)
-        if product_names and dsids:
-            ds_query = ds_query.where(
-                or_(
-                    Product.name.in_(product_names),
-                    Dataset.id.in_(dsids)
-                )
-            )
-        elif product_names:
-            ds_query = ds_query.where(
-                Product.name.in_(product_names)
-            )
-        elif dsids:
-            ds_query = ds_query.where(
-                Dataset.id.in_(dsids)
-            )
+        ds_query = self._filter_datasets_for_update(ds_query, product_names, dsids)
+
         rowcount = 0
-        for result in self._connection.execute(ds_query):
-            dsid, ds_metadata, mdt_def = result
-            search_field_vals = extract_dataset_search_fields(ds_metadata, mdt_def)
-            for field_name, field_info in search_field_vals.items():
-                fld_type, fld_val = field_info
-                search_idx = search_field_index_map[fld_type]
-                self.insert_dataset_search(search_idx, dsid, field_name, fld_val)
-            rowcount += 1
+        for rows in self._execute_in_batches(ds_query, batch_size):
+            values_by_type: dict = {}
+            for dsid, ds_metadata, mdt_def in rows:
+                search_field_vals = extract_dataset_search_fields(ds_metadata, mdt_def)
+                for field_name, (fld_type, fld_val) in search_field_vals.items():
+                    if isinstance(fld_val, Range):
+                        fld_val = list(fld_val)
+                    values_by_type.setdefault(fld_type, []).append(
+                        dict(dataset_ref=dsid, search_key=field_name, search_val=fld_val)
+                    )
+            for fld_type, values in values_by_type.items():
+                self.insert_dataset_search_bulk(fld_type, values, upsert=True)
+            rowcount += len(rows)
         return rowcount
 
     def update_spindex(self, crs_seq: Sequence[CRS] = [],
                        product_names: Sequence[str] = [],
-                       dsids: Sequence[DSID] = []) -> int:
+                       dsids: Sequence[DSID] = [],
+                       batch_size: int = 1000) -> int:
         """
         Update a spatial index
         :param crs: CRSs for Spatial Indexes to update. Default=all indexes
         :param product_names: Product names to update
         :param dsids: Dataset IDs to update
+        :param batch_size: Number of datasets to read and write per database round trip
 
         if neither product_names nor dataset ids are supplied, update for all datasets.
 
@@ -922,42 +995,29 @@ class PostgisDbAPI(object):
         else:
             crses = self._db.spatial_indexes()
 
-        # Update implementation.
-        # Design will change, but this method should be fairly low level to be as efficient as possible
         query = select(
             Dataset.id,
             Dataset.metadata_doc["grid_spatial"]["projection"]
         ).select_from(Dataset)
-        if product_names:
-            query = query.join(Product)
-        if product_names and dsids:
-            query = query.where(
-                or_(
-                    Product.name.in_(product_names),
-                    Dataset.id.in_(dsids)
-                )
-            )
-        elif product_names:
-            query = query.where(
-                Product.name.in_(product_names)
-            )
-        elif dsids:
-            query = query.where(
-                Dataset.id.in_(dsids)
-            )
-
-        def xytuple(o):
-            return (o['x'], o['y'])
-
-        for result in self._connection.execute(query):
-            dsid = result[0]
-            geom = extract_geometry_from_eo3_projection(result[1])
-            if not geom:
-                verified += 1
-                continue
+        query = self._filter_datasets_for_update(query, product_names, dsids)
+
+        epsg4326 = CRS("EPSG:4326")
+        for rows in self._execute_in_batches(query, batch_size):
+            extents = []
+            for dsid, projection in rows:
+                geom = extract_geometry_from_eo3_projection(projection)
+                if not geom:
+                    verified += 1
+                    continue
+                # Reproject to lat/lon once per dataset, rather than once per spatial index
+                extents.append((dsid, geom, geom.to_crs(epsg4326)))
             for crs in crses:
-                self.insert_dataset_spatial(dsid, crs, geom)
-                verified += 1
+                values = [generate_dataset_spatial_values(dsid, crs, geom, geo_extent=geo_extent)
+                          for dsid, geom, geo_extent in extents]
+                values = [v for v in values if v is not None]
+                if values:
+                    self.insert_dataset_spatial_bulk(crs, values, upsert=True)
+                verified += len(extents)
 
         return verified
 
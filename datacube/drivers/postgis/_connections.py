@@ -17,13 +17,14 @@ import logging
 import os
 import re
 from contextlib import contextmanager
-from typing import Any, Callable, Iterable, Mapping, Optional, Union, Type
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Union, Type
 
 from sqlalchemy import event, create_engine
 from sqlalchemy.engine import Engine
 from sqlalchemy.engine.url import URL as EngineUrl  # noqa: N811
 
 import datacube
+from datacube.drivers._pool import PoolMetrics, engine_pool_args, pool_options_from_config
 from datacube.index.exceptions import IndexSetupError
 from datacube.utils import jsonify_document
 from datacube.utils.geometry import CRS
@@ -70,6 +71,7 @@ class PostGisDb(object):
         # We don't recommend using this constructor directly as it may change.
         # Use static methods PostGisDb.create() or PostGisDb.from_config()
         self._engine = engine
+        self._pool_metrics = PoolMetrics(engine)
         self._spindexes: Optional[Mapping[CRS, Any]] = None
 
     @classmethod
@@ -86,8 +88,8 @@ class PostGisDb(object):
             validate=validate_connection,
             iam_rds_auth=bool(config.get("db_iam_authentication", DEFAULT_IAM_AUTH)),
             iam_rds_timeout=int(config.get("db_iam_timeout", DEFAULT_IAM_TIMEOUT)),
-            pool_timeout=int(config.get('db_connection_timeout', 60)),
             # pass config?
+            **pool_options_from_config(config),
         )
 
     @classmethod
@@ -95,7 +97,8 @@ class PostGisDb(object):
                application_name=None, validate=True,
                iam_rds_auth=False, iam_rds_timeout=600,
                # pass config?
-               pool_timeout=60):
+               pool_timeout=60,
+               pool_mode='queue', pool_size=5, max_overflow=10, pool_wait_timeout=30, pool_pre_ping=False):
         mk_url = getattr(EngineUrl, 'create', EngineUrl)
         engine = cls._create_engine(
             mk_url(
@@ -106,7 +109,12 @@ class PostGisDb(object):
             application_name=application_name,
             iam_rds_auth=iam_rds_auth,
             iam_rds_timeout=iam_rds_timeout,
-            pool_timeout=pool_timeout)
+            pool_timeout=pool_timeout,
+            pool_mode=pool_mode,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_wait_timeout=pool_wait_timeout,
+            pool_pre_ping=pool_pre_ping)
         if validate:
             if not _core.database_exists(engine):
                 raise IndexSetupError('\n\nNo DB schema exists. Have you run init?\n\t{init_command}'.format(
@@ -122,7 +130,8 @@ class PostGisDb(object):
         return PostGisDb(engine)
 
     @staticmethod
-    def _create_engine(url, application_name=None, iam_rds_auth=False, iam_rds_timeout=600, pool_timeout=60):
+    def _create_engine(url, application_name=None, iam_rds_auth=False, iam_rds_timeout=600, pool_timeout=60,
+                       pool_mode='queue', pool_size=5, max_overflow=10, pool_wait_timeout=30, pool_pre_ping=False):
         engine = create_engine(
             url,
             echo=False,
@@ -135,7 +144,12 @@ class PostGisDb(object):
             # If a connection is idle for this many seconds, SQLAlchemy will renew it rather
             # than assuming it's still open. Allows servers to close idle connections without clients
             # getting errors.
-            pool_recycle=pool_timeout,
+            **engine_pool_args(pool_mode=pool_mode,
+                               pool_size=pool_size,
+                               max_overflow=max_overflow,
+                               pool_wait_timeout=pool_wait_timeout,
+                               pool_pre_ping=pool_pre_ping,
+                               pool_recycle=pool_timeout),
             connect_args={'application_name': application_name},
         )
 
@@ -261,7 +275,7 @@ class PostGisDb(object):
 
         Low level context manager, use <index_resource>._db_connection instead
         """
-        with self._engine.connect() as connection:
+        with self._pool_metrics.connect() as connection:
             try:
                 connection.execution_options(isolation_level="AUTOCOMMIT")
                 yield _api.PostgisDbAPI(self, connection)
@@ -269,7 +283,13 @@ class PostGisDb(object):
                 connection.close()
 
     def give_me_a_connection(self):
-        return self._engine.connect()
+        return self._pool_metrics.connect()
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """
+        Connection pool metrics: checkout/checkin counts, new connections and time spent waiting for a connection.
+        """
+        return self._pool_metrics.as_dict()
 
     @classmethod
     def get_dataset_fields(cls, metadata_type_definition):
@@ -89,7 +89,7 @@ class CommonTimestamp(GenericFunction):
     type = TIMESTAMP(timezone=True)
     package = 'odc'
     identifier = 'common_timestamp'
-    inherit_cache = False
+    inherit_cache = True
 
     name = 'common_timestamp'
 
@@ -103,7 +103,7 @@ class Float8Range(GenericFunction):
     type = FLOAT8RANGE  # type: ignore[assignment]
     package = 'odc'
     identifier = 'float8range'
-    inherit_cache = False
+    inherit_cache = True
 
     name = 'float8range'
 
@@ -23,6 +23,7 @@ from sqlalchemy.dialects.postgresql import INTERVAL
 from sqlalchemy.dialects.postgresql import JSONB, insert
 from sqlalchemy.exc import IntegrityError
 
+from datacube.index._instrument import execute_instrumented
 from datacube.index.exceptions import MissingRecordError
 from datacube.index.fields import OrExpression
 from datacube.model import Range
@@ -45,40 +46,28 @@ def _dataset_uri_field(table):
 # Fields for selecting dataset with uris
 # Need to alias the table, as queries may join the location table for filtering.
 SELECTED_DATASET_LOCATION = DATASET_LOCATION.alias('selected_dataset_location')
+# All active URIs, from newest to oldest
+_DATASET_URIS_FIELD = func.array(
+    select(
+        _dataset_uri_field(SELECTED_DATASET_LOCATION)
+    ).where(
+        and_(
+            SELECTED_DATASET_LOCATION.c.dataset_ref == DATASET.c.id,
+            SELECTED_DATASET_LOCATION.c.archived == None
+        )
+    ).order_by(
+        SELECTED_DATASET_LOCATION.c.added.desc(),
+        SELECTED_DATASET_LOCATION.c.id.desc()
+    ).label('uris')
+).label('uris')
 _DATASET_SELECT_FIELDS = (
     DATASET,
-    # All active URIs, from newest to oldest
-    func.array(
-        select(
-            _dataset_uri_field(SELECTED_DATASET_LOCATION)
-        ).where(
-            and_(
-                SELECTED_DATASET_LOCATION.c.dataset_ref == DATASET.c.id,
-                SELECTED_DATASET_LOCATION.c.archived == None
-            )
-        ).order_by(
-            SELECTED_DATASET_LOCATION.c.added.desc(),
-            SELECTED_DATASET_LOCATION.c.id.desc()
-        ).label('uris')
-    ).label('uris')
+    _DATASET_URIS_FIELD
 )
 _DATASET_BULK_SELECT_FIELDS = (
     PRODUCT.c.name,
     DATASET.c.metadata,
-    # All active URIs, from newest to oldest
-    func.array(
-        select(
-            _dataset_uri_field(SELECTED_DATASET_LOCATION)
-        ).where(
-            and_(
-                SELECTED_DATASET_LOCATION.c.dataset_ref == DATASET.c.id,
-                SELECTED_DATASET_LOCATION.c.archived == None
-            )
-        ).order_by(
-            SELECTED_DATASET_LOCATION.c.added.desc(),
-            SELECTED_DATASET_LOCATION.c.id.desc()
-        ).label('uris')
-    ).label('uris')
+    _DATASET_URIS_FIELD
 )
 
 
@@ -140,6 +129,29 @@ def get_native_fields():
     return fields
 
 
+def get_compact_fields(grid_spatial_offset=None):
+    """
+    Fields selected alongside search fields for compact search results, instead of the full
+    metadata document: active uris and, if the metadata type has one, the grid spatial section.
+    """
+    fields = {
+        'uris': NativeField(
+            'uris',
+            'Active dataset URIs, newest first',
+            DATASET.c.id,
+            alchemy_expression=_DATASET_URIS_FIELD
+        ),
+    }
+    if grid_spatial_offset:
+        fields['grid_spatial'] = NativeField(
+            'grid_spatial',
+            'Grid spatial section of the metadata document',
+            DATASET.c.metadata,
+            alchemy_expression=DATASET.c.metadata[tuple(grid_spatial_offset)]
+        )
+    return fields
+
+
 def get_dataset_fields(metadata_type_definition):
     dataset_section = metadata_type_definition['dataset']
 
@@ -204,8 +216,16 @@ class PostgresDbAPI(object):
         self._sqla_txn.rollback()
         self._end_transaction()
 
-    def execute(self, command):
-        return self._connection.execute(command)
+    def execute(self, command, operation=None):
+        """
+        Execute an arbitrary query.
+
+        :param operation: Name to record the query under when query stats are being recorded,
+                          see :meth:`datacube.index.Index.query_stats`
+        """
+        if operation is None:
+            return self._connection.execute(command)
+        return execute_instrumented(self._connection, command, operation)
 
     def insert_dataset(self, metadata_doc, dataset_id, product_id):
         """
@@ -375,6 +395,27 @@ class PostgresDbAPI(object):
                 raise MissingRecordError("Referenced source dataset doesn't exist")
             raise
 
+    def insert_dataset_source_bulk(self, values):
+        """
+        Insert many lineage edges in one statement, edges already recorded are skipped.
+
+        :param values: list of row dicts (classifier, dataset_ref, source_dataset_ref)
+        :return: (number inserted, number skipped)
+        """
+        requested = len(values)
+        try:
+            res = self._connection.execute(
+                insert(DATASET_SOURCE).on_conflict_do_nothing(
+                    index_elements=['classifier', 'dataset_ref']
+                ),
+                values
+            )
+        except IntegrityError as e:
+            if e.orig.pgcode == PGCODE_FOREIGN_KEY_VIOLATION:
+                raise MissingRecordError("Referenced source dataset doesn't exist")
+            raise
+        return res.rowcount, requested - res.rowcount
+
     def archive_dataset(self, dataset_id):
         self._connection.execute(
             DATASET.update().where(
@@ -604,15 +645,24 @@ class PostgresDbAPI(object):
 
     def search_datasets(self, expressions,
                         source_exprs=None, select_fields=None,
-                        with_source_ids=False, limit=None):
+                        with_source_ids=False, limit=None, batch_size=0):
         """
         :type with_source_ids: bool
         :type select_fields: tuple[datacube.drivers.postgres._fields.PgField]
         :type expressions: tuple[datacube.drivers.postgres._fields.PgExpression]
+        :param batch_size: Number of streamed rows to fetch from database at once.
+                           Defaults to zero, which means no streaming.
+                           Note streaming is only supported inside a transaction.
         """
+        if batch_size > 0 and not self.in_transaction:
+            raise ValueError("Postgresql streamed reads must occur within a transaction.")
         select_query = self.search_datasets_query(expressions, source_exprs,
                                                   select_fields, with_source_ids, limit)
-        return self._connection.execute(select_query)
+        if batch_size > 0:
+            conn = self._connection.execution_options(stream_results=True, yield_per=batch_size)
+        else:
+            conn = self._connection
+        return execute_instrumented(conn, select_query, 'search_datasets')
 
     def bulk_simple_dataset_search(self, products=None, batch_size=0):
         """
@@ -722,7 +772,7 @@ class PostgresDbAPI(object):
 
         select_query = self.search_unique_datasets_query(expressions, select_fields, limit)
 
-        return self._connection.execute(select_query)
+        return execute_instrumented(self._connection, select_query, 'search_unique_datasets')
 
     def get_duplicates(self, match_fields: Iterable[PgField], expressions: Iterable[PgExpression]) -> Iterable[Tuple]:
         if "time" in [f.name for f in match_fields]:
@@ -816,7 +866,7 @@ class PostgresDbAPI(object):
             )
         )
 
-        return self._connection.scalar(select_query)
+        return execute_instrumented(self._connection, select_query, 'count_datasets').scalar()
 
     def count_datasets_through_time(self, start, end, period, time_field, expressions):
         """
@@ -827,8 +877,10 @@ class PostgresDbAPI(object):
         :rtype: list[((datetime.datetime, datetime.datetime), int)]
         """
 
-        results = self._connection.execute(
-            self.count_datasets_through_time_query(start, end, period, time_field, expressions)
+        results = execute_instrumented(
+            self._connection,
+            self.count_datasets_through_time_query(start, end, period, time_field, expressions),
+            'count_datasets_through_time'
         )
 
         for time_period, dataset_count in results:
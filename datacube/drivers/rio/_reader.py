@@ -5,10 +5,13 @@
 """ reader
 """
 from typing import (
-    List, Optional, Union, Any, Iterable,
-    Tuple, NamedTuple, TypeVar
+    Dict, List, Optional, Union, Any, Iterable, Iterator,
+    Set, Tuple, NamedTuple, TypeVar
 )
+from contextlib import contextmanager
+import threading
 import numpy as np
+import cachetools
 from affine import Affine
 from concurrent.futures import ThreadPoolExecutor
 import rasterio                         # type: ignore[import]
@@ -35,9 +38,16 @@ Overrides = NamedTuple('Overrides', [('crs', Optional[CRS]),
                                      ('transform', Optional[Affine]),
                                      ('nodata', Optional[Union[float, int]])])
 
+HandleCacheStats = NamedTuple('HandleCacheStats', [('hits', int),
+                                                   ('misses', int),
+                                                   ('evictions', int),
+                                                   ('size', int)])
+
 RioWindow = Tuple[Tuple[int, int], Tuple[int, int]]  # pylint: disable=invalid-name
 T = TypeVar('T')
 
+DEFAULT_HANDLE_CACHE_SIZE = 32
+
 
 def pick(a: Optional[T], b: Optional[T]) -> Optional[T]:
     """ Return first non-None value or None if all are None
@@ -83,13 +93,140 @@ def _dc_crs(crs: Optional[rasterio.crs.CRS]) -> Optional[CRS]:
     return CRS(crs.wkt)
 
 
-def _read(src: DatasetReader,
+class RioHandle(object):
+    """ Shareable rasterio file handle.
+
+    GDAL handles can not be used from several threads at once, so every thread
+    gets its own ``DatasetReader`` for the uri, opened on first use within
+    :meth:`open`. Closing the handle (on eviction from cache) closes idle readers
+    straight away, readers that are in use are closed by their thread once it
+    is done with them. Closed handle is transparently re-opened on next access.
+    """
+
+    def __init__(self, uri: str):
+        self.uri = uri
+        self._lock = threading.Lock()
+        # thread id -> reader, and -> number of nested open() calls in progress
+        self._srcs: Dict[int, DatasetReader] = {}
+        self._busy: Dict[int, int] = {}
+        # threads that should close their reader once no longer busy
+        self._close_after: Set[int] = set()
+
+    @contextmanager
+    def open(self) -> Iterator[DatasetReader]:
+        """ Reader for the calling thread, only to be used within the ``with`` block.
+        """
+        tid = threading.get_ident()
+        with self._lock:
+            src = self._srcs.get(tid, None)
+            self._busy[tid] = self._busy.get(tid, 0) + 1
+
+        try:
+            if src is None or src.closed:
+                src = rasterio.open(self.uri, 'r')
+                with self._lock:
+                    self._srcs[tid] = src
+            yield src
+        finally:
+            src_to_close = None
+            with self._lock:
+                self._busy[tid] -= 1
+                if self._busy[tid] == 0:
+                    del self._busy[tid]
+                    if tid in self._close_after:
+                        self._close_after.discard(tid)
+                        src_to_close = self._srcs.pop(tid, None)
+            if src_to_close is not None:
+                src_to_close.close()
+
+    def close(self) -> None:
+        with self._lock:
+            idle = [tid for tid in self._srcs if tid not in self._busy]
+            srcs = [self._srcs.pop(tid) for tid in idle]
+            self._close_after.update(self._busy)
+
+        for src in srcs:
+            src.close()
+
+
+class _EvictingLRUCache(cachetools.LRUCache):
+    def __init__(self, maxsize: int, on_evict):
+        super().__init__(maxsize)
+        self._on_evict = on_evict
+
+    def popitem(self):
+        key, handle = super().popitem()
+        self._on_evict(handle)
+        return key, handle
+
+
+class HandleCache(object):
+    """ Thread-safe LRU cache of open file handles keyed by normalised uri.
+
+    Used as a load context by :class:`RIORdrDriver`, the same cache is carried
+    over between successive loads when supplied as ``old_ctx``.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_HANDLE_CACHE_SIZE):
+        self._lock = threading.Lock()
+        self._cache = _EvictingLRUCache(max_size, self._evict)
+        self._evicted: List[RioHandle] = []
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _evict(self, handle: RioHandle) -> None:
+        # called with ``_lock`` held, handles are closed after it is released
+        self._evictions += 1
+        self._evicted.append(handle)
+
+    def get(self, uri: str) -> RioHandle:
+        """ Return cached handle for ``uri``, opening one if needed.
+        """
+        with self._lock:
+            handle = self._cache.get(uri, None)
+            if handle is not None:
+                self._hits += 1
+                return handle
+
+            self._misses += 1
+            handle = RioHandle(uri)
+            self._cache[uri] = handle
+            evicted, self._evicted = self._evicted, []
+
+        for old_handle in evicted:
+            old_handle.close()
+        return handle
+
+    def stats(self) -> HandleCacheStats:
+        with self._lock:
+            return HandleCacheStats(hits=self._hits,
+                                    misses=self._misses,
+                                    evictions=self._evictions,
+                                    size=len(self._cache))
+
+    def clear(self) -> None:
+        """ Close all cached handles, counters are not reset.
+        """
+        with self._lock:
+            handles = list(self._cache.values())
+            self._cache.clear()
+
+        for handle in handles:
+            handle.close()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+def _read(handle: RioHandle,
           bidx: int,
           window: Optional[RasterWindow],
           out_shape: Optional[RasterShape]) -> np.ndarray:
-    return src.read(bidx,
-                    window=_roi_to_window(window, src.shape),
-                    out_shape=out_shape)
+    with handle.open() as src:
+        return src.read(bidx,
+                        window=_roi_to_window(window, src.shape),
+                        out_shape=out_shape)
 
 
 def _rio_uri(band: BandInfo) -> str:
@@ -128,21 +265,26 @@ def _rio_band_idx(band: BandInfo, src: DatasetReader) -> int:
 
 class RIOReader(GeoRasterReader):
     def __init__(self,
-                 src: DatasetReader,
+                 handle: RioHandle,
                  band_idx: int,
                  pool: ThreadPoolExecutor,
                  overrides: Overrides = Overrides(None, None, None)):
-
-        transform = pick(overrides.transform, src.transform)
-        if transform is not None and transform.is_identity:
-            transform = None
-
-        self._src = src
-        self._crs = overrides.crs or _dc_crs(src.crs)
+        with handle.open() as src:
+            transform = pick(overrides.transform, src.transform)
+            if transform is not None and transform.is_identity:
+                transform = None
+
+            self._shape = src.shape
+            self._overviews = tuple(src.overviews(band_idx))
+            by, bx = src.block_shapes[band_idx-1]
+            self._block_shape = (by, bx)
+            self._crs = overrides.crs or _dc_crs(src.crs)
+            self._nodata = pick(overrides.nodata, src.nodatavals[band_idx-1])
+            self._dtype = src.dtypes[band_idx-1]
+
+        self._handle = handle
         self._transform = transform
-        self._nodata = pick(overrides.nodata, src.nodatavals[band_idx-1])
         self._band_idx = band_idx
-        self._dtype = src.dtypes[band_idx-1]
         self._pool = pool
 
     @property
@@ -159,7 +301,15 @@ class RIOReader(GeoRasterReader):
 
     @property
     def shape(self) -> RasterShape:
-        return self._src.shape
+        return self._shape
+
+    @property
+    def overviews(self) -> Tuple[int, ...]:
+        return self._overviews
+
+    @property
+    def block_shape(self) -> Optional[RasterShape]:
+        return self._block_shape
 
     @property
     def nodata(self) -> Optional[Union[int, float]]:
@@ -168,7 +318,7 @@ class RIOReader(GeoRasterReader):
     def read(self,
              window: Optional[RasterWindow] = None,
              out_shape: Optional[RasterShape] = None) -> FutureNdarray:
-        return self._pool.submit(_read, self._src, self._band_idx, window, out_shape)
+        return self._pool.submit(_read, self._handle, self._band_idx, window, out_shape)
 
 
 def _compute_overrides(src: DatasetReader, bi: BandInfo) -> Overrides:
@@ -191,15 +341,20 @@ def _compute_overrides(src: DatasetReader, bi: BandInfo) -> Overrides:
 def _rdr_open(band: BandInfo, ctx: Any, pool: ThreadPoolExecutor) -> RIOReader:
     """ Open file pointed by BandInfo and return RIOReader instance.
 
-        raises Exception on failure
+        When ``ctx`` is a :class:`HandleCache` file handles are shared with
+        other bands/loads that refer to the same file.
 
-        TODO: start using ctx for handle cache
+        raises Exception on failure
     """
     normalised_uri = _rio_uri(band)
-    src = rasterio.open(normalised_uri, 'r')
-    bidx = _rio_band_idx(band, src)
+    if isinstance(ctx, HandleCache):
+        handle = ctx.get(normalised_uri)
+    else:
+        handle = RioHandle(normalised_uri)
 
-    return RIOReader(src, bidx, pool, _compute_overrides(src, band))
+    with handle.open() as src:
+        bidx = _rio_band_idx(band, src)
+        return RIOReader(handle, bidx, pool, _compute_overrides(src, band))
 
 
 class RIORdrDriver(ReaderDriver):
@@ -210,7 +365,18 @@ class RIORdrDriver(ReaderDriver):
     def new_load_context(self,
                          bands: Iterable[BandInfo],
                          old_ctx: Optional[Any]) -> Any:
-        return None  # TODO: implement file handle cache with this
+        """ Return :class:`HandleCache`, re-using ``old_ctx`` if it is one.
+
+            Returns ``None`` when handle caching is disabled with ``handle_cache_size=0``.
+        """
+        if isinstance(old_ctx, HandleCache):
+            return old_ctx
+
+        max_size = self._cfg.get('handle_cache_size', DEFAULT_HANDLE_CACHE_SIZE)
+        if not max_size:
+            return None
+
+        return HandleCache(max_size)
 
     def open(self, band: BandInfo, ctx: Any) -> FutureGeoRasterReader:
         return self._pool.submit(_rdr_open, band, ctx, self._pool)
@@ -101,7 +101,7 @@ def _get_distributed_executor(scheduler):
             return self._executor.submit(func, *args, pure=False, **kwargs)
 
         def map(self, func, iterable):
-            return self._executor.map(func, iterable)
+            return self._executor.map(func, iterable, pure=False)
 
         @staticmethod
         def get_ready(futures):
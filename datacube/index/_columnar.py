@@ -0,0 +1,200 @@
+# This file is part of the Open Data Cube, see https://opendatacube.org for more information
+#
+# Copyright (c) 2015-2024 ODC Contributors
+# SPDX-License-Identifier: Apache-2.0
+"""
+Assemble search results into columnar pandas/Arrow tables.
+
+Rows are converted a batch at a time, column by column, so no per-row result
+objects are built. The columns and their types come from the index search
+fields, so every batch (and an empty result) has the same schema:
+
+- range fields (e.g. ``time``, ``lat``) become two columns, ``<name>_begin`` and ``<name>_end``
+- ``datetime`` fields become UTC timestamp columns
+- ``numeric``/``double`` fields become floats and ``integer`` fields nullable integers
+- ``string`` fields become strings, native fields use the type of their database
+  column, so dataset ids are UUIDs (strings in pandas, ``uuid``/``fixed_size_binary(16)``
+  in Arrow)
+- anything else is kept as Python objects, geometries as WKB
+"""
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from uuid import UUID
+
+import pandas
+from psycopg2.extras import Range as PgRange
+
+from datacube.model.fields import Field
+from datacube.utils.geometry import Geometry
+
+TABLE_OUTPUTS = ('pandas', 'arrow')
+
+# Column kind for each (base) search field type
+_TYPE_KINDS = {
+    'datetime': 'datetime',
+    'numeric': 'float',
+    'double': 'float',
+    'float': 'float',
+    'integer': 'integer',
+    'string': 'string',
+}
+
+# Column kind for the Python type of a native field's database column
+_PYTHON_KINDS = {
+    datetime: 'datetime',
+    UUID: 'uuid',
+    str: 'string',
+    int: 'integer',
+    float: 'float',
+    Decimal: 'float',
+}
+
+#: Column name and kind, for each column of a table
+ColumnSchema = List[Tuple[str, str]]
+
+
+def _field_kind(field: Field) -> Tuple[bool, str]:
+    """
+    Whether a field is a range, and the kind of its value(s).
+    """
+    type_name = field.type_name
+    is_range = type_name.endswith('-range')
+    if is_range:
+        type_name = type_name[:-len('-range')]
+    kind = _TYPE_KINDS.get(type_name, 'object')
+    if kind == 'string':
+        # Native fields are all declared as strings, use the type of their column instead
+        try:
+            python_type = field.alchemy_expression.type.python_type  # type: ignore[attr-defined]
+        except (AttributeError, NotImplementedError):
+            pass
+        else:
+            kind = _PYTHON_KINDS.get(python_type, 'object')
+    return is_range, kind
+
+
+def _field_columns(name: str, field: Optional[Field]) -> ColumnSchema:
+    """
+    Columns of one field. Names without a search field (e.g. custom offsets) are kept as objects.
+    """
+    if field is None:
+        return [(name, 'object')]
+    is_range, kind = _field_kind(field)
+    if is_range:
+        return [(f'{name}_begin', kind), (f'{name}_end', kind)]
+    return [(name, kind)]
+
+
+def _range_bounds(v: Any) -> Tuple[Any, Any]:
+    if v is None:
+        return None, None
+    if isinstance(v, PgRange):
+        return v.lower, v.upper
+    return v.begin, v.end
+
+
+def _split_columns(ranges: Sequence[bool], rows: Sequence[Sequence[Any]]) -> List[List[Any]]:
+    """
+    Transpose a batch of rows into columns, splitting ranges into begin/end columns.
+    """
+    columns: List[List[Any]] = []
+    transposed = list(zip(*rows)) if rows else [()] * len(ranges)
+    for is_range, values in zip(ranges, transposed):
+        if is_range:
+            begins, ends = zip(*map(_range_bounds, values)) if values else ((), ())
+            columns.extend([list(begins), list(ends)])
+        else:
+            columns.append(list(values))
+    return columns
+
+
+def _to_object(v: Any) -> Any:
+    if isinstance(v, UUID):
+        return str(v)
+    if isinstance(v, Geometry):
+        return v.geom.wkb
+    if isinstance(v, Decimal):
+        return float(v)
+    return v
+
+
+def _converted(values: List[Any], convert: Callable[[Any], Any]) -> List[Any]:
+    return [None if v is None else convert(v) for v in values]
+
+
+def _pandas_batch(schema: ColumnSchema, columns: List[List[Any]]) -> pandas.DataFrame:
+    data: Dict[str, Any] = {}
+    for (name, kind), values in zip(schema, columns):
+        if kind == 'datetime':
+            data[name] = pandas.Series(pandas.to_datetime(values, utc=True), dtype='datetime64[ns, UTC]')
+        elif kind == 'float':
+            data[name] = pandas.Series(_converted(values, float), dtype='float64')
+        elif kind == 'integer':
+            data[name] = pandas.Series(values, dtype='Int64')
+        elif kind in ('string', 'uuid'):
+            data[name] = pandas.Series(_converted(values, str), dtype='string')
+        else:
+            data[name] = pandas.Series(_converted(values, _to_object), dtype=object)
+    return pandas.DataFrame(data)
+
+
+def _arrow_batch(schema: ColumnSchema, columns: List[List[Any]]):
+    import pyarrow  # type: ignore[import]
+
+    arrays = {}
+    for (name, kind), values in zip(schema, columns):
+        if kind == 'datetime':
+            arrays[name] = pyarrow.array(pandas.to_datetime(values, utc=True), type=pyarrow.timestamp('us', tz='UTC'))
+        elif kind == 'uuid':
+            storage = pyarrow.array(_converted(values, lambda v: v.bytes), type=pyarrow.binary(16))
+            if hasattr(pyarrow, 'uuid'):
+                # pyarrow >= 18 has a canonical UUID extension type
+                storage = pyarrow.ExtensionArray.from_storage(pyarrow.uuid(), storage)
+            arrays[name] = storage
+        elif kind == 'float':
+            arrays[name] = pyarrow.array(_converted(values, float), type=pyarrow.float64())
+        elif kind == 'integer':
+            arrays[name] = pyarrow.array(values, type=pyarrow.int64())
+        elif kind == 'string':
+            arrays[name] = pyarrow.array(_converted(values, str), type=pyarrow.string())
+        else:
+            arrays[name] = pyarrow.array(_converted(values, _to_object))
+    return pyarrow.table(arrays)
+
+
+def rows_to_table(field_names: Sequence[str],
+                  batches: Iterable[Sequence[Sequence[Any]]],
+                  fields: Mapping[str, Field],
+                  output: str = 'pandas'):
+    """
+    Convert batches of search result rows into a single table.
+
+    :param field_names: Name of each value in a row
+    :param batches: Lists of rows, each row a sequence of values in ``field_names`` order
+    :param fields: Search fields by name, giving the columns and their types
+    :param output: ``pandas`` for a :class:`pandas.DataFrame`, ``arrow`` for a :class:`pyarrow.Table`
+    """
+    if output not in TABLE_OUTPUTS:
+        raise ValueError(f"Unknown table output {output!r}, expect one of {TABLE_OUTPUTS}")
+
+    field_columns = [_field_columns(name, fields.get(name)) for name in field_names]
+    schema = [column for columns in field_columns for column in columns]
+    ranges = [len(columns) == 2 for columns in field_columns]
+
+    make_batch = _pandas_batch if output == 'pandas' else _arrow_batch
+    tables = [make_batch(schema, _split_columns(ranges, rows)) for rows in batches if rows]
+    if not tables:
+        tables = [make_batch(schema, _split_columns(ranges, []))]
+
+    if output == 'pandas':
+        return tables[0] if len(tables) == 1 else pandas.concat(tables, ignore_index=True)
+
+    if len(tables) == 1:
+        return tables[0]
+    import pyarrow
+    try:
+        return pyarrow.concat_tables(tables, promote_options='default')
+    except TypeError:
+        # pyarrow < 14
+        return pyarrow.concat_tables(tables, promote=True)
@@ -0,0 +1,233 @@
+# This file is part of the Open Data Cube, see https://opendatacube.org for more information
+#
+# Copyright (c) 2015-2024 ODC Contributors
+# SPDX-License-Identifier: Apache-2.0
+"""
+Opt-in timing of the SQL issued by index searches.
+
+Recording is enabled per thread with :meth:`datacube.index.Index.query_stats`, the
+postgres and postgis drivers then route their search queries through
+:func:`execute_instrumented`.
+"""
+import logging
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import event as sqla_event
+from sqlalchemy.engine import default as sqla_default
+
+from datacube.utils.generic import thread_local_cache
+
+_LOG = logging.getLogger(__name__)
+
+_TLS_KEY = "index-query-stats"
+
+_COMPILED_CACHE_STATES = {
+    sqla_default.CACHE_HIT: 'hit',
+    sqla_default.CACHE_MISS: 'miss',
+    sqla_default.CACHING_DISABLED: 'disabled',
+    sqla_default.NO_CACHE_KEY: 'uncacheable',
+    sqla_default.NO_DIALECT_SUPPORT: 'uncacheable',
+}
+
+
+class QueryEvent:
+    """
+    Timing of a single query.
+
+    :ivar operation: Name of the driver method that issued the query
+    :ivar sql: SQL text as sent to the database
+    :ivar rows: Number of rows returned, ``None`` if not known (yet)
+    :ivar db_seconds: Time spent executing the query and fetching rows
+    :ivar python_seconds: Time spent turning rows into index objects, e.g. :class:`datacube.model.Dataset`
+    :ivar explain: Lines of ``EXPLAIN (ANALYZE, BUFFERS)`` output, when requested
+    :ivar compiled_cache: Whether the SQL was taken from the compiled query cache:
+                          ``hit``, ``miss``, ``disabled`` or ``uncacheable``
+    """
+    __slots__ = ('operation', 'sql', 'rows', 'db_seconds', 'python_seconds', 'explain', 'compiled_cache')
+
+    def __init__(self, operation: str, sql: str):
+        self.operation = operation
+        self.sql = sql
+        self.rows: Optional[int] = None
+        self.db_seconds = 0.0
+        self.python_seconds = 0.0
+        self.explain: Optional[List[str]] = None
+        self.compiled_cache: Optional[str] = None
+
+    def __repr__(self):
+        return (f"QueryEvent(operation={self.operation!r}, rows={self.rows}, "
+                f"db_seconds={self.db_seconds:.6f}, python_seconds={self.python_seconds:.6f}, "
+                f"compiled_cache={self.compiled_cache!r})")
+
+
+class QueryStats:
+    """
+    Collects a :class:`QueryEvent` per instrumented query, in the order queries were issued.
+    """
+
+    def __init__(self, explain: bool = False):
+        self.explain = explain
+        self.events: List[QueryEvent] = []
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Totals per operation: ``calls``, ``rows``, ``db_seconds``, ``python_seconds``
+        and ``compiled_cache_hits``.
+        """
+        out: Dict[str, Dict[str, Any]] = {}
+        for ev in self.events:
+            s = out.setdefault(ev.operation, dict(calls=0, rows=0, db_seconds=0.0, python_seconds=0.0,
+                                                  compiled_cache_hits=0))
+            s['calls'] += 1
+            s['compiled_cache_hits'] += ev.compiled_cache == 'hit'
+            s['rows'] += ev.rows or 0
+            s['db_seconds'] += ev.db_seconds
+            s['python_seconds'] += ev.python_seconds
+        return out
+
+    @property
+    def compiled_cache_hit_rate(self) -> Optional[float]:
+        """
+        Fraction of queries whose SQL came from the compiled query cache, ``None`` if no queries were recorded.
+        """
+        if not self.events:
+            return None
+        return sum(ev.compiled_cache == 'hit' for ev in self.events) / len(self.events)
+
+    def __str__(self):
+        lines = [f"{'operation':<32} {'calls':>6} {'rows':>10} {'db_seconds':>12} {'python_seconds':>15} "
+                 f"{'cache_hits':>10}"]
+        for op, s in self.summary().items():
+            lines.append(f"{op:<32} {s['calls']:>6} {s['rows']:>10} "
+                         f"{s['db_seconds']:>12.4f} {s['python_seconds']:>15.4f} {s['compiled_cache_hits']:>10}")
+        return "\n".join(lines)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """ Query stats being recorded in this thread, if any
+    """
+    return thread_local_cache(_TLS_KEY)
+
+
+@contextmanager
+def record_queries(stats: QueryStats) -> Iterator[QueryStats]:
+    """
+    Record instrumented queries issued by this thread into ``stats``.
+    """
+    previous = thread_local_cache(_TLS_KEY, purge=True)
+    thread_local_cache(_TLS_KEY, stats)
+    try:
+        yield stats
+    finally:
+        thread_local_cache(_TLS_KEY, purge=True)
+        if previous is not None:
+            thread_local_cache(_TLS_KEY, previous)
+
+
+class InstrumentedResult:
+    """
+    Proxy for a SQLAlchemy result that adds time spent fetching rows to its :class:`QueryEvent`,
+    and counts rows as they are iterated over.
+    """
+
+    def __init__(self, result, event: QueryEvent):
+        self._result = result
+        self.query_event = event
+
+    def __iter__(self):
+        ev = self.query_event
+        it = iter(self._result)
+        n = 0
+        while True:
+            t0 = perf_counter()
+            try:
+                row = next(it)
+            except StopIteration:
+                break
+            finally:
+                ev.db_seconds += perf_counter() - t0
+            n += 1
+            yield row
+        ev.rows = n
+
+    def partitions(self, size=None):
+        ev = self.query_event
+        it = iter(self._result.partitions(size))
+        n = 0
+        while True:
+            t0 = perf_counter()
+            try:
+                rows = next(it)
+            except StopIteration:
+                break
+            finally:
+                ev.db_seconds += perf_counter() - t0
+            n += len(rows)
+            yield rows
+        ev.rows = n
+
+    def __getattr__(self, name):
+        return getattr(self._result, name)
+
+
+def execute_instrumented(connection, query, operation: str):
+    """
+    Execute ``query`` on a SQLAlchemy ``connection``, recording a :class:`QueryEvent`
+    when query stats are being recorded in this thread.
+
+    Note that ``EXPLAIN ANALYZE`` runs the query, so asking for it doubles the work done by the database.
+    """
+    stats = current_query_stats()
+    if stats is None:
+        return connection.execute(query)
+
+    ev = QueryEvent(operation, str(query))
+    explain_seconds = 0.0
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        nonlocal explain_seconds
+        ev.sql = statement
+        ev.compiled_cache = _COMPILED_CACHE_STATES.get(getattr(context, 'cache_hit', None))
+        if not stats.explain:
+            return
+        t0 = perf_counter()
+        # Separate cursor, the query cursor may be a server-side one
+        explain_cursor = conn.connection.cursor()
+        try:
+            explain_cursor.execute("EXPLAIN (ANALYZE, BUFFERS) " + statement, parameters)
+            ev.explain = [row[0] for row in explain_cursor.fetchall()]
+        finally:
+            explain_cursor.close()
+        explain_seconds += perf_counter() - t0
+
+    stats.events.append(ev)
+    sqla_event.listen(connection, 'before_cursor_execute', before_cursor_execute)
+    try:
+        t0 = perf_counter()
+        result = connection.execute(query)
+        ev.db_seconds = perf_counter() - t0 - explain_seconds
+    finally:
+        sqla_event.remove(connection, 'before_cursor_execute', before_cursor_execute)
+
+    if result.returns_rows and result.rowcount >= 0:
+        ev.rows = result.rowcount
+    _LOG.debug("%s took %.4fs: %s", operation, ev.db_seconds, ev.sql)
+    return InstrumentedResult(result, ev)
+
+
+def materialise(rows, make: Callable[[Any], Any]) -> Iterator[Any]:
+    """
+    ``map(make, rows)``, adding time spent in ``make`` to the query event of ``rows`` if it has one.
+    """
+    ev: Optional[QueryEvent] = getattr(rows, 'query_event', None)
+    if ev is None:
+        yield from map(make, rows)
+        return
+
+    for row in rows:
+        t0 = perf_counter()
+        item = make(row)
+        ev.python_seconds += perf_counter() - t0
+        yield item
@@ -6,28 +6,33 @@ import datetime
 import logging
 import sys
 
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
 from threading import Lock
 from time import monotonic
 
 from abc import ABC, abstractmethod
-from typing import (Any, Iterable, Iterator,
+from typing import (Any, Callable, ContextManager, Dict, Iterable, Iterator,
                     List, Mapping, MutableMapping,
                     NamedTuple, Optional,
                     Tuple, Union, Sequence)
 from uuid import UUID
 from datetime import timedelta
 
+import toolz  # type: ignore[import]
+
 from datacube.config import LocalConfig
-from datacube.index.exceptions import TransactionException
+from datacube.index.exceptions import MissingRecordError, TransactionException
 from datacube.index.fields import Field
-from datacube.model import Dataset, MetadataType, Range, Not
+from datacube.model import Dataset, CompactDataset, MetadataType, Range, Not
 from datacube.model import Product
 from datacube.utils import cached_property, jsonify_document, read_documents, InvalidDocException
 from datacube.utils.changes import AllowPolicy, Change, Offset, DocumentMismatchError, check_doc_unchanged
 from datacube.utils.generic import thread_local_cache
 from datacube.utils.geometry import CRS, Geometry, box
 from datacube.utils.documents import UnknownMetadataType
+from datacube.index._instrument import QueryStats, record_queries
+from datacube.index._columnar import rows_to_table
 
 _LOG = logging.getLogger(__name__)
 
@@ -1130,15 +1135,42 @@ class AbstractDatasetResource(ABC):
     def search(self,
                limit: Optional[int] = None,
                source_filter: Optional[QueryDict] = None,
+               batch_size: Optional[int] = None,
                **query: QueryField) -> Iterable[Dataset]:
         """
         Perform a search, returning results as Dataset objects.
 
         :param limit: Limit number of datasets per product (None/default = unlimited)
+        :param batch_size: If set, stream results from the database this many rows at a time,
+                           so memory use does not grow with the number of results.
+                           Default/None: index implementation default (may read all results at once).
         :param query: search query parameters
         :return: Matching datasets
         """
 
+    def search_compact(self,
+                       limit: Optional[int] = None,
+                       batch_size: Optional[int] = 1000,
+                       **query: QueryField) -> Iterable[CompactDataset]:
+        """
+        Perform a search, returning results as compact datasets.
+
+        Only the id, product, time, CRS, extent and uris of each result are kept in memory, the
+        metadata document is read back from the index if and when it is needed, see
+        :func:`datacube.model.materialise_datasets`. Use this for searches returning too many
+        datasets to hold as full :class:`Dataset` objects.
+
+        The default implementation reads full datasets and discards them, index drivers that can
+        search without reading metadata documents should override it.
+
+        :param limit: Limit number of datasets per product (None/default = unlimited)
+        :param batch_size: Stream results from the database this many rows at a time
+        :param query: search query parameters
+        :return: Matching datasets as :class:`datacube.model.CompactDataset`
+        """
+        for ds in self.search(limit=limit, batch_size=batch_size, **query):
+            yield CompactDataset.from_dataset(ds, loader=self.bulk_get)
+
     def get_all_docs_for_product(self, product: Product, batch_size: int = 1000) -> Iterable[DatasetTuple]:
         for ds in self.search(product=[product.name]):
             yield (product, ds.metadata_doc, ds.uris)
@@ -1245,6 +1277,169 @@ class AbstractDatasetResource(ABC):
 
         return BatchStatus(added, skipped, monotonic() - job_started)
 
+    def _add_datasets_batch(self,
+                            batch: List[Dataset],
+                            with_lineage: bool = True,
+                            archive_less_mature: Optional[int] = None,
+                            cache: Optional[Mapping[str, Any]] = None) -> BatchStatus:
+        """
+        Add a single "batch" of Dataset models.
+
+        Datasets already in the index are skipped, the rest (with lineage, also their sources
+        that are not indexed yet) are written with :meth:`_add_batch` and their lineage with
+        :meth:`_add_lineage_batch`, in one transaction.  If that fails, e.g. because of missing
+        lineage, datasets are added one at a time so that failures are reported per dataset.
+
+        API Note: This API method is not finalised and may be subject to change.
+
+        :param batch: One batch's worth of Dataset models to add
+        :param cache: Cache shared between batches, as returned by :meth:`_init_bulk_add_cache`
+        :return: BatchStatus named tuple.
+        """
+        from datacube.model.utils import flatten_datasets
+
+        b_started = monotonic()
+        if cache is None:
+            cache = self._init_bulk_add_cache()
+
+        # Same dataset selection rules as `add`, but for the whole batch at once
+        if with_lineage:
+            flat = [flatten_datasets(top) for top in batch]
+        else:
+            flat = [{top.id: [top]} for top in batch]
+        all_uuids = list({dsid for ds_by_uuid in flat for dsid in ds_by_uuid})
+        in_db = {dsid for dsid, has in zip(all_uuids, self.bulk_has(all_uuids)) if has}
+
+        top_level: List[Dataset] = []
+        to_insert: Dict[UUID, Dataset] = {}
+        b_skipped = 0
+        for top, ds_by_uuid in zip(batch, flat):
+            if top.id in in_db or top.id in to_insert:
+                _LOG.warning('Dataset %s is already in the database', top.id)
+                b_skipped += 1
+                continue
+            top_level.append(top)
+            for dsid, dss in ds_by_uuid.items():
+                if dsid not in in_db:
+                    to_insert.setdefault(dsid, dss[0])
+        if not top_level:
+            return BatchStatus(0, b_skipped, monotonic() - b_started)
+
+        products: Dict[str, Product] = {}
+
+        def resolve_product(product: Product) -> Product:
+            if product.name not in products:
+                if product.id is None:
+                    # don't assume the product has an id value since it's optional
+                    # but we should error if the product doesn't exist in the db
+                    product = self.products.get_by_name_unsafe(product.name)
+                products[product.name] = product
+            return products[product.name]
+
+        # locations are recorded for top-level datasets only
+        top_ids = {top.id for top in top_level}
+        ds_tups = [DatasetTuple(resolve_product(ds.product),
+                                ds.metadata_doc_without_lineage(),
+                                (ds.uris or []) if dsid in top_ids else [])
+                   for dsid, ds in to_insert.items()]
+        edges = [(classifier, ds, src)
+                 for ds in to_insert.values() if ds.sources is not None
+                 for classifier, src in ds.sources.items()]
+
+        try:
+            with self._bulk_add_transaction():
+                status = self._add_batch(ds_tups, cache)
+                self._add_lineage_batch(edges, with_lineage)
+                if archive_less_mature is not None:
+                    for top in top_level:
+                        self.archive_less_mature(top, archive_less_mature)
+        except (ValueError, MissingRecordError, NotImplementedError) as e:
+            _LOG.warning("Batch add failed (%s), adding datasets one at a time", e)
+            b_added = 0
+            for ds in top_level:
+                try:
+                    self.add(ds, with_lineage=with_lineage, archive_less_mature=archive_less_mature)
+                    b_added += 1
+                except (ValueError, MissingRecordError) as e:
+                    _LOG.error('Failed to add dataset %s: %s', ds.local_uri, e)
+                    b_skipped += 1
+            return BatchStatus(b_added, b_skipped, monotonic() - b_started)
+
+        # `_add_batch` counts sources too, report top-level datasets only
+        b_added = max(0, len(top_level) - status.skipped)
+        return BatchStatus(b_added, b_skipped + len(top_level) - b_added, monotonic() - b_started)
+
+    def _add_lineage_batch(self, edges: List[Tuple[str, Dataset, Dataset]], with_lineage: bool = True) -> None:
+        """
+        Record lineage of a batch of datasets added by :meth:`_add_datasets_batch`.
+
+        Default implementation raises NotImplementedError if there is any lineage to record,
+        so that :meth:`_add_datasets_batch` adds datasets one at a time instead.
+
+        API Note: This API method is not finalised and may be subject to change.
+
+        :param edges: (classifier, dataset, source dataset) for every source of the added datasets
+        :param with_lineage: See :meth:`add`
+        """
+        if edges:
+            raise NotImplementedError("Lineage can not be added in batches by this index driver")
+
+    def _bulk_add_transaction(self) -> ContextManager:
+        """
+        Context manager grouping the writes of one batch of :meth:`_add_datasets_batch` in a transaction.
+
+        Default implementation does not use a transaction.
+
+        API Note: This API method is not finalised and may be subject to change.
+        """
+        return nullcontext()
+
+    def bulk_add_datasets(self,
+                          datasets: Iterable[Dataset],
+                          with_lineage: bool = True,
+                          archive_less_mature: Optional[int] = None,
+                          batch_size: int = 1000) -> BatchStatus:
+        """
+        Add Dataset models (e.g. as produced by :class:`datacube.index.hl.Doc2Dataset`) in batches.
+
+        Behaves like calling :meth:`add` on every dataset, but index drivers may write each
+        batch with a few multi-row statements.
+
+        API Note: This API method is not finalised and may be subject to change.
+
+        :param datasets: Unpersisted dataset models
+        :param with_lineage: See :meth:`add`
+        :param archive_less_mature: See :meth:`add`
+        :param batch_size: Number of datasets to add per batch (default 1000)
+        :return: BatchStatus named tuple, with `safe` set to None.
+        """
+        added = 0
+        skipped = 0
+        job_started = monotonic()
+        batch: List[Dataset] = []
+        inter_batch_cache = self._init_bulk_add_cache()
+
+        def flush():
+            nonlocal added, skipped
+            batch_result = self._add_datasets_batch(batch,
+                                                    with_lineage=with_lineage,
+                                                    archive_less_mature=archive_less_mature,
+                                                    cache=inter_batch_cache)
+            _LOG.info("Batch %d/%d datasets added in %.2fs", batch_result.completed,
+                      len(batch), batch_result.seconds_elapsed)
+            added += batch_result.completed
+            skipped += batch_result.skipped
+            batch.clear()
+
+        for ds in datasets:
+            batch.append(ds)
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+
+        return BatchStatus(added, skipped, monotonic() - job_started)
+
     @abstractmethod
     def search_by_product(self,
                           **query: QueryField
@@ -1275,6 +1470,46 @@ class AbstractDatasetResource(ABC):
         :return: Namedtuple of requested fields, for each matching dataset.
         """
 
+    def search_to_table(self,
+                        field_names: Iterable[str],
+                        limit: Optional[int] = None,
+                        output: str = "pandas",
+                        batch_size: int = 10000,
+                        **query: QueryField):
+        """
+        Perform a search, returning the specified fields as a table with a column per field.
+
+        Intended for analysis over large numbers of datasets, rows are converted to columns a
+        batch at a time. Range fields (e.g. ``time``) are split into ``<name>_begin`` and
+        ``<name>_end`` columns, times are UTC timestamps and UUIDs, geometries and decimals
+        are given column types rather than left as Python objects. Columns and their types
+        follow the search fields of the matching products, also when no dataset matches.
+
+        :param field_names: Names of desired fields
+        :param limit: Limit number of dataset (None/default = unlimited)
+        :param output: ``pandas`` for a :class:`pandas.DataFrame` or ``arrow`` for a
+                       :class:`pyarrow.Table` (requires ``pyarrow``)
+        :param batch_size: Number of rows to convert at a time
+        :param query: search query parameters
+        :return: Table with a row for each matching dataset
+        """
+        field_names = list(field_names)
+        return rows_to_table(field_names,
+                             toolz.partition_all(batch_size,
+                                                 self.search_returning(field_names, limit=limit, **query)),
+                             self._search_fields(query),
+                             output=output)
+
+    def _search_fields(self, query: QueryDict) -> Mapping[str, Field]:
+        """
+        Search fields of the products a query can match, the first product defining a name wins.
+        """
+        fields: MutableMapping[str, Field] = {}
+        for product, _ in self.products.search_robust(**query):
+            for name, field in product.metadata_type.dataset_fields.items():
+                fields.setdefault(name, field)
+        return fields
+
     @abstractmethod
     def count(self, **query: QueryField) -> int:
         """
@@ -1811,6 +2046,38 @@ class AbstractIndex(ABC):
                  None if spatial indexes are not supported.
         """
 
+    @contextmanager
+    def query_stats(self, explain: bool = False) -> Iterator[QueryStats]:
+        """
+        Record timing of the database queries issued by searches in this thread.
+
+        .. code-block:: python
+
+            with index.query_stats() as stats:
+                datasets = list(index.datasets.search(product='ls8_ard', time=('2020-01', '2020-02')))
+            print(stats)         # per-operation totals
+            stats.events         # a QueryEvent per query: sql, rows, db_seconds, python_seconds
+
+        Only supported by the postgres and postgis index drivers, other drivers record no events.
+
+        :param explain: Also record ``EXPLAIN (ANALYZE, BUFFERS)`` output for every query,
+                        note that this runs every query twice.
+        """
+        with record_queries(QueryStats(explain=explain)) as stats:
+            yield stats
+        _LOG.debug("Index query stats:\n%s", stats)
+
+    def pool_stats(self) -> Optional[Mapping[str, Any]]:
+        """
+        Database connection pool metrics for this index, ``None`` if the index driver has no connection pool.
+
+        Includes ``checkouts``, ``checkins``, ``checked_out``, ``connects`` (new database connections),
+        ``invalidations``, and ``waits``, ``wait_seconds``, ``mean_wait_seconds`` and ``max_wait_seconds``
+        (time spent getting a connection from the pool).  Pool settings are read from the
+        ``db_pool_*`` configuration options.
+        """
+        return None
+
     def thread_transaction(self) -> Optional["AbstractTransaction"]:
         """
         :return: The existing Transaction object cached in thread-local storage for this index, if there is one.
@@ -1831,18 +2098,27 @@ class AbstractIndex(ABC):
     def update_spatial_index(self,
                              crses: Sequence[CRS] = [],
                              product_names: Sequence[str] = [],
-                             dataset_ids: Sequence[DSID] = []
+                             dataset_ids: Sequence[DSID] = [],
+                             batch_size: int = 1000,
+                             progress_cbk: Optional[Callable[[str, int], Any]] = None,
                              ) -> int:
         """
         Update a spatial index
         :param crs: CRSs for Spatial Indexes to update. Default=all indexes
         :param product_names: Product names to update
         :param dsids: Dataset IDs to update
+        :param batch_size: Number of datasets to process per database round trip
+        :param progress_cbk: Called with product name and number of entries updated
+                             after each product is committed
 
         If neither product_names nor dataset ids are supplied, update for all datasets.
 
         If both are supplied, both the named products and identified datasets are updated.
 
+        Unless dataset ids are supplied, products are updated one at a time, each in its own
+        transaction, so an interrupted rebuild can be resumed by passing the product names
+        that have not been reported to ``progress_cbk``.
+
         If spatial indexes are not supported by the index driver, always return zero.
 
         :return:  Number of spatial index entries updated or verified as unindexed.
@@ -1850,6 +2126,31 @@ class AbstractIndex(ABC):
         _LOG.warning("Spatial index API is unstable and may change between releases.")
         return 0
 
+    def update_search_index(self,
+                            product_names: Sequence[str] = [],
+                            dataset_ids: Sequence[DSID] = [],
+                            batch_size: int = 1000,
+                            progress_cbk: Optional[Callable[[str, int], Any]] = None,
+                            ) -> int:
+        """
+        Rebuild the search field index from stored dataset metadata documents
+        :param product_names: Product names to update
+        :param dataset_ids: Dataset IDs to update
+        :param batch_size: Number of datasets to process per database round trip
+        :param progress_cbk: Called with product name and number of datasets updated
+                             after each product is committed
+
+        If neither product_names nor dataset ids are supplied, update for all datasets.
+
+        Products are updated in the same way as :meth:`update_spatial_index`, so an
+        interrupted rebuild can be resumed in the same way.
+
+        If the index driver does not keep a separate search field index, always return zero.
+
+        :return:  Number of datasets whose search fields have been updated.
+        """
+        return 0
+
     def __enter__(self):
         return self
 
@@ -19,6 +19,7 @@ from datacube.index.abstract import AbstractDatasetResource, DSID, dsid_to_uuid,
 from datacube.index.fields import Field
 from datacube.index.memory._fields import build_custom_fields, get_dataset_fields
 from datacube.index.memory._products import ProductResource
+from datacube.index.memory._search_index import ProductSearchIndex
 from datacube.model import Dataset, DatasetType as Product, Range, ranges_overlap
 from datacube.utils import jsonify_document, _readable_offset
 from datacube.utils import changes
@@ -32,6 +33,7 @@ _LOG = logging.getLogger(__name__)
 class DatasetResource(AbstractDatasetResource):
     def __init__(self, product_resource: ProductResource) -> None:
         self.product_resource = product_resource
+        self.products = self.types = product_resource
         self.metadata_type_resource = product_resource.metadata_type_resource
         # Main dataset index
         self.by_id: MutableMapping[UUID, Dataset] = {}
@@ -46,6 +48,8 @@ class DatasetResource(AbstractDatasetResource):
         self.archived_locations: MutableMapping[UUID, List[Tuple[str, datetime.datetime]]] = {}
         # Active Index By Product
         self.by_product: MutableMapping[str, List[UUID]] = {}
+        # Secondary indexes over active datasets, by product
+        self.search_indexes: MutableMapping[str, ProductSearchIndex] = {}
 
     def get(self, id_: DSID, include_sources: bool = False) -> Optional[Dataset]:
         try:
@@ -101,10 +105,17 @@ class DatasetResource(AbstractDatasetResource):
                 self.by_product[dataset.product.name].append(dataset.id)
             else:
                 self.by_product[dataset.product.name] = [dataset.id]
+            self._search_index(dataset.product.name).add(persistable.id, persistable.metadata_doc)
         if archive_less_mature:
             _LOG.warning("archive-less-mature functionality is not implemented for memory driver")
         return cast(Dataset, self.get(dataset.id))
 
+    def _add_lineage_batch(self, edges: List[Tuple[str, Dataset, Dataset]], with_lineage: bool = True) -> None:
+        # Like `add`, lineage is only recorded when adding with lineage
+        if with_lineage:
+            for classifier, ds, src in edges:
+                self.persist_source_relationship(ds, src, classifier)
+
     def persist_source_relationship(self, ds: Dataset, src: Dataset, classifier: str) -> None:
         # Add source lineage link
         if ds.id not in self.derived_from:
@@ -234,6 +245,7 @@ class DatasetResource(AbstractDatasetResource):
         persistable = self.clone(dataset, for_save=True)
         self.by_id[dataset.id] = persistable
         self.active_by_id[dataset.id] = persistable
+        self._search_index(persistable.product.name).add(persistable.id, persistable.metadata_doc)
         return cast(Dataset, self.get(dataset.id))
 
     def _update_locations(self,
@@ -259,6 +271,7 @@ class DatasetResource(AbstractDatasetResource):
             if id_ in self.active_by_id:
                 ds = self.active_by_id.pop(id_)
                 self.by_product[ds.product.name] = [i for i in self.by_product[ds.product.name] if i != ds.id]
+                self._search_index(ds.product.name).remove(ds.id)
                 ds.archived_time = datetime.datetime.now()
                 self.archived_by_id[id_] = ds
 
@@ -270,6 +283,7 @@ class DatasetResource(AbstractDatasetResource):
                 ds.archived_time = None
                 self.active_by_id[id_] = ds
                 self.by_product[ds.product.name].append(ds.id)
+                self._search_index(ds.product.name).add(ds.id, ds.metadata_doc)
 
     def purge(self, ids: Iterable[DSID]) -> None:
         for id_ in ids:
@@ -286,6 +300,11 @@ class DatasetResource(AbstractDatasetResource):
                         del self.derived_from[child_id][classifier]
                     del self.derivations[id_]
 
+    def _search_index(self, product_name: str) -> ProductSearchIndex:
+        if product_name not in self.search_indexes:
+            self.search_indexes[product_name] = ProductSearchIndex()
+        return self.search_indexes[product_name]
+
     def get_all_dataset_ids(self, archived: bool) -> Iterable[UUID]:
         if archived:
             return (id_ for id_ in self.archived_by_id.keys())
@@ -430,17 +449,14 @@ class DatasetResource(AbstractDatasetResource):
                 break
             query_exprs = tuple(fields.to_expressions(product.metadata_type.dataset_fields.get, **q))
             product_results = []
-            for dsid in self.by_product.get(product.name, []):
+            for dsid in self._search_index(product.name).candidates(query_exprs):
                 if limit is not None and matches >= limit:
                     break
-                ds = cast(Dataset, self.get(dsid, include_sources=True))
-                query_matches = True
-                for expr in query_exprs:
-                    if not expr.evaluate(ds.metadata_doc):
-                        query_matches = False
-                        break
-                if not query_matches:
+                # Check the stored document before paying for a copy of the dataset
+                doc = self.by_id[dsid].metadata_doc
+                if not all(expr.evaluate(doc) for expr in query_exprs):
                     continue
+                ds = cast(Dataset, self.get(dsid, include_sources=True))
                 if source_product:
                     matching_source = None
                     for sds in cast(Mapping[str, Dataset], ds.sources).values():
@@ -496,6 +512,7 @@ class DatasetResource(AbstractDatasetResource):
     def search(self,
                limit: Optional[int] = None,
                source_filter: Optional[Mapping[str, QueryField]] = None,
+               batch_size: Optional[int] = None,
                **query: QueryField) -> Iterable[Dataset]:
         return cast(Iterable[Dataset], self._search_flat(limit=limit, source_filter=source_filter, **query))
 
@@ -0,0 +1,327 @@
+# This file is part of the Open Data Cube, see https://opendatacube.org for more information
+#
+# Copyright (c) 2015-2024 ODC Contributors
+# SPDX-License-Identifier: Apache-2.0
+"""
+Secondary indexes over the active datasets of a product, used to narrow down memory index searches.
+
+Each index is built the first time a query can use it, and is kept up to date as datasets are
+added, updated, archived and restored from then on:
+
+- hash indexes on single-valued fields, for equality queries
+- sorted interval indexes on range fields (e.g. ``time``), for overlap/contains queries
+- an STRtree over the ``lon``/``lat`` box of each dataset, for spatial queries
+
+Indexes only select candidates: every candidate is still checked against the full query.
+"""
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Dict, Hashable, Iterable, List, Mapping, MutableMapping, Optional, Set, Tuple
+from uuid import UUID
+
+from shapely import STRtree, box
+
+from datacube.index.fields import Expression, OrExpression
+from datacube.model import Range
+from datacube.model.fields import (Field, SimpleField, RangeField, SimpleEqualsExpression,
+                                   RangeBetweenExpression, RangeContainsExpression)
+from datacube.utils.dates import tz_aware
+
+Doc = Mapping[str, Any]
+
+# Rebuild the STRtree once this many datasets have been added or removed since it was built,
+# or a quarter of the datasets in it, whichever is larger.
+_MIN_TREE_CHANGES = 256
+
+
+def _key(value: Any) -> Any:
+    # Comparable keys: Decimal and float bounds can't be subtracted from each other
+    if isinstance(value, datetime):
+        return tz_aware(value)
+    if isinstance(value, date):
+        return tz_aware(datetime.combine(value, time.min))
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _bounds(value: Optional[Range]) -> Tuple[Any, Any]:
+    if value is None:
+        return None, None
+    return _key(value.begin), _key(value.end)
+
+
+class HashIndex:
+    """ Dataset ids by value of a single-valued field """
+
+    def __init__(self, field: Field):
+        self.field = field
+        self._by_value: Dict[Hashable, Set[UUID]] = {}
+        # Values that can't be hashed (e.g. lists) are always candidates
+        self._unhashable: Set[UUID] = set()
+
+    def add(self, id_: UUID, doc: Doc) -> None:
+        v = self.field.extract(doc)  # type: ignore[attr-defined]
+        try:
+            self._by_value.setdefault(v, set()).add(id_)
+        except TypeError:
+            self._unhashable.add(id_)
+
+    def remove(self, id_: UUID, doc: Doc) -> None:
+        v = self.field.extract(doc)  # type: ignore[attr-defined]
+        try:
+            ids = self._by_value.get(v)
+        except TypeError:
+            self._unhashable.discard(id_)
+            return
+        if ids is not None:
+            ids.discard(id_)
+            if not ids:
+                del self._by_value[v]
+
+    def equals(self, value: Any) -> Set[UUID]:
+        return self._by_value.get(value, set()) | self._unhashable
+
+
+class IntervalIndex:
+    """
+    Dataset ids sorted by the start of a range field.
+
+    Overlap queries bisect to the datasets starting no later than the end of the query range,
+    and no earlier than its start minus the longest indexed range.
+    """
+
+    def __init__(self, field: Field):
+        self.field = field
+        self._begins: List[Any] = []
+        self._entries: List[Tuple[Any, UUID]] = []
+        self._bounds: Dict[UUID, Tuple[Any, Any]] = {}
+        self._max_span: Any = None
+        # Ranges missing a bound are always candidates
+        self._open: Set[UUID] = set()
+
+    def add(self, id_: UUID, doc: Doc) -> None:
+        begin, end = _bounds(self.field.extract(doc))  # type: ignore[attr-defined]
+        self._bounds[id_] = (begin, end)
+        if begin is None or end is None:
+            self._open.add(id_)
+            return
+        try:
+            span = end - begin
+            if self._max_span is None or span > self._max_span:
+                self._max_span = span
+            pos = bisect_right(self._begins, begin)
+        except TypeError:
+            self._open.add(id_)
+            return
+        self._begins.insert(pos, begin)
+        self._entries.insert(pos, (end, id_))
+
+    def remove(self, id_: UUID, doc: Doc) -> None:
+        if id_ not in self._bounds:
+            return
+        begin, _ = self._bounds.pop(id_)
+        if id_ in self._open:
+            self._open.discard(id_)
+            return
+        pos = bisect_left(self._begins, begin)
+        while pos < len(self._begins) and self._begins[pos] == begin:
+            if self._entries[pos][1] == id_:
+                del self._begins[pos]
+                del self._entries[pos]
+                return
+            pos += 1
+
+    def overlapping(self, low: Any, high: Any) -> Set[UUID]:
+        low, high = _key(low), _key(high)
+        try:
+            stop = len(self._begins) if high is None else bisect_right(self._begins, high)
+            if low is None or self._max_span is None:
+                start = 0
+            else:
+                start = bisect_left(self._begins, low - self._max_span)
+            out = {id_ for end, id_ in self._entries[start:stop] if low is None or end >= low}
+        except TypeError:
+            # Query bounds not comparable with the indexed values: let the query decide
+            return set(self._bounds)
+        return out | self._open
+
+
+class SpatialIndex:
+    """
+    An STRtree over the ``lon``/``lat`` box of each dataset.
+
+    STRtrees can't be modified, so datasets added since the tree was built are checked
+    one by one, until there are enough of them to make rebuilding the tree worthwhile.
+    """
+
+    def __init__(self, lon_field: Field, lat_field: Field):
+        self.lon_field = lon_field
+        self.lat_field = lat_field
+        self._boxes: Dict[UUID, Tuple[float, float, float, float]] = {}
+        self._tree: Optional[STRtree] = None
+        self._tree_ids: List[UUID] = []
+        self._pending: Set[UUID] = set()
+        self._removed: Set[UUID] = set()
+        # Datasets without a full lon/lat box are always candidates
+        self._open: Set[UUID] = set()
+
+    def add(self, id_: UUID, doc: Doc) -> None:
+        (x0, x1), (y0, y1) = (_bounds(f.extract(doc))  # type: ignore[attr-defined]
+                              for f in (self.lon_field, self.lat_field))
+        if None in (x0, x1, y0, y1):
+            self._open.add(id_)
+            return
+        self._boxes[id_] = (float(x0), float(y0), float(x1), float(y1))
+        self._removed.discard(id_)
+        self._pending.add(id_)
+
+    def remove(self, id_: UUID, doc: Doc) -> None:
+        self._open.discard(id_)
+        if self._boxes.pop(id_, None) is None:
+            return
+        if id_ in self._pending:
+            self._pending.discard(id_)
+        else:
+            self._removed.add(id_)
+
+    def _refresh(self) -> None:
+        changes = len(self._pending) + len(self._removed)
+        if self._tree is not None and changes < max(_MIN_TREE_CHANGES, len(self._tree_ids) // 4):
+            return
+        self._tree_ids = list(self._boxes)
+        self._tree = STRtree([box(*self._boxes[id_]) for id_ in self._tree_ids])
+        self._pending = set()
+        self._removed = set()
+
+    def intersecting(self, lon: Tuple[Any, Any], lat: Tuple[Any, Any]) -> Set[UUID]:
+        self._refresh()
+        inf = float('inf')
+        (x0, x1), (y0, y1) = ((-inf if lo is None else float(lo), inf if hi is None else float(hi))
+                              for lo, hi in (lon, lat))
+        assert self._tree is not None
+        out = {self._tree_ids[i] for i in self._tree.query(box(x0, y0, x1, y1))}
+        out -= self._removed
+        out.update(id_ for id_ in self._pending
+                   if self._boxes[id_][0] <= x1 and self._boxes[id_][2] >= x0
+                   and self._boxes[id_][1] <= y1 and self._boxes[id_][3] >= y0)
+        return out | self._open
+
+
+def _range_query(expr: Expression) -> Optional[Tuple[Any, Any]]:
+    if isinstance(expr, RangeBetweenExpression):
+        return expr.low, expr.high
+    if isinstance(expr, RangeContainsExpression):
+        return expr.value, expr.value
+    return None
+
+
+def _equals_values(expr: Expression) -> Optional[List[Any]]:
+    if isinstance(expr, SimpleEqualsExpression):
+        return [expr.value]
+    if isinstance(expr, OrExpression):
+        values = [_equals_values(e) for e in expr.exprs]
+        if all(v is not None for v in values):
+            return [v for vv in values for v in vv]  # type: ignore[union-attr]
+    return None
+
+
+class ProductSearchIndex:
+    """
+    Secondary indexes over the active datasets of one product.
+    """
+
+    def __init__(self) -> None:
+        self._docs: Dict[UUID, Doc] = {}
+        self._seq: Dict[UUID, int] = {}
+        self._next_seq = 0
+        self._hash: MutableMapping[str, HashIndex] = {}
+        self._intervals: MutableMapping[str, IntervalIndex] = {}
+        self._spatial: Optional[SpatialIndex] = None
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def _indexes(self) -> Iterable[Any]:
+        yield from self._hash.values()
+        yield from self._intervals.values()
+        if self._spatial is not None:
+            yield self._spatial
+
+    def add(self, id_: UUID, doc: Doc) -> None:
+        """
+        Add a dataset, or replace the document of one already indexed (keeping its place in the order).
+        """
+        old = self._docs.get(id_)
+        if old is not None:
+            for index in self._indexes():
+                index.remove(id_, old)
+        else:
+            self._seq[id_] = self._next_seq
+            self._next_seq += 1
+        self._docs[id_] = doc
+        for index in self._indexes():
+            index.add(id_, doc)
+
+    def remove(self, id_: UUID) -> None:
+        doc = self._docs.pop(id_, None)
+        if doc is None:
+            return
+        del self._seq[id_]
+        for index in self._indexes():
+            index.remove(id_, doc)
+
+    def _build(self, index):
+        for id_, doc in self._docs.items():
+            index.add(id_, doc)
+        return index
+
+    def _hash_index(self, field: Field) -> HashIndex:
+        if field.name not in self._hash:
+            self._hash[field.name] = self._build(HashIndex(field))
+        return self._hash[field.name]
+
+    def _interval_index(self, field: Field) -> IntervalIndex:
+        if field.name not in self._intervals:
+            self._intervals[field.name] = self._build(IntervalIndex(field))
+        return self._intervals[field.name]
+
+    def _spatial_index(self, lon_field: Field, lat_field: Field) -> SpatialIndex:
+        if self._spatial is None:
+            self._spatial = self._build(SpatialIndex(lon_field, lat_field))
+        return self._spatial
+
+    def candidates(self, exprs: Iterable[Expression]) -> List[UUID]:
+        """
+        Ids of datasets that may match all of ``exprs``, in the order they were added.
+        """
+        exprs = list(exprs)
+        found: List[Set[UUID]] = []
+
+        ranges: Dict[str, Tuple[Field, Tuple[Any, Any]]] = {}
+        for expr in exprs:
+            query = _range_query(expr)
+            if query is not None and isinstance(expr.field, RangeField):  # type: ignore[attr-defined]
+                ranges[expr.field.name] = (expr.field, query)  # type: ignore[attr-defined]
+        if 'lon' in ranges and 'lat' in ranges:
+            (lon_field, lon), (lat_field, lat) = ranges.pop('lon'), ranges.pop('lat')
+            found.append(self._spatial_index(lon_field, lat_field).intersecting(lon, lat))
+        for field, (low, high) in ranges.values():
+            found.append(self._interval_index(field).overlapping(low, high))
+
+        for expr in exprs:
+            values = _equals_values(expr)
+            if values is None or not isinstance(expr.field, SimpleField):  # type: ignore[attr-defined]
+                continue
+            index = self._hash_index(expr.field)  # type: ignore[attr-defined]
+            try:
+                found.append(set().union(*(index.equals(v) for v in values)))
+            except TypeError:
+                # Unhashable query value
+                continue
+
+        if not found:
+            return list(self._docs)
+        found.sort(key=len)
+        return sorted(found[0].intersection(*found[1:]), key=self._seq.__getitem__)
@@ -10,7 +10,7 @@ from typing import Iterable
 
 class DatasetResource(AbstractDatasetResource):
     def __init__(self, product_resource):
-        self.types = product_resource
+        self.products = self.types = product_resource
 
     def get(self, id_: DSID, include_sources=False):
         return None
@@ -83,7 +83,7 @@ class DatasetResource(AbstractDatasetResource):
     def search_by_metadata(self, metadata):
         return []
 
-    def search(self, limit=None, **query):
+    def search(self, limit=None, batch_size=None, **query):
         return []
 
     def search_by_product(self, **query):
@@ -17,16 +17,19 @@ from sqlalchemy import select, func
 
 from datacube.drivers.postgis._fields import SimpleDocField, DateDocField
 from datacube.drivers.postgis._schema import Dataset as SQLDataset, search_field_map
-from datacube.drivers.postgis._api import extract_dataset_search_fields
+from datacube.drivers.postgis._api import extract_dataset_search_fields, get_compact_fields
 from datacube.utils.uris import split_uri
 from datacube.drivers.postgis._spatial import generate_dataset_spatial_values, extract_geometry_from_eo3_projection
 
+from datacube.index._columnar import rows_to_table
+from datacube.index._instrument import materialise
 from datacube.index.abstract import AbstractDatasetResource, DatasetSpatialMixin, DSID, BatchStatus, DatasetTuple
 from datacube.index.postgis._transaction import IndexResourceAddIn
-from datacube.model import Dataset, Product, Range
+from datacube.model import Dataset, CompactDataset, Product, Range
 from datacube.model.fields import Field
 from datacube.utils import jsonify_document, _readable_offset, changes
 from datacube.utils.changes import get_doc_changes
+from datacube.utils.dates import tz_as_utc
 from datacube.utils.geometry import CRS, Geometry
 from datacube.index import fields
 
@@ -221,20 +224,15 @@ class DatasetResource(AbstractDatasetResource, IndexResourceAddIn):
                         "uri_body": body,
                     }
                 )
-            extent = extract_geometry_from_eo3_projection(
-                metadata_doc["grid_spatial"]["projection"]
-            )
+            projection = metadata_doc.get("grid_spatial", {}).get("projection")
+            extent = extract_geometry_from_eo3_projection(projection) if projection else None
             if extent:
                 geo_extent = extent.to_crs(CRS("EPSG:4326"))
                 for crs in crses:
                     values = generate_dataset_spatial_values(dsid, crs, extent, geo_extent=geo_extent)
                     if values is not None:
                         batch["spatial_indexes"][crs].append(values)
-            if prod.metadata_type.name in cache:
-                search_field_vals = cache[prod.metadata_type.name]
-            else:
-                search_field_vals = extract_dataset_search_fields(metadata_doc, prod.metadata_type.definition)
-                cache[prod.metadata_type.name] = search_field_vals
+            search_field_vals = extract_dataset_search_fields(metadata_doc, prod.metadata_type.definition)
             for fname, finfo in search_field_vals.items():
                 ftype, fval = finfo
                 if isinstance(fval, Range):
@@ -258,6 +256,14 @@ class DatasetResource(AbstractDatasetResource, IndexResourceAddIn):
                 connection.insert_dataset_search_bulk(search_type, values)
         return BatchStatus(b_added, b_skipped, monotonic() - b_started)
 
+    def _add_lineage_batch(self, edges, with_lineage=True):
+        # Like `add`, lineage is not supported and otherwise not recorded
+        if with_lineage:
+            raise ValueError("Lineage is not yet supported by the postgis driver")
+
+    def _bulk_add_transaction(self):
+        return self._index.transaction()
+
     def search_product_duplicates(self, product: Product, *args):
         """
         Find dataset ids who have duplicates of the given set of field names.
@@ -554,7 +560,41 @@ class DatasetResource(AbstractDatasetResource, IndexResourceAddIn):
         """
         :rtype list[Dataset]
         """
-        return (self._make(dataset, product=product) for dataset in query_result)
+        return materialise(query_result, lambda dataset: self._make(dataset, product=product))
+
+    def _make_compact(self, row, product):
+        """
+        :rtype CompactDataset
+        """
+        time = getattr(row, 'time', None)
+        if time is not None:
+            time = Range(tz_as_utc(time.lower), tz_as_utc(time.upper))
+        lon = getattr(row, 'lon', None)
+        mid_longitude = None
+        if lon is not None and lon.lower is not None and lon.upper is not None:
+            mid_longitude = float(lon.lower + lon.upper)*0.5
+
+        return CompactDataset.from_grid_spatial(
+            row.id,
+            product,
+            time=time,
+            grid_spatial=getattr(row, 'grid_spatial', None),
+            mid_longitude=mid_longitude,
+            uris=[uri for uri in row.uris if uri] if row.uris else [],
+            loader=self.bulk_get
+        )
+
+    @staticmethod
+    def _compact_select_fields(product):
+        """
+        Fields read for compact datasets: id, time and longitude search fields, uris and
+        the grid spatial section of the metadata document.
+        """
+        metadata_type = product.metadata_type
+        dataset_fields = metadata_type.dataset_fields
+        compact_fields = get_compact_fields(metadata_type.definition['dataset'].get('grid_spatial'))
+        return tuple(dataset_fields[name] for name in ('id', 'time', 'lon') if name in dataset_fields) \
+            + tuple(compact_fields.values())
 
     def search_by_metadata(self, metadata):
         """
@@ -569,18 +609,21 @@ class DatasetResource(AbstractDatasetResource, IndexResourceAddIn):
             for dataset in self._make_many(connection.search_datasets_by_metadata(metadata)):
                 yield dataset
 
-    def search(self, limit=None, **query):
+    def search(self, limit=None, batch_size=None, **query):
         """
         Perform a search, returning results as Dataset objects.
 
         :param Union[str,float,Range,list] query:
         :param int limit: Limit number of datasets
+        :param int batch_size: Stream results through a server-side cursor, fetching this many rows at a time.
+                               Default is to fetch all results at once.
         :rtype: __generator[Dataset]
         """
         source_filter = query.pop('source_filter', None)
         for product, datasets in self._do_search_by_product(query,
                                                             source_filter=source_filter,
-                                                            limit=limit):
+                                                            limit=limit,
+                                                            batch_size=batch_size):
             yield from self._make_many(datasets, product)
 
     def search_by_product(self, **query):
@@ -593,6 +636,23 @@ class DatasetResource(AbstractDatasetResource, IndexResourceAddIn):
         for product, datasets in self._do_search_by_product(query):
             yield product, self._make_many(datasets, product)
 
+    def search_compact(self, limit=None, batch_size=1000, **query):
+        """
+        Perform a search, returning results as compact datasets.
+
+        Only the fields kept by compact datasets are read, not the metadata documents.
+
+        :param Union[str,float,Range,list] query:
+        :param int limit: Limit number of datasets
+        :param int batch_size: Stream results through a server-side cursor, fetching this many rows at a time.
+        :rtype: __generator[CompactDataset]
+        """
+        for product, rows in self._do_search_by_product(query,
+                                                        compact=True,
+                                                        limit=limit,
+                                                        batch_size=batch_size):
+            yield from materialise(rows, lambda row: self._make_compact(row, product))
+
     def search_returning(self, field_names, limit=None, **query):
         """
         Perform a search, returning only the specified fields.
@@ -612,8 +672,21 @@ class DatasetResource(AbstractDatasetResource, IndexResourceAddIn):
                                                      return_fields=True,
                                                      select_field_names=field_names,
                                                      limit=limit):
-            for columns in results:
-                yield result_type(*columns)
+            yield from materialise(results, lambda columns: result_type(*columns))
+
+    def search_to_table(self, field_names, limit=None, output="pandas", batch_size=10000, **query):
+        field_names = list(field_names)
+
+        def batches():
+            # Stream rows from a server-side cursor straight into columns, without namedtuples
+            for _, results in self._do_search_by_product(query,
+                                                         return_fields=True,
+                                                         select_field_names=field_names,
+                                                         limit=limit,
+                                                         batch_size=batch_size):
+                yield from results.partitions(batch_size)
+
+        return rows_to_table(field_names, batches(), self._search_fields(query), output=output)
 
     def count(self, **query):
         """
@@ -685,7 +758,7 @@ class DatasetResource(AbstractDatasetResource, IndexResourceAddIn):
     # pylint: disable=too-many-locals
     def _do_search_by_product(self, query, return_fields=False, select_field_names=None,
                               with_source_ids=False, source_filter=None,
-                              limit=None):
+                              limit=None, batch_size=None, compact=False):
         assert not with_source_ids
         assert source_filter is None
         product_queries = list(self._get_product_queries(query))
@@ -706,7 +779,9 @@ class DatasetResource(AbstractDatasetResource, IndexResourceAddIn):
             dataset_fields = product.metadata_type.dataset_fields
             query_exprs = tuple(fields.to_expressions(dataset_fields.get, **q))
             select_fields = None
-            if return_fields:
+            if compact:
+                select_fields = self._compact_select_fields(product)
+            elif return_fields:
                 # if no fields specified, select all
                 if select_field_names is None:
                     select_fields = tuple(field for name, field in dataset_fields.items()
@@ -714,14 +789,16 @@ class DatasetResource(AbstractDatasetResource, IndexResourceAddIn):
                 else:
                     select_fields = tuple(dataset_fields[field_name]
                                           for field_name in select_field_names)
-            with self._db_connection() as connection:
+            # server-side cursors only live within a transaction
+            with self._db_connection(transaction=bool(batch_size)) as connection:
                 yield (product,
                        connection.search_datasets(
                            query_exprs,
                            select_fields=select_fields,
                            limit=limit,
                            with_source_ids=with_source_ids,
-                           geom=geom
+                           geom=geom,
+                           batch_size=batch_size or 0
                        ))
 
     def _do_count_by_product(self, query):
@@ -808,7 +885,8 @@ class DatasetResource(AbstractDatasetResource, IndexResourceAddIn):
                     [func.min(time_min.alchemy_expression), func.max(time_max.alchemy_expression)]
                 ).where(
                     SQLDataset.product_ref == product.id
-                )
+                ),
+                operation='get_product_time_bounds'
             ).first()
 
         return result
@@ -5,7 +5,7 @@
 import logging
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Iterable, Sequence
+from typing import Any, Callable, Iterable, Mapping, Optional, Sequence
 
 from datacube.drivers.postgis import PostGisDb, PostgisDbAPI
 from datacube.index.postgis._transaction import PostgisTransaction
@@ -126,6 +126,9 @@ WARNING: Database schema and internal APIs may change significantly between rele
     def index_id(self) -> str:
         return self.url
 
+    def pool_stats(self) -> Mapping[str, Any]:
+        return self._db.pool_stats()
+
     def transaction(self) -> AbstractTransaction:
         return PostgisTransaction(self._db, self.index_id)
 
@@ -139,10 +142,47 @@ WARNING: Database schema and internal APIs may change significantly between rele
     def update_spatial_index(self,
                              crses: Sequence[CRS] = [],
                              product_names: Sequence[str] = [],
-                             dataset_ids: Sequence[DSID] = []
+                             dataset_ids: Sequence[DSID] = [],
+                             batch_size: int = 1000,
+                             progress_cbk: Optional[Callable[[str, int], Any]] = None,
                              ) -> int:
-        with self._active_connection(transaction=True) as conn:
-            return conn.update_spindex(crses, product_names, dataset_ids)
+        if dataset_ids:
+            with self._active_connection(transaction=True) as conn:
+                return conn.update_spindex(crses, product_names, dataset_ids, batch_size=batch_size)
+
+        if not product_names:
+            product_names = sorted(product.name for product in self.products.get_all())
+        verified = 0
+        for product_name in product_names:
+            with self._active_connection(transaction=True) as conn:
+                n = conn.update_spindex(crses, [product_name], batch_size=batch_size)
+            _LOG.info("Updated %d spatial index entries for product %s", n, product_name)
+            if progress_cbk is not None:
+                progress_cbk(product_name, n)
+            verified += n
+        return verified
+
+    def update_search_index(self,
+                            product_names: Sequence[str] = [],
+                            dataset_ids: Sequence[DSID] = [],
+                            batch_size: int = 1000,
+                            progress_cbk: Optional[Callable[[str, int], Any]] = None,
+                            ) -> int:
+        if dataset_ids:
+            with self._active_connection(transaction=True) as conn:
+                return conn.update_search_index(product_names, dataset_ids, batch_size=batch_size)
+
+        if not product_names:
+            product_names = sorted(product.name for product in self.products.get_all())
+        updated = 0
+        for product_name in product_names:
+            with self._active_connection(transaction=True) as conn:
+                n = conn.update_search_index([product_name], batch_size=batch_size)
+            _LOG.info("Updated search fields of %d datasets for product %s", n, product_name)
+            if progress_cbk is not None:
+                progress_cbk(product_name, n)
+            updated += n
+        return updated
 
     def __repr__(self):
         return "Index<db={!r}>".format(self._db)
@@ -4,6 +4,7 @@
 # SPDX-License-Identifier: Apache-2.0
 import logging
 from contextlib import contextmanager
+from typing import Any, Mapping
 
 from datacube.drivers.postgres import PostgresDb, PostgresDbAPI
 from datacube.index.postgres._transaction import PostgresTransaction
@@ -107,6 +108,9 @@ class Index(AbstractIndex):
     def index_id(self) -> str:
         return f"legacy_{self.url}"
 
+    def pool_stats(self) -> Mapping[str, Any]:
+        return self._db.pool_stats()
+
     def transaction(self) -> AbstractTransaction:
         return PostgresTransaction(self._db, self.index_id)
 
@@ -8,13 +8,15 @@ Core classes used across modules.
 
 import logging
 import math
+import numpy
+import shapely
 from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 from uuid import UUID
 
 from affine import Affine
-from typing import Optional, List, Mapping, Any, Dict, Tuple, Iterator, Iterable, Union
+from typing import Optional, List, Mapping, Any, Callable, Dict, Tuple, Iterator, Iterable, Sequence, Union
 
 from urllib.parse import urlparse
 from datacube.utils import geometry, without_lineage_sources, parse_time, cached_property, uri_to_local_path, \
@@ -224,35 +226,26 @@ class Dataset:
         """
         return not self.is_archived
 
-    @property
+    @cached_property
     def _gs(self) -> Optional[Dict[str, Any]]:
         try:
             return self.metadata.grid_spatial
         except AttributeError:
             return None
 
-    @property
+    @cached_property
     def crs(self) -> Optional[geometry.CRS]:
         """ Return CRS if available
-        """
-        projection = self._gs
-
-        if not projection:
-            return None
 
-        crs = projection.get('spatial_reference', None)
-        if crs:
-            return geometry.CRS(str(crs))
-        return None
+        Datasets with the same ``spatial_reference`` share one CRS object.
+        """
+        return _grid_spatial_crs(self._gs)
 
     @cached_property
     def extent(self) -> Optional[geometry.Geometry]:
         """ :returns: valid extent of the dataset or None
         """
 
-        def xytuple(obj):
-            return obj['x'], obj['y']
-
         # If no projection or crs, they have no extent.
         projection = self._gs
         if not projection:
@@ -262,18 +255,10 @@ class Dataset:
             _LOG.debug("No CRS, assuming no extent (dataset %s)", self.id)
             return None
 
-        valid_data = projection.get('valid_data')
-        geo_ref_points = projection.get('geo_ref_points')
-        if valid_data:
-            return geometry.Geometry(valid_data, crs=crs)
-        elif geo_ref_points:
-            return geometry.polygon([xytuple(geo_ref_points[key]) for key in ('ll', 'ul', 'ur', 'lr', 'll')],
-                                    crs=crs)
-
-        return None
+        return _grid_spatial_extent(projection, crs)
 
     def __eq__(self, other) -> bool:
-        if isinstance(other, Dataset):
+        if isinstance(other, (Dataset, CompactDataset)):
             return self.id == other.id
         return False
 
@@ -299,6 +284,208 @@ class Dataset:
         return without_lineage_sources(self.metadata_doc, self.metadata_type)
 
 
+def _grid_spatial_crs(projection: Optional[Dict[str, Any]]) -> Optional[geometry.CRS]:
+    if not projection:
+        return None
+
+    crs = projection.get('spatial_reference', None)
+    if crs:
+        return geometry.intern_crs(str(crs))
+    return None
+
+
+def _grid_spatial_extent(projection: Dict[str, Any], crs: geometry.CRS) -> Optional[geometry.Geometry]:
+    def xytuple(obj):
+        return obj['x'], obj['y']
+
+    valid_data = projection.get('valid_data')
+    geo_ref_points = projection.get('geo_ref_points')
+    if valid_data:
+        return geometry.Geometry(valid_data, crs=crs)
+    elif geo_ref_points:
+        return geometry.polygon([xytuple(geo_ref_points[key]) for key in ('ll', 'ul', 'ur', 'lr', 'll')],
+                                crs=crs)
+
+    return None
+
+
+def _identity(x):
+    return x
+
+
+class CompactDataset:
+    """
+    A compact stand-in for a :class:`Dataset` in large search results.
+
+    Only the fields needed to filter, group and plan loads are kept: id, product, time, CRS,
+    extent, mid-longitude and uris. The full :class:`Dataset` is read back from the index on first
+    access to any other attribute (e.g. ``metadata_doc`` or ``measurements``) and kept from then on.
+    Use :func:`materialise_datasets` to read back many compact datasets at once.
+
+    A compact dataset pickles (and copies) as its full :class:`Dataset`, so that datasets passed to
+    dask workers do not need access to the index.
+
+    :param loader: callable returning the full :class:`Dataset` objects for a sequence of dataset ids,
+                   typically ``index.datasets.bulk_get``
+    """
+    __slots__ = ('id', 'product', 'time', 'crs', 'extent', 'mid_longitude', 'uris', 'archived_time',
+                 '_loader', '_dataset')
+
+    def __init__(self,
+                 id_: UUID,
+                 product: "Product",
+                 time: Optional[Range],
+                 crs: Optional[geometry.CRS],
+                 extent: Optional[geometry.Geometry],
+                 mid_longitude: Optional[float] = None,
+                 uris: Optional[List[str]] = None,
+                 archived_time: Optional[datetime] = None,
+                 loader: Optional[Callable[[Sequence[UUID]], Iterable[Dataset]]] = None):
+        self.id = id_
+        self.product = product
+        self.time = time
+        self.crs = crs
+        self.extent = extent
+        self.mid_longitude = mid_longitude
+        self.uris = uris
+        self.archived_time = archived_time
+        self._loader = loader
+        self._dataset: Optional[Dataset] = None
+
+    @classmethod
+    def from_dataset(cls,
+                     ds: Dataset,
+                     loader: Optional[Callable[[Sequence[UUID]], Iterable[Dataset]]] = None) -> 'CompactDataset':
+        """
+        Extract the compact fields of a dataset.
+
+        Without a ``loader`` the dataset itself is kept for attributes not held by the compact form.
+        """
+        mid_longitude = None
+        lon = getattr(ds.metadata, 'lon', None)
+        if lon is not None:
+            mid_longitude = (lon.begin + lon.end)*0.5
+        compact = cls(ds.id, ds.product, ds.time, ds.crs, ds.extent,
+                      mid_longitude=mid_longitude,
+                      uris=ds.uris,
+                      archived_time=ds.archived_time,
+                      loader=loader)
+        if loader is None:
+            compact._dataset = ds
+        return compact
+
+    @classmethod
+    def from_grid_spatial(cls,
+                          id_: UUID,
+                          product: "Product",
+                          time: Optional[Range],
+                          grid_spatial: Optional[Dict[str, Any]],
+                          mid_longitude: Optional[float] = None,
+                          uris: Optional[List[str]] = None,
+                          loader: Optional[Callable[[Sequence[UUID]], Iterable[Dataset]]] = None,
+                          ) -> 'CompactDataset':
+        """
+        Make a compact dataset from search fields and the grid spatial section of its metadata
+        document, as read by index drivers without the rest of the document.
+        """
+        crs = _grid_spatial_crs(grid_spatial)
+        extent = _grid_spatial_extent(grid_spatial, crs) if grid_spatial and crs else None
+        return cls(id_, product, time, crs, extent,
+                   mid_longitude=mid_longitude,
+                   uris=uris,
+                   loader=loader)
+
+    @property
+    def type(self) -> "Product":
+        # For compatibility
+        return self.product
+
+    @property
+    def center_time(self) -> Optional[datetime]:
+        """ mid-point of time range
+        """
+        time = self.time
+        if time is None:
+            return None
+        return time.begin + (time.end - time.begin) // 2
+
+    @property
+    def is_archived(self) -> bool:
+        return self.archived_time is not None
+
+    @property
+    def is_active(self) -> bool:
+        return not self.is_archived
+
+    @property
+    def is_materialised(self) -> bool:
+        """ Has the full dataset been read from the index?
+        """
+        return self._dataset is not None
+
+    def materialise(self) -> Dataset:
+        """
+        :returns: the full dataset, reading it from the index on first call
+        """
+        if self._dataset is None:
+            if self._loader is None:
+                raise ValueError("No index to read dataset {} from".format(self.id))
+            materialise_datasets([self])
+            if self._dataset is None:
+                raise ValueError("Dataset {} is no longer in the index".format(self.id))
+        return self._dataset
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes not held by the compact form
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.materialise(), name)
+
+    def __reduce__(self):
+        # Pickles as the full dataset, the loader is usually bound to an index connection
+        return (_identity, (self.materialise(),))
+
+    def __reduce_ex__(self, protocol):
+        return self.__reduce__()
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (Dataset, CompactDataset)):
+            return self.id == other.id
+        return False
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __str__(self):
+        str_loc = 'not available' if not self.uris else self.uris[0]
+        return "CompactDataset <id={id} product={type} location={loc}>".format(id=self.id,
+                                                                               type=self.product.name,
+                                                                               loc=str_loc)
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+def materialise_datasets(datasets: Iterable[Any], batch_size: int = 1000) -> None:
+    """
+    Read back the full datasets of compact datasets, ``batch_size`` at a time.
+
+    Datasets that are already materialised, and anything that is not a :class:`CompactDataset`,
+    are skipped. Compact datasets no longer in the index are left as they are.
+    """
+    pending: Dict[Any, Dict[UUID, List[CompactDataset]]] = {}
+    for ds in datasets:
+        if isinstance(ds, CompactDataset) and ds._dataset is None and ds._loader is not None:
+            pending.setdefault(ds._loader, {}).setdefault(ds.id, []).append(ds)
+
+    for loader, by_id in pending.items():
+        ids = list(by_id)
+        for i in range(0, len(ids), batch_size):
+            for full in loader(ids[i:i + batch_size]):
+                for ds in by_id.get(full.id, []):
+                    ds._dataset = full
+
+
 class Measurement(dict):
     """
     Describes a single data variable of a Product or Dataset.
@@ -880,6 +1067,72 @@ class GridSpec:
             if geometry.intersects(tile_geobox.extent, geopolygon):
                 yield (tile_index, tile_geobox)
 
+    def tiles_incidence(self, geopolygons: Sequence[geometry.Geometry],
+                        tile_buffer: Optional[Tuple[float, float]] = None) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        Tiles overlapping with each of many geometries.
+
+        Gives the same tiles as :meth:`tiles_from_geopolygon` would for every geometry, but
+        candidate tiles and their intersections are computed for all geometries at once.
+
+        :param geopolygons: Geometries to tile
+        :param tile_buffer: Optional <float,float> tuple, (extra padding for the query
+                            in native units of this GridSpec)
+        :return: ``(ipoly, tile_index)``: index into ``geopolygons`` and ``(x, y)`` tile index
+                 of every overlapping pair, ordered by geometry then as in :meth:`tiles`
+        """
+        geoms = numpy.empty(len(geopolygons), dtype=object)
+        geoms[:] = [geopolygon.to_crs(self.crs).geom for geopolygon in geopolygons]
+
+        # left, bottom, right, top
+        bounds = shapely.bounds(geoms).reshape(-1, 4)
+        valid = ~numpy.isnan(bounds).any(axis=1)
+        bounds[~valid] = 0
+        if tile_buffer:
+            by, bx = tile_buffer
+            bounds += [-bx, -by, bx, by]
+
+        tile_size_y, tile_size_x = self.tile_size
+        origin_y, origin_x = self.origin
+
+        def grid_range(lower, upper, step):
+            # vectorised GridSpec.grid_range, as (start, stop)
+            if step < 0.0:
+                lower, upper, step = -upper, -lower, -step
+            return numpy.floor(lower / step).astype(int), numpy.ceil(upper / step).astype(int)
+
+        y0, y1 = grid_range(bounds[:, 1] - origin_y, bounds[:, 3] - origin_y, tile_size_y)
+        x0, x1 = grid_range(bounds[:, 0] - origin_x, bounds[:, 2] - origin_x, tile_size_x)
+        nx = numpy.maximum(x1 - x0, 0)
+        counts = numpy.where(valid, numpy.maximum(y1 - y0, 0) * nx, 0)
+
+        # all candidate (geometry, tile) pairs, y then x within each geometry
+        ipoly = numpy.repeat(numpy.arange(len(geoms)), counts)
+        k = numpy.arange(counts.sum()) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+        yi = y0[ipoly] + k // nx[ipoly]
+        xi = x0[ipoly] + k % nx[ipoly]
+
+        # tile extents, computed as in tile_geobox(..).buffered(..).extent
+        res_y, res_x = self.resolution
+        h, w = self.tile_resolution
+        by_px = bx_px = 0
+        if tile_buffer:
+            buffered = self.tile_geobox((0, 0)).buffered(*tile_buffer)
+            by_px, bx_px = (buffered.height - h) // 2, (buffered.width - w) // 2
+
+        def tile_edges(index, res, size, origin, n, pad):
+            start = (index + (1 if res < 0 < size else 0)) * size + origin
+            start = res * -pad + start
+            end = res * (n + 2 * pad) + start
+            return numpy.minimum(start, end), numpy.maximum(start, end)
+
+        ty0, ty1 = tile_edges(yi, res_y, tile_size_y, origin_y, h, by_px)
+        tx0, tx1 = tile_edges(xi, res_x, tile_size_x, origin_x, w, bx_px)
+        boxes = shapely.box(tx0, ty0, tx1, ty1)
+
+        hits = shapely.intersects(boxes, geoms[ipoly]) & ~shapely.touches(boxes, geoms[ipoly])
+        return ipoly[hits], numpy.stack([xi[hits], yi[hits]], axis=-1)
+
     @staticmethod
     def grid_range(lower: float, upper: float, step: float) -> range:
         """
@@ -6,10 +6,12 @@
 
 This allows extraction of fields of interest from dataset metadata document.
 """
+from datetime import date, datetime, time
 from typing import Mapping, Dict, Any
 import toolz  # type: ignore[import]
 import decimal
 from datacube.utils import parse_time
+from datacube.utils.dates import tz_aware
 from ._base import Range
 
 # Allowed values for field 'type' (specified in a metadata type docuemnt)
@@ -53,6 +55,74 @@ class SimpleEqualsExpression(Expression):
         return self.field.extract(ctx) == self.value
 
 
+def _comparable(value):
+    # Naive datetimes in documents are UTC, as in the database drivers
+    if isinstance(value, datetime):
+        return tz_aware(value)
+    if isinstance(value, date):
+        return tz_aware(datetime.combine(value, time.min))
+    return value
+
+
+class ValueBetweenExpression(Expression):
+    """
+    A single-valued field lies within ``[low, high]``, either bound may be ``None`` for unbounded.
+    """
+    def __init__(self, field, low, high):
+        self.field = field
+        self.low = low
+        self.high = high
+
+    def evaluate(self, ctx):
+        v = self.field.extract(ctx)
+        if v is None:
+            return False
+        v = _comparable(v)
+        if self.low is not None and v < _comparable(self.low):
+            return False
+        if self.high is not None and v > _comparable(self.high):
+            return False
+        return True
+
+
+class RangeBetweenExpression(Expression):
+    """
+    A range field overlaps ``[low, high]``, either bound may be ``None`` for unbounded.
+    """
+    def __init__(self, field, low, high):
+        self.field = field
+        self.low = low
+        self.high = high
+
+    def evaluate(self, ctx):
+        r = self.field.extract(ctx)
+        if r is None:
+            return False
+        begin, end = _comparable(r.begin), _comparable(r.end)
+        if self.low is not None and end is not None and end < _comparable(self.low):
+            return False
+        if self.high is not None and begin is not None and begin > _comparable(self.high):
+            return False
+        return True
+
+
+class RangeContainsExpression(Expression):
+    """
+    A range field contains ``value``.
+    """
+    def __init__(self, field, value):
+        self.field = field
+        self.value = value
+
+    def evaluate(self, ctx):
+        r = self.field.extract(ctx)
+        if r is None:
+            return False
+        v = _comparable(self.value)
+        begin, end = _comparable(r.begin), _comparable(r.end)
+        return (begin is None or begin <= v) and (end is None or v <= end)
+
+
 class Field:
     """
     A searchable field within a dataset/storage metadata document.
@@ -103,6 +173,9 @@ class SimpleField(Field):
     def __eq__(self, value) -> Expression:  # type: ignore[override]
         return SimpleEqualsExpression(self, value)
 
+    def between(self, low, high) -> Expression:
+        return ValueBetweenExpression(self, low, high)
+
     def extract(self, doc):
         v = toolz.get_in(self._offset, doc, default=None)
         if v is None:
@@ -124,6 +197,12 @@ class RangeField(Field):
         self._max_offset = max_offset
         super().__init__(name, description)
 
+    def __eq__(self, value) -> Expression:  # type: ignore[override]
+        return RangeContainsExpression(self, value)
+
+    def between(self, low, high) -> Expression:
+        return RangeBetweenExpression(self, low, high)
+
     def extract(self, doc):
         def extract_raw(paths):
             vv = [toolz.get_in(p, doc, default=None) for p in paths]
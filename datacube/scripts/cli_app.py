@@ -14,6 +14,7 @@ import datacube.scripts.dataset   # noqa: F401
 import datacube.scripts.ingest    # noqa: F401
 import datacube.scripts.product   # noqa: F401
 import datacube.scripts.metadata  # noqa: F401
+import datacube.scripts.spindex   # noqa: F401
 import datacube.scripts.system    # noqa: F401
 import datacube.scripts.user      # noqa: F401
 
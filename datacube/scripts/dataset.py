@@ -7,6 +7,7 @@ import datetime
 import logging
 import sys
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from textwrap import dedent
 from typing import cast, Iterable, Mapping, MutableMapping, Any, List, Set
 from uuid import UUID
@@ -25,6 +26,7 @@ from datacube.ui import click as ui
 from datacube.ui.click import cli, print_help_msg
 from datacube.ui.common import ui_path_doc_stream
 from datacube.utils import changes, SimpleDocNav
+from datacube.utils.generic import ordered_executor_map
 from datacube.utils.serialise import SafeDatacubeDumper
 from datacube.utils.uris import uri_resolve
 
@@ -71,14 +73,27 @@ def dataset_cmd():
     pass
 
 
-def dataset_stream(doc_stream, ds_resolve):
+def dataset_stream(doc_stream, ds_resolve, workers=0):
     """ Convert a stream `(uri, doc)` pairs into a stream of resolved datasets
 
         skips failures with logging
+
+        With ``workers`` greater than zero documents are resolved concurrently
+        in a pool of threads, datasets are still generated in input order.
     """
-    for uri, ds in doc_stream:
-        dataset, err = ds_resolve(ds, uri)
+    def resolve(item):
+        uri, ds = item
+        return ds_resolve(ds, uri)
+
+    if workers > 0:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            yield from _skip_unresolved(ordered_executor_map(resolve, doc_stream, pool, 2 * workers))
+    else:
+        yield from _skip_unresolved(map(resolve, doc_stream))
+
 
+def _skip_unresolved(results):
+    for dataset, err in results:
         if dataset is None:
             _LOG.error('%s', str(err))
             continue
@@ -163,6 +178,13 @@ def load_datasets_for_update(doc_stream, index):
               help=('Find and archive less mature versions of the dataset, will fail if more mature versions '
                     'of the dataset already exist. Can also specify a millisecond delta amount to be taken '
                     'into acount when comparing timestamps. Default delta is 500ms.'))
+@click.option('--batch-size', type=click.IntRange(min=1), default=None,
+              help=('Add datasets to the database in batches of this size, '
+                    'default is to add datasets one at a time'))
+@click.option('--workers', type=click.IntRange(min=0), default=0,
+              help='Read, parse and match documents with this many concurrent workers, default is to not use workers')
+@click.option('--parse-processes', is_flag=True, default=False,
+              help='Read and parse documents in separate worker processes rather than threads')
 @click.argument('dataset-paths', type=str, nargs=-1)
 @ui.pass_index()
 def index_cmd(index, product_names,
@@ -173,6 +195,9 @@ def index_cmd(index, product_names,
               ignore_lineage,
               confirm_ignore_lineage,
               archive_less_mature,
+              batch_size,
+              workers,
+              parse_processes,
               dataset_paths):
 
     if not dataset_paths:
@@ -202,13 +227,15 @@ def index_cmd(index, product_names,
             sys.exit(1)
 
     def run_it(dataset_paths):
-        doc_stream = ui_path_doc_stream(dataset_paths, logger=_LOG, uri=True)
+        doc_stream = ui_path_doc_stream(dataset_paths, logger=_LOG, uri=True,
+                                        workers=workers, processes=parse_processes)
         doc_stream = remap_uri_from_doc(doc_stream)
-        dss = dataset_stream(doc_stream, ds_resolve)
+        dss = dataset_stream(doc_stream, ds_resolve, workers=workers)
         index_datasets(dss,
                        index,
                        auto_add_lineage=auto_add_lineage and not confirm_ignore_lineage,
-                       dry_run=dry_run, archive_less_mature=archive_less_mature)
+                       dry_run=dry_run, archive_less_mature=archive_less_mature,
+                       batch_size=batch_size)
 
     # If outputting directly to terminal, show a progress bar.
     if sys.stdout.isatty():
@@ -218,9 +245,20 @@ def index_cmd(index, product_names,
         run_it(dataset_paths)
 
 
-def index_datasets(dss, index, auto_add_lineage, dry_run, archive_less_mature):
-    for dataset in dss:
-        _LOG.info('Matched %s', dataset)
+def index_datasets(dss, index, auto_add_lineage, dry_run, archive_less_mature, batch_size=None):
+    def matched(dss):
+        for dataset in dss:
+            _LOG.info('Matched %s', dataset)
+            yield dataset
+
+    if batch_size and not dry_run:
+        index.datasets.bulk_add_datasets(matched(dss),
+                                         with_lineage=auto_add_lineage,
+                                         archive_less_mature=archive_less_mature,
+                                         batch_size=batch_size)
+        return
+
+    for dataset in matched(dss):
         if not dry_run:
             try:
                 index.datasets.add(dataset, with_lineage=auto_add_lineage,
@@ -6,7 +6,6 @@ import time
 import logging
 import click
 import cachetools
-import itertools
 import sys
 from copy import deepcopy
 from pathlib import Path
@@ -24,7 +23,8 @@ from datacube.ui import click as ui
 from datacube.utils import read_documents
 from datacube.utils.documents import InvalidDocException
 from datacube.utils.uris import normalise_path
-from datacube.ui.task_app import check_existing_files, load_tasks as load_tasks_, save_tasks as save_tasks_
+from datacube.ui.task_app import check_existing_files, load_tasks as load_tasks_, save_tasks as save_tasks_, \
+    run_tasks, wrap_task, submit_batch_size_option, retries_option, checkpoint_option
 from datacube.drivers import storage_writer_by_name
 
 from datacube.ui.click import cli
@@ -311,60 +311,37 @@ def _index_datasets(index, results):
     return n
 
 
-def process_tasks(index, config, source_type, output_type, tasks, queue_size, executor):
-    # pylint: disable=too-many-locals
-    def submit_task(task):
-        _LOG.info('Submitting task: %s', task['tile_index'])
-        return executor.submit(ingest_work,
-                               config=config,
-                               source_type=source_type,
-                               output_type=output_type,
-                               **task)
-
-    pending = []
+def _ingest_task(task, config, source_type, output_type):
+    return ingest_work(config, source_type, output_type, **task)
 
-    # Count of storage unit/s creation successful/failed
-    nc_successful = nc_failed = 0
 
+def process_tasks(index, config, source_type, output_type, tasks, queue_size, executor,
+                  batch_size=1, max_retries=0, checkpoint_file=None):
     # Count of storage unit/s indexed successfully or failed to index
     index_successful = index_failed = 0
 
-    tasks = iter(tasks)
-
-    while True:
-        pending += [submit_task(task) for task in itertools.islice(tasks, queue_size)]
-        if len(pending) == 0:
-            break
-
-        nc_completed, failed, pending = executor.get_ready(pending)
-        nc_successful += len(nc_completed)
-
-        for future in failed:
-            try:
-                executor.result(future)
-            except Exception as err:  # pylint: disable=broad-except
-                _LOG.exception('Failed to create storage unit file (Exception: %s) ', str(err), exc_info=True)
-                nc_failed += 1
-
-        _LOG.info('Storage unit file creation status (Created_Count: %s, Failed_Count: %s)',
-                  nc_successful,
-                  nc_failed)
-
-        if not nc_completed:
-            time.sleep(1)
-            continue
-
+    def index_result(datasets):
+        nonlocal index_successful, index_failed
         try:
-            # TODO: ideally we wouldn't block here indefinitely
-            # maybe limit gather to 50-100 results and put the rest into a index backlog
-            # this will also keep the queue full
-            results = executor.results(nc_completed)
-            index_successful += _index_datasets(index, results)
-        except Exception as err:  # pylint: disable=broad-except
-            _LOG.exception('Failed to index storage unit file (Exception: %s)', str(err), exc_info=True)
+            index_successful += _index_datasets(index, [datasets])
+        except Exception:
+            # not recorded as completed in the checkpoint file
             index_failed += 1
-
-        _LOG.info('Storage unit files indexed (Successful: %s, Failed: %s)', index_successful, index_failed)
+            raise
+
+    summary = run_tasks(tasks, executor,
+                        wrap_task(_ingest_task, config, source_type, output_type),
+                        process_result=index_result,
+                        queue_size=queue_size,
+                        batch_size=batch_size,
+                        max_retries=max_retries,
+                        checkpoint_file=checkpoint_file)
+
+    # tasks that failed to index were created
+    _LOG.info('Storage unit file creation status (Created_Count: %s, Failed_Count: %s)',
+              summary.successful + index_failed,
+              summary.failed - index_failed)
+    _LOG.info('Storage unit files indexed (Successful: %s, Failed: %s)', index_successful, index_failed)
 
     return index_successful, index_failed
 
@@ -405,6 +382,9 @@ def get_driver_from_config(config):
 @click.option('--dry-run', '-d', is_flag=True, default=False, help='Check if everything is ok')
 @click.option('--allow-product-changes', is_flag=True, default=False,
               help='Allow the output product definition to be updated if it differs.')
+@submit_batch_size_option
+@retries_option
+@checkpoint_option
 @ui.executor_cli_options
 @ui.pass_index(app_name='datacube-ingest')
 def ingest_cmd(index,
@@ -415,6 +395,9 @@ def ingest_cmd(index,
                load_tasks,
                dry_run,
                allow_product_changes,
+               batch_size,
+               max_retries,
+               checkpoint_file,
                executor):
     # pylint: disable=too-many-locals
 
@@ -449,7 +432,10 @@ def ingest_cmd(index,
     elif save_tasks:
         save_tasks_(config, tasks, save_tasks)
     else:
-        successful, failed = process_tasks(index, config, source_type, output_type, tasks, queue_size, executor)
+        successful, failed = process_tasks(index, config, source_type, output_type, tasks, queue_size, executor,
+                                           batch_size=batch_size,
+                                           max_retries=max_retries,
+                                           checkpoint_file=checkpoint_file)
         click.echo('%d successful, %d failed' % (successful, failed))
 
         sys.exit(failed)
@@ -0,0 +1,143 @@
+# This file is part of the Open Data Cube, see https://opendatacube.org for more information
+#
+# Copyright (c) 2015-2024 ODC Contributors
+# SPDX-License-Identifier: Apache-2.0
+import logging
+import sys
+
+import click
+from click import echo, style
+
+from datacube.index import Index
+from datacube.ui import click as ui
+from datacube.ui.click import cli
+from datacube.utils.geometry import CRS
+
+_LOG = logging.getLogger('datacube-spindex')
+
+
+@cli.group(name='spindex', help='Spatial and search index commands (postgis index driver only)')
+def spindex():
+    pass
+
+
+def _parse_crses(crs_strs):
+    try:
+        return [CRS(crs_str) for crs_str in crs_strs]
+    except Exception as e:
+        raise click.BadParameter(str(e), param_hint='CRS')
+
+
+@spindex.command('list', help='List CRSs that have a spatial index')
+@ui.pass_index()
+def list_spindexes(index: Index):
+    for crs in index.spatial_indexes(refresh=True):
+        echo(str(crs))
+
+
+@spindex.command('create', help='Create spatial indexes for the given CRSs')
+@click.argument('crs', nargs=-1, required=True)
+@ui.pass_index()
+def create_spindexes(index: Index, crs):
+    failed = False
+    for crs_ in _parse_crses(crs):
+        if index.create_spatial_index(crs_):
+            echo(f'Spatial index for {crs_} created')
+        else:
+            echo(style(f'Could not create spatial index for {crs_}', fg='red'))
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+def _products_to_update(index: Index, products, start_from):
+    if not products:
+        products = [product.name for product in index.products.get_all()]
+    products = sorted(set(products))
+    if start_from is not None:
+        products = [name for name in products if name >= start_from]
+    return products
+
+
+def _update_by_product(index: Index, update, products, start_from, label):
+    """
+    Call ``update(product_names=..., progress_cbk=...)`` with a progress bar, and exit with a hint
+    for resuming from the first product that was not reported as updated if it fails.
+
+    :return: Total count returned by ``update`` and a dictionary of count per updated product
+    """
+    if not list(index.spatial_indexes()):
+        echo(style('Spatial and search indexes are not supported by this index driver', fg='red'), err=True)
+        sys.exit(1)
+    products = _products_to_update(index, products, start_from)
+    if not products:
+        echo('No products to update')
+        sys.exit(0)
+
+    updated = {}
+    with click.progressbar(length=len(products), label=label,
+                           item_show_func=lambda name: name) as bar:
+        def progress_cbk(product_name, n):
+            updated[product_name] = n
+            bar.update(1, product_name)
+
+        try:
+            total = update(product_names=products, progress_cbk=progress_cbk)
+        except Exception:
+            failed = next(name for name in products if name not in updated)
+            _LOG.exception('%s failed', label)
+            echo(style(f'Failed to update product {failed}, resume with --start-from {failed}', fg='red'),
+                 err=True)
+            sys.exit(1)
+    return total, updated
+
+
+_product_option = click.option('--product', '-p', 'products', multiple=True,
+                               help='Only update datasets of this product, can be repeated. '
+                                    'Default is all products.')
+_start_from_option = click.option('--start-from', metavar='PRODUCT',
+                                  help='Skip products that sort before this one, to resume an interrupted update.')
+_batch_size_option = click.option('--batch-size', type=int, default=1000, show_default=True,
+                                  help='Number of datasets to process per database round trip.')
+
+
+@spindex.command('update', help='Update spatial indexes from the datasets in the index')
+@click.argument('crs', nargs=-1)
+@_product_option
+@_start_from_option
+@_batch_size_option
+@ui.pass_index()
+def update_spindexes(index: Index, crs, products, start_from, batch_size):
+    """
+    Products are updated in alphabetical order, each in its own transaction. If the update
+    is interrupted, products that were not reported as updated can be updated again with
+    ``--product`` or ``--start-from``.
+    """
+    crses = _parse_crses(crs)
+    total, updated = _update_by_product(
+        index,
+        lambda **kwargs: index.update_spatial_index(crses=crses, batch_size=batch_size, **kwargs),
+        products, start_from, 'Updating spatial indexes'
+    )
+    for name, n in updated.items():
+        echo(f'{name}: {n} entries')
+    echo(f'Updated {total} spatial index entries for {len(updated)} products')
+
+
+@spindex.command('update-search', help='Rebuild dataset search fields from metadata')
+@_product_option
+@_start_from_option
+@_batch_size_option
+@ui.pass_index()
+def update_search_indexes(index: Index, products, start_from, batch_size):
+    """
+    Products are updated in alphabetical order, each in its own transaction, and can be
+    resumed in the same way as ``datacube spindex update``.
+    """
+    total, updated = _update_by_product(
+        index,
+        lambda **kwargs: index.update_search_index(batch_size=batch_size, **kwargs),
+        products, start_from, 'Updating search fields'
+    )
+    for name, n in updated.items():
+        echo(f'{name}: {n} datasets')
+    echo(f'Updated search fields of {total} datasets for {len(updated)} products')
@@ -16,6 +16,7 @@ from ..drivers.datasource import (
 
 from ._base import BandInfo, measurement_paths
 from ._load import reproject_and_fuse
+from ._rio import share_open_files
 
 __all__ = (
     'BandInfo',
@@ -25,4 +26,5 @@ __all__ = (
     'RasterWindow',
     'measurement_paths',
     'reproject_and_fuse',
+    'share_open_files',
 )
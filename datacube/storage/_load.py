@@ -9,13 +9,14 @@ Important functions are:
 
 """
 import logging
-from collections import OrderedDict
+from collections import OrderedDict, deque
+from itertools import islice
 import numpy as np
 from xarray.core.dataarray import DataArray as XrDataArray, DataArrayCoordinates
 from xarray.core.dataset import Dataset as XrDataset
 from typing import (
     Union, Optional, Callable,
-    List, Any, Iterator, Iterable, Mapping, Tuple, Hashable, cast
+    List, Any, Iterator, Iterable, Mapping, Tuple, Hashable, Deque, cast
 )
 
 from datacube.utils import ignore_exceptions_if
@@ -49,20 +50,29 @@ def reproject_and_fuse(datasources: List[DataSource],
                        fuse_func: Optional[FuserFunction] = None,
                        skip_broken_datasets: bool = False,
                        progress_cbk: Optional[ProgressFunction] = None,
-                       extra_dim_index: Optional[int] = None):
+                       extra_dim_index: Optional[Union[int, slice]] = None,
+                       overview_mode: str = 'auto',
+                       read_scale_cbk: Optional[Callable[[int], Any]] = None):
     """
     Reproject and fuse `sources` into a 2D numpy array `destination`.
 
+    When ``extra_dim_index`` is a ``slice`` a contiguous range of the extra dimension
+    is read at once into a 3D ``destination``, with the extra dimension leading.
+
     :param datasources: Data sources to open and read from
     :param destination: ndarray of appropriate size to read data into
     :param dst_gbox: GeoBox defining destination region
     :param skip_broken_datasets: Carry on in the face of adversity and failing reads.
     :param progress_cbk: If supplied will be called with 2 integers `Items processed, Total Items`
                          after reading each file.
+    :param overview_mode: How to pick overview level when shrinking: ``auto|nearest-finer|nearest|off``,
+                          see :func:`datacube.storage._read.pick_read_scale`
+    :param read_scale_cbk: If supplied will be called with the shrink factor each source is read at,
+                           1 is full resolution
     """
     # pylint: disable=too-many-locals
     from ._read import read_time_slice
-    assert len(destination.shape) == 2
+    assert len(destination.shape) == (3 if isinstance(extra_dim_index, slice) else 2)
 
     def copyto_fuser(dest: np.ndarray, src: np.ndarray) -> None:
         _default_fuser(dest, src, dst_nodata)
@@ -75,7 +85,8 @@ def reproject_and_fuse(datasources: List[DataSource],
     elif len(datasources) == 1:
         with ignore_exceptions_if(skip_broken_datasets):
             with datasources[0].open() as rdr:
-                read_time_slice(rdr, destination, dst_gbox, resampling, dst_nodata, extra_dim_index)
+                read_time_slice(rdr, destination, dst_gbox, resampling, dst_nodata, extra_dim_index,
+                                overview_mode=overview_mode, read_scale_cbk=read_scale_cbk)
 
         if progress_cbk:
             progress_cbk(1, 1)
@@ -87,9 +98,11 @@ def reproject_and_fuse(datasources: List[DataSource],
         for n_so_far, source in enumerate(datasources, 1):
             with ignore_exceptions_if(skip_broken_datasets):
                 with source.open() as rdr:
-                    roi = read_time_slice(rdr, buffer_, dst_gbox, resampling, dst_nodata, extra_dim_index)
+                    roi = read_time_slice(rdr, buffer_, dst_gbox, resampling, dst_nodata, extra_dim_index,
+                                          overview_mode=overview_mode, read_scale_cbk=read_scale_cbk)
 
                 if not roi_is_empty(roi):
+                    roi = (Ellipsis,) + tuple(roi)
                     fuse_func(destination[roi], buffer_[roi])
                     buffer_[roi] = dst_nodata  # clean up for next read
 
@@ -121,14 +134,34 @@ def _allocate_storage(coords: DataArrayCoordinates,
     return xx
 
 
+class _PendingBand:
+    """ Band that was submitted for opening and possibly reading.
+    """
+    __slots__ = ('m', 'dst', 'rdr', 'pix')
+
+    def __init__(self, m: Measurement, dst: np.ndarray, rdr: Any):
+        self.m = m
+        self.dst = dst
+        self.rdr = rdr
+        self.pix: Optional[Tuple[Any, Callable[[np.ndarray], np.ndarray], Tuple[slice, slice]]] = None
+
+
 def xr_load(sources: XrDataArray,
             geobox: GeoBox,
             measurements: List[Measurement],
             driver: ReaderDriver,
             driver_ctx_prev: Optional[Any] = None,
-            skip_broken_datasets: bool = False) -> Tuple[XrDataset, Any]:
+            skip_broken_datasets: bool = False,
+            max_in_flight: int = 8) -> Tuple[XrDataset, Any]:
+    """
+    Load ``sources`` with a future based ``driver``.
+
+    Opens and reads are issued ahead for up to ``max_in_flight`` bands so that
+    IO latency overlaps, pixels are then fused into the output strictly in the
+    order they appear in ``sources``, so non-commutative fusers are respected.
+    """
     # pylint: disable=too-many-locals
-    from ._read import read_time_slice_v2
+    from ._read import submit_time_slice_v2
 
     out = _allocate_storage(sources.coords, geobox, measurements)
 
@@ -145,22 +178,47 @@ def xr_load(sources: XrDataArray,
     groups = list(all_groups())
     ctx = driver.new_load_context(just_bands(groups), driver_ctx_prev)
 
-    # TODO: run upto N concurrently
-    for m, idx, bbi in groups:
-        dst = out.data_vars[m.name].values[idx]
-        dst[:] = m.nodata
-        resampling = m.get('resampling_method', 'nearest')
-        fuse_func = m.get('fuser', None)
-
-        for band in bbi:
-            rdr = driver.open(band, ctx).result()
-
-            pix, roi = read_time_slice_v2(rdr, geobox, resampling, m.nodata)
-
-            if pix is not None:
-                if fuse_func:
-                    fuse_func(dst[roi], pix)
-                else:
-                    _default_fuser(dst[roi], pix, m.nodata)
+    def all_reads() -> Iterator[Tuple[Measurement, np.ndarray, BandInfo]]:
+        for m, idx, bbi in groups:
+            dst = out.data_vars[m.name].values[idx]
+            dst[:] = m.nodata
+            for band in bbi:
+                yield (m, dst, band)
+
+    def start_read(item: _PendingBand) -> None:
+        m = item.m
+        rdr = item.rdr.result()
+        item.pix = submit_time_slice_v2(rdr, geobox, m.get('resampling_method', 'nearest'), m.nodata,
+                                        overview_mode=m.get('overview_mode', 'auto'))
+
+    reads = all_reads()
+    in_flight: Deque[_PendingBand] = deque()
+
+    def refill() -> None:
+        for m, dst, band in islice(reads, max(1, max_in_flight) - len(in_flight)):
+            in_flight.append(_PendingBand(m, dst, driver.open(band, ctx)))
+
+    refill()
+    while in_flight:
+        # issue reads for every band that has finished opening, without blocking
+        for item in in_flight:
+            if item.pix is None and item.rdr.done():
+                start_read(item)
+
+        item = in_flight.popleft()
+        if item.pix is None:
+            start_read(item)
+        refill()
+
+        fut, finish, roi = item.pix
+        if fut is None:
+            continue
+
+        pix = finish(fut.result())
+        fuse_func = item.m.get('fuser', None)
+        if fuse_func:
+            fuse_func(item.dst[roi], pix)
+        else:
+            _default_fuser(item.dst[roi], pix, item.m.nodata)
 
     return out, ctx
@@ -4,9 +4,10 @@
 # SPDX-License-Identifier: Apache-2.0
 """ Dataset -> Raster
 """
+import logging
 from affine import Affine
 import numpy as np
-from typing import Optional, Tuple
+from typing import Any, Callable, Optional, Sequence, Tuple, Union
 
 from ..utils.math import is_almost_int, valid_mask
 
@@ -23,6 +24,9 @@ from ..utils.geometry import (
 
 from ..utils.geometry._warp import is_resampling_nn, Resampling, Nodata
 from ..utils.geometry import gbox as gbx
+from ..drivers._types import FutureNdarray
+
+_LOG = logging.getLogger(__name__)
 
 
 def rdr_geobox(rdr) -> GeoBox:
@@ -85,8 +89,51 @@ def can_paste(rr, stol=1e-3, ttol=1e-2):
     return True, None
 
 
-def pick_read_scale(scale: float, rdr=None, tol=1e-3):
+OVERVIEW_MODES = ('auto', 'nearest-finer', 'nearest', 'off')
+
+
+def pick_overview(scale: float, overviews: Sequence[int], mode: str = 'nearest-finer',
+                  tol: float = 1e-3) -> Optional[int]:
+    """ Pick overview decimation factor to read from when shrinking source by ``scale``
+
+    :param scale: Desired shrink factor, source pixel size over destination pixel size
+    :param overviews: Available decimation factors, as reported by the reader
+    :param mode: ``nearest-finer`` picks the coarsest overview that is still at least
+                 as fine as requested, ``nearest`` picks the overview closest to
+                 requested resolution, even if it is coarser
+    :returns: Decimation factor of the chosen overview or ``None`` if full resolution
+              image is a better match
+    """
+    if mode not in ('nearest-finer', 'nearest'):
+        raise ValueError(f"Unsupported overview mode: {mode}")
+
+    candidates = sorted(set(int(f) for f in overviews if f > 1))
+    if not candidates or scale < 1:
+        return None
+
+    if mode == 'nearest-finer':
+        finer = [f for f in candidates if f <= scale*(1 + tol)]
+        return finer[-1] if finer else None
+
+    best = min([1] + candidates, key=lambda f: abs(np.log(f/scale)))
+    return None if best == 1 else best
+
+
+def pick_read_scale(scale: float, rdr=None, tol=1e-3, overview_mode: str = 'auto'):
+    """ Pick integer shrink factor to use when reading from ``rdr``
+
+    :param overview_mode: One of
+
+       - ``auto`` use largest integer shrink factor not exceeding ``scale``, GDAL
+         then decides which overview (if any) to use
+       - ``nearest-finer``/``nearest`` when ``rdr`` has overviews, read exactly at
+         the chosen overview level (see :func:`pick_overview`)
+       - ``off`` always read full resolution pixels
+    """
     assert scale > 0
+    if overview_mode not in OVERVIEW_MODES:
+        raise ValueError(f"Unsupported overview mode: {overview_mode}, expect one of {OVERVIEW_MODES}")
+
     # First find nearest integer scale
     #    Scale down to nearest integer, unless we can scale up by less than tol
     #
@@ -94,19 +141,35 @@ def pick_read_scale(scale: float, rdr=None, tol=1e-3):
     # 2.8 -> 2
     # 0.3 -> 1
 
-    if scale < 1:
+    if scale < 1 or overview_mode == 'off':
         return 1
 
+    if rdr is not None and overview_mode != 'auto':
+        overviews = getattr(rdr, 'overviews', ())
+        if overviews:
+            return pick_overview(scale, overviews, overview_mode, tol=tol) or 1
+
     if is_almost_int(scale, tol):
         scale = np.round(scale)
 
-    scale = int(scale)
+    return int(scale)
+
 
-    if rdr is not None:
-        # TODO: check available overviews in rdr
-        pass
+def _log_read_scale(rdr, scale: int) -> None:
+    """ Report which overview level is being read.
+    """
+    if not _LOG.isEnabledFor(logging.DEBUG):
+        return
+
+    overviews = tuple(getattr(rdr, 'overviews', ()))
+    if scale in overviews:
+        level = 'overview level {}'.format(overviews.index(scale))
+    elif scale == 1:
+        level = 'full resolution'
+    else:
+        level = 'overview level chosen by GDAL'
 
-    return scale
+    _LOG.debug("Reading %s with shrink factor %d: %s", rdr, scale, level)
 
 
 def read_time_slice(rdr,
@@ -114,12 +177,24 @@ def read_time_slice(rdr,
                     dst_gbox: GeoBox,
                     resampling: Resampling,
                     dst_nodata: Nodata,
-                    extra_dim_index: Optional[int] = None) -> Tuple[slice, slice]:
+                    extra_dim_index: Optional[Union[int, slice]] = None,
+                    overview_mode: str = 'auto',
+                    read_scale_cbk: Optional[Callable[[int], Any]] = None) -> Tuple[slice, slice]:
     """ From opened reader object read into `dst`
 
+    :param extra_dim_index: Index into extra dimension to read, or a ``slice`` to read a
+                            contiguous range of the extra dimension at once, in which
+                            case ``dst`` has an extra leading axis for the range
+    :param overview_mode: How to pick overview level when shrinking, see :func:`pick_read_scale`
+    :param read_scale_cbk: If supplied will be called with the shrink factor ``rdr`` is read at,
+                           1 is full resolution
     :returns: affected destination region
     """
-    assert dst.shape == dst_gbox.shape
+    is_nd = isinstance(extra_dim_index, slice)
+    if is_nd:
+        assert dst.ndim == 3 and dst.shape[1:] == dst_gbox.shape
+    else:
+        assert dst.shape == dst_gbox.shape
     src_gbox = rdr_geobox(rdr)
 
     rr = compute_reproject_roi(src_gbox, dst_gbox)
@@ -128,7 +203,9 @@ def read_time_slice(rdr,
         return rr.roi_dst
 
     is_nn = is_resampling_nn(resampling)
-    scale = pick_read_scale(rr.scale, rdr)
+    scale = pick_read_scale(rr.scale, rdr, overview_mode=overview_mode)
+    if read_scale_cbk is not None:
+        read_scale_cbk(scale)
 
     paste_ok, _ = can_paste(rr, ttol=0.9 if is_nn else 0.01)
 
@@ -141,8 +218,7 @@ def read_time_slice(rdr,
 
         w = w_[roi]
 
-        # Build 3D read window
-        # Note: Might be a good idea to natively support nD read windows.
+        # Build nD read window, leading index is either a single index or a slice
         if extra_dim_index is not None:
             if w is None:
                 w = ()
@@ -151,17 +227,25 @@ def read_time_slice(rdr,
             # 2D read window
             return w, shape
 
+    def read(roi, shape):
+        if is_nd and not getattr(rdr, 'supports_nd_read', False):
+            # emulate nD read one layer at a time
+            idx = extra_dim_index
+            return np.stack([rdr.read(*norm_read_args(roi, shape, i))
+                             for i in range(idx.start or 0, idx.stop, idx.step or 1)])
+        return rdr.read(*norm_read_args(roi, shape, extra_dim_index))
+
     if paste_ok:
         A = rr.transform.linear
         sx, sy = A.a, A.e
 
-        dst = dst[rr.roi_dst]
-        pix = rdr.read(*norm_read_args(rr.roi_src, dst.shape, extra_dim_index))
+        dst = dst[(Ellipsis,) + tuple(rr.roi_dst)]
+        pix = read(rr.roi_src, dst.shape[-2:])
 
         if sx < 0:
-            pix = pix[:, ::-1]
+            pix = pix[..., ::-1]
         if sy < 0:
-            pix = pix[::-1, :]
+            pix = pix[..., ::-1, :]
 
         if rdr.nodata is None:
             np.copyto(dst, pix)
@@ -174,13 +258,14 @@ def read_time_slice(rdr,
             rr.roi_dst = roi_pad(rr.roi_dst, 1, dst_gbox.shape)
             rr.roi_src = roi_pad(rr.roi_src, 1, src_gbox.shape)
 
-        dst = dst[rr.roi_dst]
+        dst = dst[(Ellipsis,) + tuple(rr.roi_dst)]
         dst_gbox = dst_gbox[rr.roi_dst]
         src_gbox = src_gbox[rr.roi_src]
         if scale > 1:
             src_gbox = gbx.zoom_out(src_gbox, scale)
+        _log_read_scale(rdr, scale)
 
-        pix = rdr.read(*norm_read_args(rr.roi_src, src_gbox.shape, extra_dim_index))
+        pix = read(rr.roi_src, src_gbox.shape)
 
         # XSCALE and YSCALE are (currently) undocumented arguments that rasterio passed through to
         # GDAL.  Not using them results in very inaccurate warping in images with highly
@@ -212,14 +297,20 @@ def read_time_slice(rdr,
     return rr.roi_dst
 
 
-def read_time_slice_v2(rdr,
-                       dst_gbox: GeoBox,
-                       resampling: Resampling,
-                       dst_nodata: Nodata) -> Tuple[Optional[np.ndarray],
-                                                    Tuple[slice, slice]]:
-    """ From opened reader object read into `dst`
+def submit_time_slice_v2(rdr,
+                         dst_gbox: GeoBox,
+                         resampling: Resampling,
+                         dst_nodata: Nodata,
+                         overview_mode: str = 'auto') -> Tuple[Optional[FutureNdarray],
+                                                               Callable[[np.ndarray], np.ndarray],
+                                                               Tuple[slice, slice]]:
+    """ Start reading from opened reader object without waiting for pixels
 
-    :returns: pixels read and ROI of dst_gbox that was affected
+    :param overview_mode: How to pick overview level when shrinking, see :func:`pick_read_scale`
+
+    :returns: future pixels (``None`` if nothing to read), function that turns
+              raw pixels into pixels on ``dst_gbox`` and ROI of ``dst_gbox``
+              that will be affected
     """
     # pylint: disable=too-many-locals
     src_gbox = rdr_geobox(rdr)
@@ -227,10 +318,10 @@ def read_time_slice_v2(rdr,
     rr = compute_reproject_roi(src_gbox, dst_gbox)
 
     if roi_is_empty(rr.roi_dst):
-        return None, rr.roi_dst
+        return None, lambda pix: pix, rr.roi_dst
 
     is_nn = is_resampling_nn(resampling)
-    scale = pick_read_scale(rr.scale, rdr)
+    scale = pick_read_scale(rr.scale, rdr, overview_mode=overview_mode)
 
     paste_ok, _ = can_paste(rr, ttol=0.9 if is_nn else 0.01)
 
@@ -248,32 +339,34 @@ def read_time_slice_v2(rdr,
         A = rr.transform.linear
         sx, sy = A.a, A.e
 
-        pix = rdr.read(*norm_read_args(rr.roi_src, read_shape)).result()
+        def finish_paste(pix: np.ndarray) -> np.ndarray:
+            if sx < 0:
+                pix = pix[:, ::-1]
+            if sy < 0:
+                pix = pix[::-1, :]
 
-        if sx < 0:
-            pix = pix[:, ::-1]
-        if sy < 0:
-            pix = pix[::-1, :]
+            # normalise nodata to be equal to `dst_nodata`
+            if rdr.nodata is not None and rdr.nodata != dst_nodata:
+                pix[pix == rdr.nodata] = dst_nodata
 
-        # normalise nodata to be equal to `dst_nodata`
-        if rdr.nodata is not None and rdr.nodata != dst_nodata:
-            pix[pix == rdr.nodata] = dst_nodata
+            return pix
 
-        dst = pix
-    else:
-        if rr.is_st:
-            # add padding on src/dst ROIs, it was set to tight bounds
-            # TODO: this should probably happen inside compute_reproject_roi
-            rr.roi_dst = roi_pad(rr.roi_dst, 1, dst_gbox.shape)
-            rr.roi_src = roi_pad(rr.roi_src, 1, src_gbox.shape)
+        return rdr.read(*norm_read_args(rr.roi_src, read_shape)), finish_paste, rr.roi_dst
 
-        dst_gbox = dst_gbox[rr.roi_dst]
-        src_gbox = src_gbox[rr.roi_src]
-        if scale > 1:
-            src_gbox = gbx.zoom_out(src_gbox, scale)
+    if rr.is_st:
+        # add padding on src/dst ROIs, it was set to tight bounds
+        # TODO: this should probably happen inside compute_reproject_roi
+        rr.roi_dst = roi_pad(rr.roi_dst, 1, dst_gbox.shape)
+        rr.roi_src = roi_pad(rr.roi_src, 1, src_gbox.shape)
+
+    dst_gbox = dst_gbox[rr.roi_dst]
+    src_gbox = src_gbox[rr.roi_src]
+    if scale > 1:
+        src_gbox = gbx.zoom_out(src_gbox, scale)
+    _log_read_scale(rdr, scale)
 
+    def finish_warp(pix: np.ndarray) -> np.ndarray:
         dst = np.full(dst_gbox.shape, dst_nodata, dtype=rdr.dtype)
-        pix = rdr.read(*norm_read_args(rr.roi_src, src_gbox.shape)).result()
 
         if rr.transform.linear is not None:
             A = (~src_gbox.transform)*dst_gbox.transform
@@ -282,5 +375,24 @@ def read_time_slice_v2(rdr,
         else:
             rio_reproject(pix, dst, src_gbox, dst_gbox, resampling,
                           src_nodata=rdr.nodata, dst_nodata=dst_nodata)
+        return dst
+
+    return rdr.read(*norm_read_args(rr.roi_src, src_gbox.shape)), finish_warp, rr.roi_dst
+
+
+def read_time_slice_v2(rdr,
+                       dst_gbox: GeoBox,
+                       resampling: Resampling,
+                       dst_nodata: Nodata,
+                       overview_mode: str = 'auto') -> Tuple[Optional[np.ndarray],
+                                                             Tuple[slice, slice]]:
+    """ From opened reader object read into `dst`
+
+    :returns: pixels read and ROI of dst_gbox that was affected
+    """
+    fut, finish, roi = submit_time_slice_v2(rdr, dst_gbox, resampling, dst_nodata,
+                                            overview_mode=overview_mode)
+    if fut is None:
+        return None, roi
 
-    return dst, rr.roi_dst
+    return finish(fut.result()), roi
@@ -8,18 +8,19 @@ Driver implementation for Rasterio based reader.
 import logging
 import contextlib
 from contextlib import contextmanager
+import threading
 from threading import RLock
 import numpy as np
 from affine import Affine
 import rasterio  # type: ignore[import]
 from urllib.parse import urlparse
-from typing import Optional, Iterator
+from typing import Optional, Iterator, List, Tuple, Union
 
 from datacube.utils import geometry
 from datacube.utils.math import num2numpy
 from datacube.utils import uri_to_local_path, get_part_from_uri, is_vsipath
 from datacube.utils.rio import activate_from_config
-from ..drivers.datasource import DataSource, GeoRasterReader, RasterShape, RasterWindow
+from ..drivers.datasource import DataSource, GeoRasterReader, RasterShape, NdRasterWindow
 from ._base import BandInfo
 from ._hdf5 import HDF5_LOCK
 
@@ -33,6 +34,43 @@ def _rasterio_crs(src):
     return geometry.CRS(src.crs)
 
 
+_SHARED = threading.local()
+
+
+@contextmanager
+def share_open_files() -> Iterator[None]:
+    """
+    Within this context files opened by :class:`RasterioDataSource` in the current
+    thread are kept open and re-used by other sources reading from the same file,
+    they are closed on exit from the outermost context.
+    """
+    if getattr(_SHARED, 'files', None) is not None:
+        yield
+        return
+
+    with contextlib.ExitStack() as stack:
+        _SHARED.files = {}
+        _SHARED.stack = stack
+        try:
+            yield
+        finally:
+            _SHARED.files = None
+            _SHARED.stack = None
+
+
+def _rio_open(filename: str, shareable: bool = True):
+    files = getattr(_SHARED, 'files', None) if shareable else None
+    if files is None:
+        return rasterio.open(filename, sharing=False)
+
+    src = files.get(filename, None)
+    if src is None:
+        _LOG.debug("opening shared %s", filename)
+        src = _SHARED.stack.enter_context(rasterio.open(filename, sharing=False))
+        files[filename] = src
+    return contextlib.nullcontext(src)
+
+
 def maybe_lock(lock):
     if lock is None:
         return contextlib.suppress()
@@ -75,12 +113,39 @@ class BandDataSource(GeoRasterReader):
     def shape(self) -> RasterShape:
         return self.source.shape
 
-    def read(self, window: Optional[RasterWindow] = None,
+    @property
+    def overviews(self) -> Tuple[int, ...]:
+        with maybe_lock(self._lock):
+            return tuple(self.source.ds.overviews(self.source.bidx))
+
+    @property
+    def block_shape(self) -> Optional[RasterShape]:
+        by, bx = self.source.ds.block_shapes[self.source.bidx-1]
+        return (by, bx)
+
+    @property
+    def supports_nd_read(self) -> bool:
+        return True
+
+    def read(self, window: Optional[NdRasterWindow] = None,
              out_shape: Optional[RasterShape] = None) -> Optional[np.ndarray]:
         """Read data in the native format, returning a numpy array
+
+        Leading index of a 3D window selects bands relative to the band of this
+        source, a ``slice`` reads a range of bands in one go as a 3D array.
         """
+        indexes: Union[int, List[int]] = self.source.bidx
+        if window is not None and len(window) != 2:
+            lead, *rest = window
+            window = tuple(rest) or None
+            if isinstance(lead, slice):
+                indexes = [self.source.bidx + i
+                           for i in range(lead.start or 0, lead.stop, lead.step or 1)]
+            else:
+                indexes = self.source.bidx + lead
+
         with maybe_lock(self._lock):
-            return self.source.ds.read(indexes=self.source.bidx, window=window, out_shape=out_shape)
+            return self.source.ds.read(indexes=indexes, window=window, out_shape=out_shape)
 
 
 class RasterioDataSource(DataSource):
@@ -114,7 +179,8 @@ class RasterioDataSource(DataSource):
 
         try:
             _LOG.debug("opening %s", self.filename)
-            with rasterio.open(str(self.filename), sharing=False) as src:
+            # files protected by a lock (hdf5) are never kept open past this context
+            with _rio_open(str(self.filename), shareable=lock is None) as src:
                 override = False
 
                 transform = src.transform
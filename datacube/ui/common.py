@@ -5,12 +5,15 @@
 """
 Common methods for UI code.
 """
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from typing import Union, Optional
 
 from toolz.functoolz import identity  # type: ignore[import]
 
 from datacube.utils import read_documents, InvalidDocException, SimpleDocNav, is_supported_document_type, is_url
+from datacube.utils.generic import ordered_executor_map
 
 
 def get_metadata_path(possible_path: Union[str, Path]) -> str:
@@ -68,7 +71,18 @@ def _find_any_metadata_suffix(path: Path) -> Optional[Path]:
     return existing_paths[0]
 
 
-def ui_path_doc_stream(paths, logger=None, uri=True, raw=False):
+def _read_all_documents(fname, uri=True):
+    """ Read every document in ``fname``, returns ``(fname, [(path, doc), ...], error)``.
+
+    Module level so that it can be shipped to a process pool.
+    """
+    try:
+        return fname, list(read_documents(fname, uri=uri)), None
+    except InvalidDocException as e:
+        return fname, None, e
+
+
+def ui_path_doc_stream(paths, logger=None, uri=True, raw=False, workers=0, processes=False):
     """Given a stream of URLs, or Paths that could be directories, generate a stream of
     (path, doc) tuples.
 
@@ -87,6 +101,12 @@ def ui_path_doc_stream(paths, logger=None, uri=True, raw=False):
     :param raw: By default docs are wrapped in :class:`SimpleDocNav`, but you can
     instead request them to be raw dictionaries
 
+    :param workers: When greater than zero, read and parse this many files concurrently,
+    documents are still generated in the order of ``paths``
+
+    :param processes: Use a pool of processes rather than threads for ``workers``, useful
+    when parsing rather than fetching documents is the bottleneck
+
     """
 
     def _resolve_doc_files(paths):
@@ -109,4 +129,26 @@ def ui_path_doc_stream(paths, logger=None, uri=True, raw=False):
                 if logger is not None:
                     logger.error('Failed reading documents from %s', str(fname))
 
-    yield from _path_doc_stream(_resolve_doc_files(paths), uri=uri, raw=raw)
+    def _parallel_path_doc_stream(files, uri=True, raw=False):
+        maybe_wrap = identity if raw else SimpleDocNav
+        pool_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+
+        pool = pool_class(max_workers=workers)
+        try:
+            read_file = partial(_read_all_documents, uri=uri)
+            for fname, docs, _ in ordered_executor_map(read_file, files, pool, 2 * workers):
+                if docs is None:
+                    if logger is not None:
+                        logger.error('Failed reading documents from %s', str(fname))
+                    continue
+
+                for p, doc in docs:
+                    yield p, maybe_wrap(doc)
+        finally:
+            # Don't wait for reads the consumer is no longer interested in
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    if workers > 0:
+        yield from _parallel_path_doc_stream(_resolve_doc_files(paths), uri=uri, raw=raw)
+    else:
+        yield from _path_doc_stream(_resolve_doc_files(paths), uri=uri, raw=raw)
@@ -9,6 +9,7 @@ import click
 import functools
 import itertools
 import re
+from collections import namedtuple
 from pathlib import Path
 import pandas as pd
 import pickle
@@ -88,6 +89,27 @@ save_tasks_option = click.option('--save-tasks', 'output_tasks_file', help='Save
 queue_size_option = click.option('--queue-size', help='Number of tasks to queue at the start',
                                  type=click.IntRange(1, 100000), default=3200)
 
+#: pylint: disable=invalid-name
+submit_batch_size_option = click.option('--submit-batch-size', 'batch_size',
+                                        help='Number of tasks to submit to the executor at once',
+                                        type=click.IntRange(1, 100000), default=1)
+#: pylint: disable=invalid-name
+retries_option = click.option('--retries', 'max_retries', help='Number of times to retry a failed task',
+                              type=click.IntRange(0, 100), default=0)
+#: pylint: disable=invalid-name
+checkpoint_option = click.option('--checkpoint', 'checkpoint_file',
+                                 help='Record completed tasks in this file, and skip tasks already recorded in it',
+                                 type=click.Path(dir_okay=False))
+
+#: Options for the keyword arguments of :func:`run_tasks`
+#: pylint: disable=invalid-name
+run_tasks_options = dc_ui.compose(
+    queue_size_option,
+    submit_batch_size_option,
+    retries_option,
+    checkpoint_option,
+)
+
 #: pylint: disable=invalid-name
 task_app_options = dc_ui.compose(
     app_config_option,
@@ -262,47 +284,187 @@ def wrap_task(f, *args, **kwargs):
     return functools.partial(_wrap_impl, f, args, kwargs)
 
 
-def run_tasks(tasks, executor, run_task, process_result=None, queue_size=50):
+#: Statistics of a completed task. ``worker_peak_rss`` is the peak resident set size of the worker
+#: process over its whole lifetime when the task finished, as reported by ``getrusage`` (KiB on Linux,
+#: None where unavailable). Workers run many tasks, so it is an upper bound rather than the memory
+#: used by this task.
+TaskStats = namedtuple('TaskStats', ['task_id', 'seconds', 'worker_peak_rss', 'attempts'])
+
+#: Outcome of :func:`run_tasks`
+TaskRunSummary = namedtuple('TaskRunSummary', ['successful', 'failed', 'skipped', 'retried',
+                                               'task_seconds', 'max_task_seconds', 'worker_peak_rss'])
+
+
+def _default_task_id(task):
+    if isinstance(task, dict) and 'tile_index' in task:
+        return str(task['tile_index'])
+    return str(task)
+
+
+def _worker_peak_rss():
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _run_timed(run_task, task):
+    """
+    Helper method, needs to be at the top level
+    """
+    t0 = time.perf_counter()
+    result = run_task(task=task)
+    return result, time.perf_counter() - t0, _worker_peak_rss()
+
+
+class TaskCheckpoint:
+    """
+    Append-only file of the ids of completed tasks, so that an interrupted run can be resumed.
+    """
+
+    def __init__(self, filename):
+        self.filename = Path(filename)
+        self.done = set()
+        if self.filename.exists():
+            with open(self.filename) as f:
+                self.done = set(line.rstrip('\n') for line in f if line.strip())
+        self._stream = None
+
+    def __contains__(self, task_id):
+        return task_id in self.done
+
+    def add(self, task_id):
+        if self._stream is None:
+            self._stream = open(self.filename, 'a', buffering=1)
+        self._stream.write(task_id + '\n')
+        self.done.add(task_id)
+
+    def close(self):
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+
+def run_tasks(tasks, executor, run_task, process_result=None, queue_size=50,
+              batch_size=1, max_retries=0, checkpoint_file=None, task_id=None, on_stats=None):
     """
+    Run tasks on an executor, keeping a bounded number of them in flight.
+
+    Results are processed as tasks complete and are not kept, new tasks are submitted in
+    batches of ``batch_size`` whenever there is room for a batch.
+
     :param tasks: iterable of tasks. Usually a generator to create them as required.
     :param executor: a datacube executor, similar to `distributed.Client` or `concurrent.futures`
     :param run_task: the function used to run a task. Expects a single argument of one of the tasks
     :param process_result: a function to do something based on the result of a completed task. It
                            takes a single argument, the return value from `run_task(task)`
-    :param queue_size: How large the queue of tasks should be. Will depend on how fast tasks are
+    :param queue_size: How many tasks can be in flight at once. Will depend on how fast tasks are
                        processed, and how much memory is available to buffer them.
+    :param batch_size: Number of tasks to submit at once with ``executor.map``
+    :param max_retries: How many times to re-submit a failed task
+    :param checkpoint_file: File recording the ids of completed tasks, tasks already recorded
+                            in it are skipped
+    :param task_id: function returning a stable id of a task, for the checkpoint file and logs.
+                    Default: the ``tile_index`` of a task, or its ``str()``
+    :param on_stats: a function called with the :class:`TaskStats` of every successful task
+    :return: :class:`TaskRunSummary`
     """
+    # pylint: disable=too-many-locals,too-many-statements
     click.echo('Starting processing...')
     process_result = process_result or do_nothing
-    results = []
-    task_queue = itertools.islice(tasks, queue_size)
-    for task in task_queue:
-        _LOG.info('Running task: %s', task.get('tile_index', str(task)))
-        results.append(executor.submit(run_task, task=task))
-
-    click.echo('Task queue filled, waiting for first result...')
-
-    successful = failed = 0
-    while results:
-        result, results = executor.next_completed(results, None)
-
-        # submit a new _task to replace the one we just finished
-        task = next(tasks, None)
-        if task:
-            _LOG.info('Running task: %s', task.get('tile_index', str(task)))
-            results.append(executor.submit(run_task, task=task))
-
-        # Process the result
+    task_id = task_id or _default_task_id
+    batch_size = max(1, min(batch_size, queue_size))
+    timed_task = functools.partial(_run_timed, run_task)
+    checkpoint = TaskCheckpoint(checkpoint_file) if checkpoint_file else None
+
+    tasks = iter(tasks)
+    # id(future) -> (future, task id, task, attempt)
+    in_flight = {}
+    successful = failed = skipped = retried = 0
+    task_seconds = max_task_seconds = 0.0
+    worker_peak_rss = None
+
+    def next_tasks(n):
+        nonlocal skipped
+        batch = []
+        while len(batch) < n:
+            task = next(tasks, None)
+            if task is None:
+                break
+            tid = task_id(task)
+            if checkpoint is not None and tid in checkpoint:
+                skipped += 1
+                continue
+            batch.append((tid, task))
+        return batch
+
+    def submit(tid, task, attempt):
+        _LOG.info('Running task: %s', tid)
+        future = executor.submit(timed_task, task=task)
+        in_flight[id(future)] = (future, tid, task, attempt)
+
+    def refill():
+        while queue_size - len(in_flight) >= batch_size:
+            batch = next_tasks(batch_size)
+            if not batch:
+                return
+            if len(batch) == 1:
+                submit(*batch[0], 1)
+                continue
+            for tid, _ in batch:
+                _LOG.info('Running task: %s', tid)
+            futures = executor.map(timed_task, [task for _, task in batch])
+            for future, (tid, task) in zip(futures, batch):
+                in_flight[id(future)] = (future, tid, task, 1)
+
+    def complete(future):
+        nonlocal successful, failed, retried, task_seconds, max_task_seconds, worker_peak_rss
+        _, tid, task, attempt = in_flight.pop(id(future))
         try:
-            actual_result = executor.result(result)
-            process_result(actual_result)
-            successful += 1
+            try:
+                result, seconds, rss = executor.result(future)
+            except Exception as err:  # pylint: disable=broad-except
+                if attempt <= max_retries:
+                    _LOG.warning('Task %s failed (attempt %d), retrying: %s', tid, attempt, err)
+                    retried += 1
+                    submit(tid, task, attempt + 1)
+                    return
+                raise
+            process_result(result)
         except Exception as err:  # pylint: disable=broad-except
             _LOG.exception('Task failed: %s', err)
             failed += 1
-            continue
+            return
         finally:
             # Release the _task to free memory so there is no leak in executor/scheduler/worker process
-            executor.release(result)
+            executor.release(future)
+
+        successful += 1
+        task_seconds += seconds
+        max_task_seconds = max(max_task_seconds, seconds)
+        if rss is not None:
+            worker_peak_rss = rss if worker_peak_rss is None else max(worker_peak_rss, rss)
+        stats = TaskStats(tid, seconds, rss, attempt)
+        _LOG.debug('Task %s done: %s', tid, stats)
+        if on_stats is not None:
+            on_stats(stats)
+        if checkpoint is not None:
+            checkpoint.add(tid)
+
+    try:
+        refill()
+        click.echo('Task queue filled, waiting for first result...')
+        while in_flight:
+            # Wait on everything currently in flight, so tasks submitted by refill() are seen too
+            future, _ = executor.next_completed([f for f, *_ in in_flight.values()], None)
+            complete(future)
+            refill()
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
 
     click.echo('%d successful, %d failed' % (successful, failed))
+    if skipped:
+        click.echo('%d skipped, already completed according to %s' % (skipped, checkpoint_file))
+    return TaskRunSummary(successful, failed, skipped, retried, task_seconds, max_task_seconds, worker_peak_rss)
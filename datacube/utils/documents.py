@@ -30,6 +30,11 @@ try:
 except ImportError:
     from yaml import SafeLoader  # type: ignore
 
+try:
+    import orjson  # type: ignore[import]
+except ImportError:
+    orjson = None
+
 from datacube.utils.generic import map_with_lookahead
 from datacube.utils.uris import mk_part_uri, as_url, uri_to_local_path
 
@@ -60,24 +65,64 @@ _PROTOCOL_OPENERS = {
 }
 
 
+DOCUMENT_LOADERS = ('fast', 'python')
+_DOCUMENT_LOADER = 'fast'
+
+
+def set_document_loader(name: str) -> None:
+    """
+    Select how YAML and JSON documents are parsed.
+
+    - ``fast``: libyaml based YAML loaders and ``orjson`` for JSON, where installed (default)
+    - ``python``: pure Python ``yaml.SafeLoader`` and stdlib ``json``
+
+    Both produce the same documents, ``python`` is there for debugging and comparison.
+    """
+    global _DOCUMENT_LOADER  # pylint: disable=global-statement
+    if name not in DOCUMENT_LOADERS:
+        raise ValueError(f"Unknown document loader {name!r}, expect one of {DOCUMENT_LOADERS}")
+    _DOCUMENT_LOADER = name
+
+
+def get_document_loader() -> str:
+    """ Name of the document loader selected with :func:`set_document_loader`
+    """
+    return _DOCUMENT_LOADER
+
+
+def _yaml_loader(parse_dates=False):
+    if _DOCUMENT_LOADER == 'python':
+        return yaml.SafeLoader if parse_dates else NoDatesPySafeLoader
+    return SafeLoader if parse_dates else NoDatesSafeLoader
+
+
 def load_from_yaml(handle, parse_dates=False):
-    loader = SafeLoader if parse_dates else NoDatesSafeLoader
-    yield from yaml.load_all(handle, Loader=loader)
+    yield from yaml.load_all(handle, Loader=_yaml_loader(parse_dates))
 
 
 def parse_yaml(doc: str) -> Mapping[str, Any]:
     """ Convert a single document yaml string into a parsed document
     """
-    return yaml.load(doc, Loader=SafeLoader)
+    return yaml.load(doc, Loader=_yaml_loader(parse_dates=True))
 
 
 def load_from_json(handle):
-    yield json.load(handle)
+    if orjson is None or _DOCUMENT_LOADER == 'python':
+        yield json.load(handle)
+        return
+
+    data = handle.read()
+    try:
+        doc = orjson.loads(data)
+    except orjson.JSONDecodeError:
+        # orjson is stricter than stdlib, e.g. it rejects NaN, give json a go before failing
+        doc = json.loads(data)
+    yield doc
 
 
 def load_from_netcdf(path):
     for doc in read_strings_from_netcdf(path, variable='dataset'):
-        yield yaml.load(doc, Loader=NoDatesSafeLoader)
+        yield yaml.load(doc, Loader=_yaml_loader())
 
 
 _PARSERS = {
@@ -241,7 +286,9 @@ def is_supported_document_type(path):
     return any([str(path).lower().endswith(suffix) for suffix in _ALL_SUPPORTED_EXTENSIONS])
 
 
-class NoDatesSafeLoader(SafeLoader):  # pylint: disable=too-many-ancestors
+class _NoDatesResolverMixin:
+    yaml_implicit_resolvers: Dict[str, Any]
+
     @classmethod
     def remove_implicit_resolver(cls, tag_to_remove):
         """
@@ -262,7 +309,18 @@ class NoDatesSafeLoader(SafeLoader):  # pylint: disable=too-many-ancestors
                                                          if tag != tag_to_remove]
 
 
+class NoDatesSafeLoader(_NoDatesResolverMixin, SafeLoader):  # pylint: disable=too-many-ancestors
+    """ Safe YAML loader that loads dates as strings, libyaml based when available
+    """
+
+
+class NoDatesPySafeLoader(_NoDatesResolverMixin, yaml.SafeLoader):  # pylint: disable=too-many-ancestors
+    """ Pure Python version of :class:`NoDatesSafeLoader`
+    """
+
+
 NoDatesSafeLoader.remove_implicit_resolver('tag:yaml.org,2002:timestamp')
+NoDatesPySafeLoader.remove_implicit_resolver('tag:yaml.org,2002:timestamp')
 
 
 class InvalidDocException(Exception):  # noqa: N818
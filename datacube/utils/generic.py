@@ -4,7 +4,9 @@
 # SPDX-License-Identifier: Apache-2.0
 import itertools
 import threading
-from typing import Any
+from collections import deque
+from concurrent.futures import Executor
+from typing import Any, Callable, Deque, Iterable, Iterator
 
 EOS = object()
 _LCL = threading.local()
@@ -14,6 +16,7 @@ __all__ = (
     "map_with_lookahead",
     "qmap",
     "it2q",
+    "ordered_executor_map",
     "thread_local_cache",
 )
 
@@ -76,6 +79,34 @@ def it2q(its, q, eos_marker=EOS):
         q.put(eos_marker, block=True)
 
 
+def ordered_executor_map(func: Callable[[Any], Any],
+                         its: Iterable[Any],
+                         executor: Executor,
+                         max_in_flight: int) -> Iterator[Any]:
+    """ Like ``map(func, its)`` but with ``func`` evaluated on ``executor``.
+
+    Unlike ``Executor.map`` input is consumed lazily: at most ``max_in_flight`` items are
+    submitted ahead of the consumer. Results are yielded in input order, an exception
+    raised by ``func`` is re-raised when its result is reached.
+    """
+    its = iter(its)
+    in_flight: Deque[Any] = deque()
+
+    def refill():
+        for x in itertools.islice(its, max(1, max_in_flight) - len(in_flight)):
+            in_flight.append(executor.submit(func, x))
+
+    try:
+        refill()
+        while in_flight:
+            fut = in_flight.popleft()
+            refill()
+            yield fut.result()
+    finally:
+        for fut in in_flight:
+            fut.cancel()
+
+
 def thread_local_cache(name: str,
                        initial_value: Any = None,
                        purge: bool = False) -> Any:
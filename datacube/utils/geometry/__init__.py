@@ -42,6 +42,9 @@ from ._base import (
     clip_lon180,
     chop_along_antimeridian,
     mid_longitude,
+    crs_cache_info,
+    crs_cache_clear,
+    intern_crs,
 )
 
 from .tools import (
@@ -64,6 +67,8 @@ from .tools import (
     get_scale_at_point,
     native_pix_transform,
     compute_reproject_roi,
+    reproject_roi_cache_info,
+    reproject_roi_cache_clear,
     split_translation,
     compute_axis_overlap,
     w_,
@@ -110,6 +115,9 @@ __all__ = [
     "clip_lon180",
     "chop_along_antimeridian",
     "mid_longitude",
+    "crs_cache_info",
+    "crs_cache_clear",
+    "intern_crs",
     "is_affine_st",
     "apply_affine",
     "compute_axis_overlap",
@@ -131,6 +139,8 @@ __all__ = [
     "get_scale_at_point",
     "native_pix_transform",
     "compute_reproject_roi",
+    "reproject_roi_cache_info",
+    "reproject_roi_cache_clear",
     "split_translation",
     "warp_affine",
     "rio_reproject",
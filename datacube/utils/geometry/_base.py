@@ -6,6 +6,7 @@ import functools
 import itertools
 import math
 import array
+import threading
 import warnings
 from collections import namedtuple, OrderedDict
 from typing import Tuple, Iterable, List, Union, Optional, Any, Callable, Hashable, Dict, Iterator
@@ -127,8 +128,113 @@ def _make_crs_key(crs_spec: Union[str, int, _CRS]) -> str:
     return crs_spec.to_wkt()
 
 
-@cachetools.cached({}, key=_make_crs_key)  # type: ignore[misc]
-def _make_crs(crs: Union[str, int, _CRS]) -> Tuple[_CRS, str, Optional[int]]:
+CacheInfo = namedtuple('CacheInfo', ('hits', 'misses', 'maxsize', 'currsize'))
+
+CRS_CACHE_SIZE = 1024
+CRS_TRANSFORMER_CACHE_SIZE = 128
+
+
+class _BoundedCache:
+    """
+    Thread-safe LRU cache with hit/miss statistics.
+
+    Values are computed outside of the lock, so two threads can occasionally
+    compute the same value, but only one of them is kept.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._cache: cachetools.LRUCache = cachetools.LRUCache(maxsize=maxsize)
+        self._hits = 0
+        self._misses = 0
+
+    def _store(self) -> cachetools.LRUCache:
+        return self._cache
+
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        store = self._store()
+        with self._lock:
+            try:
+                value = store[key]
+                self._hits += 1
+                return value
+            except KeyError:
+                self._misses += 1
+
+        value = compute()
+        with self._lock:
+            store[key] = value
+        return value
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, self._store().currsize)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+class _ThreadLocalCache(_BoundedCache):
+    """
+    Bounded cache with a separate store for every thread, for objects that must not be
+    shared between threads. Statistics are shared, ``currsize`` is for the calling thread.
+    """
+
+    def __init__(self, maxsize: int):
+        super().__init__(maxsize)
+        self._local = threading.local()
+        self._generation = 0
+
+    def _store(self) -> cachetools.LRUCache:
+        local = self._local
+        if getattr(local, 'generation', None) != self._generation:
+            local.cache = cachetools.LRUCache(maxsize=self.maxsize)
+            local.generation = self._generation
+        return local.cache
+
+    def clear(self) -> None:
+        with self._lock:
+            # other threads drop their store on next access
+            self._generation += 1
+            self._hits = 0
+            self._misses = 0
+
+
+_CRS_CACHE = _BoundedCache(CRS_CACHE_SIZE)
+_CRS_EPSG_CACHE = _BoundedCache(CRS_CACHE_SIZE)
+_CRS_EQ_CACHE = _BoundedCache(CRS_CACHE_SIZE)
+_CRS_INTERN_CACHE = _BoundedCache(CRS_CACHE_SIZE)
+# pyproj Transformer objects are not thread-safe
+_CRS_TRANSFORMER_CACHE = _ThreadLocalCache(CRS_TRANSFORMER_CACHE_SIZE)
+
+
+def crs_cache_info() -> Dict[str, CacheInfo]:
+    """
+    Statistics of the caches used by :class:`CRS`.
+
+    :returns: Mapping from cache name (``crs``, ``epsg``, ``equality``, ``transformer``, ``interned``)
+              to ``CacheInfo(hits, misses, maxsize, currsize)``
+    """
+    return {'crs': _CRS_CACHE.info(),
+            'epsg': _CRS_EPSG_CACHE.info(),
+            'equality': _CRS_EQ_CACHE.info(),
+            'transformer': _CRS_TRANSFORMER_CACHE.info(),
+            'interned': _CRS_INTERN_CACHE.info()}
+
+
+def crs_cache_clear() -> None:
+    """
+    Clear all caches used by :class:`CRS` and reset their statistics.
+    """
+    for cache in (_CRS_CACHE, _CRS_EPSG_CACHE, _CRS_EQ_CACHE, _CRS_TRANSFORMER_CACHE, _CRS_INTERN_CACHE):
+        cache.clear()
+
+
+def _parse_crs(crs: Union[str, int, _CRS]) -> Tuple[_CRS, str, Optional[int]]:
     epsg = False
     crs = _CRS.from_user_input(crs)
     crs_str = crs.srs
@@ -137,13 +243,14 @@ def _make_crs(crs: Union[str, int, _CRS]) -> Tuple[_CRS, str, Optional[int]]:
     return (crs, crs_str, epsg)
 
 
-def _make_crs_transform_key(from_crs, to_crs, always_xy):
-    return (id(from_crs), id(to_crs), always_xy)
+def _make_crs(crs: Union[str, int, _CRS]) -> Tuple[_CRS, str, Optional[int]]:
+    return _CRS_CACHE.get(_make_crs_key(crs), lambda: _parse_crs(crs))
 
 
-@cachetools.cached({}, key=_make_crs_transform_key)
-def _make_crs_transform(from_crs, to_crs, always_xy):
-    return Transformer.from_crs(from_crs, to_crs, always_xy=always_xy).transform
+def _make_crs_transform(from_crs: 'CRS', to_crs: 'CRS', always_xy: bool):
+    return _CRS_TRANSFORMER_CACHE.get(
+        (from_crs._str, to_crs._str, always_xy),
+        lambda: Transformer.from_crs(from_crs._crs, to_crs._crs, always_xy=always_xy).transform)
 
 
 class CRS:
@@ -215,7 +322,7 @@ class CRS:
         """
         if self._epsg is not False:
             return self._epsg
-        self._epsg = self._crs.to_epsg()
+        self._epsg = _CRS_EPSG_CACHE.get(self._str, self._crs.to_epsg)
         return self._epsg
 
     @property
@@ -287,13 +394,13 @@ class CRS:
             except Exception:
                 return False
 
-        if self._crs is other._crs:
+        if self._crs is other._crs or self._str == other._str:
             return True
 
         if self.epsg is not None and other.epsg is not None:
             return self.epsg == other.epsg
 
-        return self._crs == other._crs
+        return _CRS_EQ_CACHE.get((self._str, other._str), lambda: self._crs == other._crs)
 
     def __ne__(self, other) -> bool:
         return not (self == other)
@@ -330,7 +437,7 @@ class CRS:
         this stored either as scalars or ndarray objects and x', y' are the same
         points in the `other` CRS.
         """
-        transform = _make_crs_transform(self._crs, other._crs, always_xy=always_xy)
+        transform = _make_crs_transform(self, other, always_xy=always_xy)
 
         def result(x, y):
             rx, ry = transform(x, y)
@@ -346,6 +453,18 @@ class CRS:
         return result
 
 
+def intern_crs(crs_str: str) -> CRS:
+    """
+    Shared :class:`CRS` for a CRS string.
+
+    Repeated calls with the same string return the same object, so CRSs read from many
+    documents cost one object each and compare equal by identity.
+
+    :raises: `pyproj.exceptions.CRSError`
+    """
+    return _CRS_INTERN_CACHE.get(crs_str, lambda: CRS(crs_str))
+
+
 class CRSMismatchError(ValueError):
     """
     Raised when geometry operation is attempted on geometries in different
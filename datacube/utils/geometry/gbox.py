@@ -5,9 +5,11 @@
 """ Geometric operations on GeoBox class
 """
 
-from typing import Dict, Optional, Tuple, Iterable
+from typing import Dict, Optional, Sequence, Tuple, Iterable
 import itertools
 import math
+import numpy as np
+import shapely
 from affine import Affine
 
 from . import Geometry, GeoBox, BoundingBox
@@ -152,6 +154,7 @@ class GeoboxTiles():
         self._shape = tuple(math.ceil(float(N)/n)
                             for N, n in zip(box.shape, tile_shape))
         self._cache: Dict[Tuple[int, int], GeoBox] = {}
+        self._tree: Optional[shapely.STRtree] = None
 
     @property
     def base(self) -> GeoBox:
@@ -237,3 +240,44 @@ class GeoboxTiles():
             gbox = self[idx]
             if gbox.extent.intersects(poly):
                 yield idx
+
+    def _tile_tree(self) -> shapely.STRtree:
+        """ Spatial index of the extents of all tiles, in row major order.
+        """
+        if self._tree is None:
+            (H, W), (h, w), (NY, NX) = self._gbox.shape, self._tile_shape, self._shape
+            rows = np.minimum(np.arange(NY + 1)*h, H)
+            cols = np.minimum(np.arange(NX + 1)*w, W)
+            iy, ix = (i.ravel() for i in np.meshgrid(np.arange(NY), np.arange(NX), indexing='ij'))
+            # pixel corners of every tile as a closed ring
+            px = np.stack([cols[ix], cols[ix], cols[ix + 1], cols[ix + 1], cols[ix]], axis=-1)
+            py = np.stack([rows[iy], rows[iy + 1], rows[iy + 1], rows[iy], rows[iy]], axis=-1)
+            A = self._gbox.transform
+            xy = np.stack([A.a*px + A.b*py + A.c, A.d*px + A.e*py + A.f], axis=-1)
+            self._tree = shapely.STRtree(shapely.polygons(xy))
+        return self._tree
+
+    def tiles_incidence(self, polygons: Sequence[Geometry]) -> Tuple[np.ndarray, np.ndarray]:
+        """ Tile indexes overlapping with each of many geometries.
+
+        Intersections with all tiles are computed for all geometries at once, using a
+        spatial index of the tiles. Unlike :meth:`tiles`, tiles that only touch a geometry
+        along their boundary are not included.
+
+        :param polygons: Geometries, reprojected to the CRS of the GeoBox if needed
+        :returns: ``(ipoly, idx)``: index into ``polygons`` and ``(row, col)`` tile index
+                  of every overlapping pair, ordered by ``ipoly`` then by tile
+        """
+        crs = self._gbox.crs
+        geoms = np.empty(len(polygons), dtype=object)
+        geoms[:] = [(poly if crs is None else poly.to_crs(crs)).geom for poly in polygons]
+
+        tree = self._tile_tree()
+        ipoly, itile = tree.query(geoms, predicate='intersects')
+        keep = ~shapely.touches(geoms[ipoly], tree.geometries[itile])
+        ipoly, itile = ipoly[keep], itile[keep]
+
+        order = np.lexsort((itile, ipoly))
+        ipoly, itile = ipoly[order], itile[order]
+        NX = self._shape[1]
+        return ipoly, np.stack([itile // NX, itile % NX], axis=-1)
@@ -7,6 +7,7 @@ import collections.abc
 from types import SimpleNamespace
 from typing import Tuple
 from affine import Affine
+from cachetools.func import lru_cache
 
 # This is numeric code, short names make sense in this context, so disabling
 # "invalid name" checks for the whole file
@@ -611,6 +612,16 @@ def compute_reproject_roi(src, dst, tol=0.05, padding=None, align=None):
     For scale direction is: "scale > 1 --> shrink src to fit dst"
 
     """
+    rr = _compute_reproject_roi(src, dst, tol, padding, align)
+    # cached result is shared, return a copy so callers can adjust ROIs in place
+    return SimpleNamespace(**vars(rr))
+
+
+REPROJECT_ROI_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=REPROJECT_ROI_CACHE_SIZE)
+def _compute_reproject_roi(src, dst, tol, padding, align):
     pts_per_side = 5
 
     def compute_roi(src, dst, tr, pts_per_side, padding, align):
@@ -656,3 +667,19 @@ def compute_reproject_roi(src, dst, tol=0.05, padding=None, align=None):
                            scale2=scale2,
                            is_st=is_st,
                            transform=tr)
+
+
+def reproject_roi_cache_info():
+    """
+    Statistics of the :func:`compute_reproject_roi` cache: ``hits, misses, maxsize, currsize``.
+
+    Results are cached per ``(src, dst, tol, padding, align)``, so repeated reads of the
+    same source grid into the same destination GeoBox only compute the ROI once.
+    """
+    return _compute_reproject_roi.cache_info()
+
+
+def reproject_roi_cache_clear():
+    """ Drop all cached :func:`compute_reproject_roi` results and reset statistics.
+    """
+    _compute_reproject_roi.cache_clear()
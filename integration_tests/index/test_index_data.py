@@ -585,3 +585,29 @@ def test_bulk_reads_transaction(index, extended_eo3_metadata_type_doc,
         with index.datasets._db_connection() as conn:
             conn.bulk_simple_dataset_search(batch_size=2)
     assert "within a transaction" in str(e.value)
+
+
+def test_bulk_add_datasets(index, extended_eo3_metadata_type_doc,
+                           ls8_eo3_product, wo_eo3_product,
+                           eo3_ls8_dataset_doc, eo3_ls8_dataset2_doc,
+                           eo3_wo_dataset_doc):
+    from datacube.index.hl import Doc2Dataset
+    resolver = Doc2Dataset(index)
+
+    dss = [resolver(*doc)[0] for doc in (eo3_ls8_dataset_doc, eo3_ls8_dataset2_doc)]
+    # second copy of the first dataset is skipped
+    status = index.datasets.bulk_add_datasets(dss + dss[:1], with_lineage=False, batch_size=2)
+    assert (status.completed, status.skipped) == (2, 1)
+    assert list(index.datasets.bulk_has([ds.id for ds in dss])) == [True, True]
+    for ds, (_, uri) in zip(dss, (eo3_ls8_dataset_doc, eo3_ls8_dataset2_doc)):
+        assert index.datasets.get(ds.id).uris == [uri]
+
+    status = index.datasets.bulk_add_datasets(dss, with_lineage=False)
+    assert (status.completed, status.skipped) == (0, 2)
+
+    ds_wo, err = resolver(*eo3_wo_dataset_doc)
+    assert err is None
+    status = index.datasets.bulk_add_datasets([ds_wo], with_lineage=False, archive_less_mature=500)
+    assert (status.completed, status.skipped) == (1, 0)
+    assert index.datasets.has(ds_wo.id)
+    assert {ds.id for ds in index.datasets.search(product=ls8_eo3_product.name)} == {ds.id for ds in dss}
@@ -183,6 +183,40 @@ def test_mem_dataset_add_eo3(mem_index_eo3,
     assert list(dc.index.datasets.bulk_has((doc_ls8["id"], doc_wo["id"]))) == [True, True]
 
 
+def test_mem_bulk_add_datasets(mem_index_eo3, datasets_with_unembedded_lineage_doc, caplog):
+    from datacube.index.hl import Doc2Dataset
+    idx = mem_index_eo3.index
+    resolver = Doc2Dataset(idx)
+    (doc_ls8, loc_ls8), (doc_wo, loc_wo) = datasets_with_unembedded_lineage_doc
+
+    ds_ls8, err = resolver(doc_ls8, loc_ls8)
+    assert err is None
+    status = idx.datasets.bulk_add_datasets([ds_ls8], batch_size=1)
+    assert (status.completed, status.skipped) == (1, 0)
+
+    # lineage is resolved against the index, so add derived datasets in a second pass
+    ds_wo, err = resolver(doc_wo, loc_wo)
+    assert err is None
+    status = idx.datasets.bulk_add_datasets([ds_wo], archive_less_mature=500)
+    assert (status.completed, status.skipped) == (1, 0)
+
+    assert list(idx.datasets.bulk_has((ds_ls8.id, ds_wo.id))) == [True, True]
+    wo = idx.datasets.get(ds_wo.id, include_sources=True)
+    assert wo.sources["ard"].id == ds_ls8.id
+    assert wo.uris == [loc_wo]
+
+    # source missing from the index is added in the same batch as the derived dataset, without locations
+    idx.datasets.archive([ds_ls8.id, ds_wo.id])
+    idx.datasets.purge([ds_ls8.id, ds_wo.id])
+    status = idx.datasets.bulk_add_datasets([ds_wo, ds_wo])
+    assert (status.completed, status.skipped) == (1, 1)
+    assert "one at a time" not in caplog.text
+    wo = idx.datasets.get(ds_wo.id, include_sources=True)
+    assert wo.sources["ard"].id == ds_ls8.id
+    assert wo.uris == [loc_wo]
+    assert idx.datasets.get(ds_ls8.id).uris == []
+
+
 def test_mem_ds_lineage(mem_eo3_data):
     dc, ls8_id, wo_id = mem_eo3_data
     wo_ds = dc.index.datasets.get(wo_id, include_sources=True)
@@ -427,6 +461,33 @@ def test_mem_ds_search_and_count(mem_eo3_data):
         lds = list(dc.index.datasets.search(product_family='addams'))
 
 
+def test_mem_ds_search_time_and_space(mem_eo3_data):
+    dc, ls8_id, wo_id = mem_eo3_data
+    ls8 = dc.index.datasets.get(ls8_id)
+    extent = ls8.extent.to_crs('EPSG:4326').boundingbox
+    t = ls8.time.begin
+    day = datetime.timedelta(days=1)
+
+    lds = list(dc.index.datasets.search(product=ls8.product.name, time=Range(t - day, t + day)))
+    assert [ds.id for ds in lds] == [ls8_id]
+    assert not list(dc.index.datasets.search(product=ls8.product.name, time=Range(t + day, t + 2 * day)))
+
+    lds = list(dc.index.datasets.search(product=ls8.product.name,
+                                        lat=Range(extent.bottom, extent.top),
+                                        lon=Range(extent.left, extent.left + 0.01)))
+    assert [ds.id for ds in lds] == [ls8_id]
+    assert not list(dc.index.datasets.search(product=ls8.product.name,
+                                             lat=Range(extent.top + 1, extent.top + 2),
+                                             lon=Range(extent.left, extent.right)))
+
+    # Indexes are kept up to date through archive and restore
+    dc.index.datasets.archive([ls8_id])
+    assert not list(dc.index.datasets.search(product=ls8.product.name, time=Range(t - day, t + day)))
+    dc.index.datasets.restore([ls8_id])
+    assert len(dc.find_datasets(product=ls8.product.name, time=(t - day, t + day),
+                                x=(extent.left, extent.right), y=(extent.bottom, extent.top))) == 1
+
+
 def test_mem_ds_search_and_count_by_product(mem_eo3_data):
     dc, ls8_id, wo_id = mem_eo3_data
     # No source_filter; no results
@@ -456,6 +517,26 @@ def test_mem_ds_search_returning(mem_eo3_data):
         assert res.id in (str(ls8_id), str(wo_id))
 
 
+def test_mem_ds_search_to_table(mem_eo3_data):
+    dc, ls8_id, wo_id = mem_eo3_data
+    df = dc.index.datasets.search_to_table(("id", "platform", "time"), platform='landsat-8', batch_size=1)
+    assert list(df.columns) == ["id", "platform", "time_begin", "time_end"]
+    assert set(df["id"]) == {str(ls8_id), str(wo_id)}
+    assert str(df["time_begin"].dtype) == "datetime64[ns, UTC]"
+
+
+def test_mem_ds_search_compact(mem_eo3_data):
+    from datacube.model import materialise_datasets
+    dc, ls8_id, wo_id = mem_eo3_data
+    cdss = list(dc.index.datasets.search_compact(platform='landsat-8'))
+    assert {cds.id for cds in cdss} == {ls8_id, wo_id}
+    assert not any(cds.is_materialised for cds in cdss)
+    materialise_datasets(cdss)
+    for cds in cdss:
+        assert cds.is_materialised
+        assert cds.metadata_doc == dc.index.datasets.get(cds.id).metadata_doc
+
+
 def test_mem_ds_search_summary(mem_eo3_data):
     dc, ls8_id, wo_id = mem_eo3_data
     lds = list(dc.index.datasets.search_summaries(platform='landsat-8'))
@@ -62,6 +62,58 @@ def test_spatial_index_populate(index: Index,
     assert index.update_spatial_index(product_names=[ls8_eo3_product.name], dataset_ids=[ls8_eo3_dataset.id]) == 8
 
 
+@pytest.mark.parametrize('datacube_env_name', ('experimental',))
+def test_spatial_index_populate_batched(index: Index,
+                                        ls8_eo3_product,
+                                        wo_eo3_product,
+                                        ls8_eo3_dataset, ls8_eo3_dataset2,
+                                        ls8_eo3_dataset3, ls8_eo3_dataset4,
+                                        wo_eo3_dataset):
+    index.create_spatial_index(CRS("EPSG:3577"))
+    progress = []
+    assert index.update_spatial_index(batch_size=3,
+                                      progress_cbk=lambda name, n: progress.append((name, n))) == 10
+    assert dict(progress) == {ls8_eo3_product.name: 8, wo_eo3_product.name: 2}
+    # Resuming (re-running) is harmless, entries are updated in place
+    assert index.update_spatial_index(product_names=[wo_eo3_product.name], batch_size=1) == 2
+    progress = []
+    assert index.update_search_index(batch_size=3,
+                                     progress_cbk=lambda name, n: progress.append((name, n))) == 5
+    assert dict(progress) == {ls8_eo3_product.name: 4, wo_eo3_product.name: 1}
+    assert index.update_search_index(dataset_ids=[ls8_eo3_dataset.id]) == 1
+
+
+@pytest.mark.parametrize('datacube_env_name', ('experimental',))
+def test_spindex_cli(clirunner, index: Index,
+                     ls8_eo3_product, wo_eo3_product,
+                     ls8_eo3_dataset, ls8_eo3_dataset2,
+                     ls8_eo3_dataset3, ls8_eo3_dataset4,
+                     wo_eo3_dataset):
+    result = clirunner(['spindex', 'create', 'EPSG:3577'])
+    assert 'EPSG:3577' in result.output
+    result = clirunner(['spindex', 'list'])
+    assert 'EPSG:3577' in result.output and 'EPSG:4326' in result.output
+
+    result = clirunner(['spindex', 'update'])
+    assert f'{ls8_eo3_product.name}: 8 entries' in result.output
+    assert f'{wo_eo3_product.name}: 2 entries' in result.output
+    assert 'Updated 10 spatial index entries for 2 products' in result.output
+
+    # resume from the second product
+    last, first = sorted([ls8_eo3_product.name, wo_eo3_product.name], reverse=True)
+    result = clirunner(['spindex', 'update', 'EPSG:3577', '--start-from', last])
+    assert f'{last}:' in result.output and f'{first}:' not in result.output
+
+    result = clirunner(['spindex', 'update', '--product', wo_eo3_product.name])
+    assert 'Updated 2 spatial index entries for 1 products' in result.output
+
+    result = clirunner(['spindex', 'update', '--start-from', 'zzz'])
+    assert 'No products to update' in result.output
+
+    result = clirunner(['spindex', 'update-search', '--batch-size', '2'])
+    assert 'Updated search fields of 5 datasets for 2 products' in result.output
+
+
 @pytest.mark.parametrize('datacube_env_name', ('experimental',))
 def test_spatial_index_crs_validity(index: Index,
                                     ls8_eo3_product, ls8_eo3_dataset,
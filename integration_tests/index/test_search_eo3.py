@@ -258,6 +258,90 @@ def test_search_limit_eo3(index, ls8_eo3_dataset, ls8_eo3_dataset2, wo_eo3_datas
     assert len(datasets) == 3
 
 
+def test_search_streamed_eo3(index, ls8_eo3_dataset, ls8_eo3_dataset2, wo_eo3_dataset):
+    prod = ls8_eo3_dataset.product.name
+    expected = {ls8_eo3_dataset.id, ls8_eo3_dataset2.id}
+    for batch_size in (1, 2, 1000):
+        datasets = list(index.datasets.search(product=prod, batch_size=batch_size))
+        assert {ds.id for ds in datasets} == expected
+
+    datasets = list(index.datasets.search(limit=1, product=prod, batch_size=1))
+    assert len(datasets) == 1
+
+    # streaming from within an explicit transaction re-uses it
+    with index.transaction():
+        datasets = list(index.datasets.search(product=prod, batch_size=1))
+    assert {ds.id for ds in datasets} == expected
+
+
+def test_search_query_stats_eo3(index, ls8_eo3_dataset, ls8_eo3_dataset2, wo_eo3_dataset):
+    prod = ls8_eo3_dataset.product.name
+    with index.query_stats(explain=True) as stats:
+        assert len(list(index.datasets.search(product=prod))) == 2
+        assert index.datasets.count(product=prod) == 2
+        list(index.datasets.search_returning(('id',), product=prod))
+        index.datasets.get_product_time_bounds(prod)
+
+    summary = stats.summary()
+    assert summary['search_datasets']['calls'] == 2
+    assert summary['search_datasets']['rows'] == 4
+    assert summary['count_datasets']['calls'] == 1
+    assert summary['get_product_time_bounds']['calls'] == 1
+    for ev in stats.events:
+        assert ev.sql.lstrip().upper().startswith('SELECT')
+        assert ev.explain
+    assert stats.events[0].python_seconds > 0
+
+    with index.query_stats() as stats:
+        pass
+    list(index.datasets.search(product=prod))
+    assert stats.events == []
+
+    # Repeated searches of the same shape re-use compiled SQL
+    with index.query_stats() as stats:
+        for platform in ('landsat-8', 'landsat-9', 'landsat-8'):
+            list(index.datasets.search(product=prod, platform=platform))
+    assert [ev.compiled_cache for ev in stats.events][1:] == ['hit', 'hit']
+
+
+def test_search_to_table_eo3(index, ls8_eo3_dataset, ls8_eo3_dataset2, wo_eo3_dataset):
+    prod = ls8_eo3_dataset.product.name
+    df = index.datasets.search_to_table(('id', 'time', 'lat', 'cloud_cover'), product=prod, batch_size=1)
+    assert list(df.columns) == ['id', 'time_begin', 'time_end', 'lat_begin', 'lat_end', 'cloud_cover']
+    assert set(df['id']) == {str(ls8_eo3_dataset.id), str(ls8_eo3_dataset2.id)}
+    assert str(df['time_begin'].dtype) == 'datetime64[ns, UTC]'
+    assert df['lat_begin'].dtype == float
+
+    df = index.datasets.search_to_table(('id',), product=prod, limit=1)
+    assert len(df) == 1
+
+
+def test_search_compact_eo3(index, ls8_eo3_dataset, ls8_eo3_dataset2, wo_eo3_dataset):
+    from datacube.model import CompactDataset, materialise_datasets
+
+    prod = ls8_eo3_dataset.product.name
+    expected = {ds.id: ds for ds in (ls8_eo3_dataset, ls8_eo3_dataset2)}
+    datasets = list(index.datasets.search_compact(product=prod, batch_size=1))
+    assert {cds.id for cds in datasets} == set(expected)
+    for cds in datasets:
+        ds = expected[cds.id]
+        assert isinstance(cds, CompactDataset)
+        assert not cds.is_materialised
+        assert cds.product == ds.product
+        assert Range(*map(tz_as_utc, cds.time)) == Range(*map(tz_as_utc, ds.time))
+        assert cds.crs == ds.crs
+        assert cds.extent == ds.extent
+        assert cds.mid_longitude == pytest.approx((ds.metadata.lon.begin + ds.metadata.lon.end)*0.5)
+        assert cds.uris == ds.uris
+
+    assert len(list(index.datasets.search_compact(product=prod, limit=1))) == 1
+
+    materialise_datasets(datasets)
+    for cds in datasets:
+        assert cds.is_materialised
+        assert cds.metadata_doc == expected[cds.id].metadata_doc
+
+
 def test_search_or_expressions_eo3(index: Index,
                                    ls8_eo3_dataset: Dataset,
                                    ls8_eo3_dataset2: Dataset,
@@ -24,7 +24,7 @@ doc_require = [
 ]
 
 extras_require = {
-    'performance': ['ciso8601', 'bottleneck'],
+    'performance': ['ciso8601', 'bottleneck', 'orjson'],
     'distributed': ['distributed', 'dask[distributed]'],
     'doc': doc_require,
     's3': ['boto3', 'botocore'],
@@ -60,6 +60,62 @@ def test_group_datasets_by_time():
     assert len(xx.data[1]) == 1
 
 
+@pytest.mark.parametrize('group_by', ['time', 'solar_day'])
+def test_group_datasets_key_arrays(group_by):
+    from copy import copy
+    from datacube.api.query import query_group_by
+    from datacube.model import Range
+
+    utc = datetime.timezone.utc
+    t0 = datetime.datetime(2020, 3, 1, 23, 30, tzinfo=utc)
+    datasets = [SimpleNamespace(center_time=t0 + datetime.timedelta(minutes=i % 5, days=i % 3),
+                                id=UUID(int=(i*7919) % 101 + (i % 2 << 100)),
+                                metadata=SimpleNamespace(lon=Range(100.0 + i, 101.0 + i)))
+                for i in range(40)]
+    # same time instant in another timezone
+    datasets.append(SimpleNamespace(center_time=t0.astimezone(datetime.timezone(datetime.timedelta(hours=-1))),
+                                    id=UUID(int=3),
+                                    metadata=SimpleNamespace(lon=Range(-10.0, -9.0))))
+
+    fast = query_group_by(group_by)
+    assert fast.key_arrays is not None
+    slow = copy(fast)
+    slow.key_arrays = None
+
+    xx = Datacube.group_datasets(datasets, fast)
+    yy = Datacube.group_datasets(datasets, slow)
+    assert xx.time.dtype == yy.time.dtype
+    np.testing.assert_array_equal(xx.time.values, yy.time.values)
+    assert [tuple(ds.id for ds in dss) for dss in xx.values] == [tuple(ds.id for ds in dss) for dss in yy.values]
+    assert xx.time.attrs == yy.time.attrs
+
+    assert Datacube.group_datasets([], fast).shape == (0,)
+
+    if group_by == 'solar_day':
+        with pytest.raises(ValueError):
+            Datacube.group_datasets([SimpleNamespace(center_time=t0, id=UUID(int=1), metadata=SimpleNamespace())],
+                                    fast)
+
+
+def test_group_datasets_key_arrays_other_ids():
+    from copy import copy
+    from datacube.api.query import query_group_by
+
+    t0 = datetime.datetime(2020, 3, 1)
+    fast = query_group_by('time')
+    slow = copy(fast)
+    slow.key_arrays = None
+
+    # ids that are not UUIDs: orderable strings, and objects that can not be ordered (never tied)
+    for ids, step in ((['c', 'a', 'b', 'd'], 2), ([object() for _ in range(4)], 1)):
+        datasets = [SimpleNamespace(center_time=t0 + datetime.timedelta(days=i // step), id=ds_id)
+                    for i, ds_id in enumerate(ids)]
+        xx = Datacube.group_datasets(datasets, fast)
+        yy = Datacube.group_datasets(datasets, slow)
+        np.testing.assert_array_equal(xx.time.values, yy.time.values)
+        assert [tuple(ds.id for ds in dss) for dss in xx.values] == [tuple(ds.id for ds in dss) for dss in yy.values]
+
+
 def test_grouped_datasets_should_be_in_consistent_order():
     datasets = [
         {'time': datetime.datetime(2016, 1, 1, 0, 1), 'value': 'foo'},
@@ -112,3 +168,21 @@ def test_dask_chunks():
 
     with pytest.raises(KeyError):
         _calculate_chunk_sizes(sources, geobox, {'zz': 1})
+
+
+def test_per_band_load_data_settings():
+    from datacube.api.core import per_band_load_data_settings
+
+    ds = mk_sample_dataset([dict(name='red'), dict(name='fmask')])
+    mm = per_band_load_data_settings(ds.product.measurements,
+                                     resampling='cubic',
+                                     overview_mode={'*': 'nearest-finer', 'fmask': 'off'})
+    mm = {m.name: m for m in mm}
+    assert mm['red'].resampling_method == 'cubic'
+    assert mm['red'].overview_mode == 'nearest-finer'
+    assert mm['fmask'].overview_mode == 'off'
+
+    mm = per_band_load_data_settings(ds.product.measurements, overview_mode={'fmask': 'nearest'})
+    mm = {m.name: m for m in mm}
+    assert mm['red'].overview_mode == 'auto'
+    assert mm['fmask'].overview_mode == 'nearest'
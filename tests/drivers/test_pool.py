@@ -0,0 +1,91 @@
+# This file is part of the Open Data Cube, see https://opendatacube.org for more information
+#
+# Copyright (c) 2015-2024 ODC Contributors
+# SPDX-License-Identifier: Apache-2.0
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine.url import URL
+from sqlalchemy.pool import NullPool, QueuePool
+
+from datacube.drivers._pool import PoolMetrics, engine_pool_args, pool_options_from_config
+from datacube.drivers.postgis._connections import PostGisDb
+from datacube.drivers.postgres._connections import PostgresDb
+
+_URL = URL.create('postgresql', host="fake_host", database="fake_database", port=6543,
+                  username="fake_username", password="fake_password")
+
+
+def test_pool_options_from_config():
+    opts = pool_options_from_config({})
+    assert opts == dict(pool_timeout=60, pool_mode='queue', pool_size=5, max_overflow=10,
+                        pool_wait_timeout=30.0, pool_pre_ping=False)
+
+    opts = pool_options_from_config({
+        'db_connection_timeout': '300',
+        'db_pool_mode': 'null',
+        'db_pool_size': '2',
+        'db_pool_max_overflow': '0',
+        'db_pool_wait_timeout': '2.5',
+        'db_pool_pre_ping': 'yes',
+    })
+    assert opts == dict(pool_timeout=300, pool_mode='null', pool_size=2, max_overflow=0,
+                        pool_wait_timeout=2.5, pool_pre_ping=True)
+    assert pool_options_from_config({'db_pool_pre_ping': 'no'})['pool_pre_ping'] is False
+
+
+def test_engine_pool_args():
+    assert engine_pool_args() == dict(pool_pre_ping=False, pool_recycle=60,
+                                      pool_size=5, max_overflow=10, pool_timeout=30)
+    assert engine_pool_args('null', pool_size=3) == dict(pool_pre_ping=False, pool_recycle=60,
+                                                         poolclass=NullPool)
+    with pytest.raises(ValueError):
+        engine_pool_args('bouncy')
+
+
+@pytest.mark.parametrize('db_class', [PostgresDb, PostGisDb])
+def test_create_engine_pool(db_class):
+    engine = db_class._create_engine(_URL, pool_size=3, max_overflow=1, pool_wait_timeout=5,
+                                     pool_pre_ping=True, pool_timeout=120)
+    assert isinstance(engine.pool, QueuePool)
+    assert engine.pool.size() == 3
+    assert engine.pool._max_overflow == 1
+    assert engine.pool._timeout == 5
+    assert engine.pool._pre_ping
+    assert engine.pool._recycle == 120
+
+    engine = db_class._create_engine(_URL, pool_mode='null')
+    assert isinstance(engine.pool, NullPool)
+
+    db = db_class(engine)
+    stats = db.pool_stats()
+    assert stats['pool'] == 'NullPool'
+    assert stats['checkouts'] == 0
+    assert stats['waits'] == 0
+
+
+def test_pool_metrics():
+    engine = create_engine('sqlite://', poolclass=QueuePool, pool_size=1, max_overflow=0)
+    metrics = PoolMetrics(engine)
+
+    with metrics.connect() as conn:
+        conn.execute(text("select 1"))
+        assert metrics.as_dict()['checked_out'] == 1
+    with metrics.connect() as conn:
+        conn.execute(text("select 1"))
+
+    stats = metrics.as_dict()
+    assert stats['pool'] == 'QueuePool'
+    assert stats['checkouts'] == 2
+    assert stats['checkins'] == 2
+    assert stats['checked_out'] == 0
+    assert stats['connects'] == 1
+    assert stats['waits'] == 2
+    assert stats['max_wait_seconds'] >= stats['mean_wait_seconds'] >= 0
+    assert stats['pool_size'] == 1
+
+    # Connections taken directly from the engine are counted, but not timed
+    with engine.connect():
+        pass
+    stats = metrics.as_dict()
+    assert stats['checkouts'] == 3
+    assert stats['waits'] == 2
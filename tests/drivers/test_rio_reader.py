@@ -14,6 +14,9 @@ import warnings
 
 from datacube.drivers.rio._reader import (
     RDEntry,
+    HandleCache,
+    HandleCacheStats,
+    RioHandle,
     _dc_crs,
     _rio_uri,
     _rio_band_idx,
@@ -217,3 +220,95 @@ def test_testutils_iodriver(data_folder):
     assert src.shape == (2000, 4000)
     assert src.nodata == -999
     assert src.dtype == np.dtype(np.int16)
+
+
+def test_rio_driver_handle_cache(data_folder):
+    base = "file://" + str(data_folder) + "/metadata.yml"
+
+    rdr = mk_rio_driver()
+    load_ctx = rdr.new_load_context(iter([]), None)
+    assert isinstance(load_ctx, HandleCache)
+    assert load_ctx.stats() == (0, 0, 0, 0)
+
+    b1 = mk_band('b1', base, path="test.tif", format=GeoTIFF)
+    b2 = mk_band('b2', base, path="test.tif", format=GeoTIFF, band=1)
+
+    src1 = rdr.open(b1, load_ctx).result()
+    src2 = rdr.open(b2, load_ctx).result()
+    assert src1._handle is src2._handle
+    assert load_ctx.stats() == HandleCacheStats(hits=1, misses=1, evictions=0, size=1)
+
+    # context is carried over between loads
+    assert rdr.new_load_context(iter([b1]), load_ctx) is load_ctx
+    rdr.open(b1, load_ctx).result()
+    assert load_ctx.stats().hits == 2
+
+    # evicted handles are closed, but readers still work
+    b3 = mk_band('b1', base, path="sample_tile_151_-29.tif", format=GeoTIFF)
+    small_ctx = HandleCache(max_size=1)
+    src1 = rdr.open(b1, small_ctx).result()
+    rdr.open(b3, small_ctx).result()
+    assert small_ctx.stats() == HandleCacheStats(hits=0, misses=2, evictions=1, size=1)
+    xx = src1.read((slice(0, 10), slice(0, 20))).result()
+    assert xx.shape == (10, 20)
+
+    small_ctx.clear()
+    assert len(small_ctx) == 0
+
+    # caching can be disabled
+    rdr = RDEntry().new_instance({'handle_cache_size': 0})
+    assert rdr.new_load_context(iter([b1]), None) is None
+    assert rdr.open(b1, None).result().shape == (2000, 4000)
+
+
+def test_rio_handle_threads(data_folder):
+    import threading
+
+    handle = RioHandle(str(data_folder) + "/test.tif")
+
+    # every thread reads through its own dataset
+    barrier = threading.Barrier(2)
+    srcs = []
+
+    def use():
+        with handle.open() as src:
+            barrier.wait(5)
+            srcs.append(src)
+            assert src.read(1, window=((0, 10), (0, 20))).shape == (10, 20)
+            barrier.wait(5)
+
+    with ThreadPoolExecutor(2) as pool:
+        for f in [pool.submit(use) for _ in range(2)]:
+            f.result()
+    assert len(srcs) == 2 and srcs[0] is not srcs[1]
+
+    # closing leaves a dataset in use open until its thread is done with it
+    with handle.open() as src:
+        with handle.open() as nested:
+            assert nested is src
+        handle.close()
+        assert all(s.closed for s in srcs)
+        assert not src.closed
+        src.read(1, window=((0, 1), (0, 1)))
+    assert src.closed
+
+    # closed handle re-opens on next access
+    with handle.open() as src2:
+        assert not src2.closed and src2 is not src
+    handle.close()
+    assert src2.closed
+
+
+def test_handle_cache_evicts_outside_lock(data_folder, monkeypatch):
+    ctx = HandleCache(max_size=1)
+    closed = []
+
+    def close(handle):
+        assert not ctx._lock.locked()
+        closed.append(handle.uri)
+
+    monkeypatch.setattr(RioHandle, 'close', close)
+    ctx.get('a')
+    ctx.get('b')
+    assert closed == ['a']
+    assert ctx.stats() == HandleCacheStats(hits=0, misses=2, evictions=1, size=1)
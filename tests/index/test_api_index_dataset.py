@@ -4,7 +4,7 @@
 # SPDX-License-Identifier: Apache-2.0
 import datetime
 from collections import namedtuple
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
 from copy import deepcopy
 
 from uuid import UUID
@@ -159,6 +159,7 @@ class MockDb(object):
     def __init__(self):
         self.dataset = {}
         self.dataset_source = set()
+        self.locations = []
 
     @contextmanager
     def _connect(self):
@@ -197,6 +198,20 @@ class MockDb(object):
     def insert_dataset_source(self, classifier, dataset_id, source_dataset_id):
         self.dataset_source.add((classifier, dataset_id, source_dataset_id))
 
+    def insert_dataset_bulk(self, values):
+        for row in values:
+            self.insert_dataset(row['metadata'], row['id'], row['dataset_type_ref'])
+        return len(values), 0
+
+    def insert_dataset_location_bulk(self, values):
+        self.locations.extend((row['dataset_ref'], row['uri_scheme'], row['uri_body']) for row in values)
+        return len(values), 0
+
+    def insert_dataset_source_bulk(self, values):
+        for row in values:
+            self.insert_dataset_source(row['classifier'], row['dataset_ref'], row['source_dataset_ref'])
+        return len(values), 0
+
 
 class MockTypesResource:
     def __init__(self, type_):
@@ -224,6 +239,9 @@ class MockIndex:
     def thread_transaction(self):
         return None
 
+    def transaction(self):
+        return nullcontext()
+
     @contextmanager
     def _active_connection(self, transaction=False):
         yield self._db
@@ -281,3 +299,36 @@ def test_index_two_levels_already_ingested():
     dataset = datasets.add(_EXAMPLE_NBAR_DATASET)
     assert len(mock_db.dataset) == 3
     assert len(mock_db.dataset_source) == 2
+
+
+def test_bulk_add_datasets():
+    mock_db = MockDb()
+    mock_index = MockIndex(mock_db, _EXAMPLE_DATASET_TYPE)
+    datasets = DatasetResource(mock_db, mock_index)
+
+    # sources are added in the same batch, second copy of the dataset is skipped
+    status = datasets.bulk_add_datasets([_EXAMPLE_NBAR_DATASET, _EXAMPLE_NBAR_DATASET])
+    assert (status.completed, status.skipped) == (1, 1)
+    assert set(mock_db.dataset) == {_nbar_uuid, _ortho_uuid, _telemetry_uuid}
+    assert mock_db.dataset_source == {
+        ('ortho', _nbar_uuid, _ortho_uuid),
+        ('satellite_telemetry_data', _ortho_uuid, _telemetry_uuid)
+    }
+    # locations are recorded for the top-level dataset only
+    assert mock_db.locations == [(_nbar_uuid, 'file', '//test.zzz')]
+
+    status = datasets.bulk_add_datasets([_EXAMPLE_NBAR_DATASET])
+    assert (status.completed, status.skipped) == (0, 1)
+    assert len(mock_db.dataset) == 3
+
+
+def test_bulk_add_datasets_without_lineage():
+    mock_db = MockDb()
+    mock_index = MockIndex(mock_db, _EXAMPLE_DATASET_TYPE)
+    datasets = DatasetResource(mock_db, mock_index)
+    datasets.add(_EXAMPLE_NBAR_DATASET.sources['ortho'])
+
+    status = datasets.bulk_add_datasets([_EXAMPLE_NBAR_DATASET], with_lineage=False)
+    assert (status.completed, status.skipped) == (1, 0)
+    assert len(mock_db.dataset) == 3
+    assert len(mock_db.dataset_source) == 2
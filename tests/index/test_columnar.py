@@ -0,0 +1,96 @@
+# This file is part of the Open Data Cube, see https://opendatacube.org for more information
+#
+# Copyright (c) 2015-2024 ODC Contributors
+# SPDX-License-Identifier: Apache-2.0
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pandas as pd
+import pytest
+from psycopg2.extras import DateTimeTZRange, NumericRange
+
+from datacube.drivers.postgres._api import get_native_fields
+from datacube.index._columnar import rows_to_table
+from datacube.model import Range
+from datacube.model.fields import parse_search_field
+from datacube.utils.geometry import box
+
+
+def _sample_rows(n):
+    t0 = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    rows = []
+    for i in range(n):
+        t = t0.replace(day=i + 1)
+        rows.append((uuid4(),
+                     DateTimeTZRange(t, t.replace(hour=1)),
+                     NumericRange(Decimal(i), Decimal(i + 1)),
+                     box(i, 0, i + 1, 1, 'EPSG:4326') if i else None,
+                     'landsat-8',
+                     Decimal('0.5') * i))
+    return rows
+
+
+FIELDS = ('id', 'time', 'lat', 'extent', 'platform', 'cloud_cover')
+
+# 'extent' has no search field, it is kept as objects
+SEARCH_FIELDS = {
+    'id': get_native_fields()['id'],
+    'time': parse_search_field({'type': 'datetime-range', 'min_offset': [['t0']], 'max_offset': [['t1']]}),
+    'lat': parse_search_field({'type': 'double-range', 'min_offset': [['y0']], 'max_offset': [['y1']]}),
+    'platform': parse_search_field({'offset': ['platform']}),
+    'cloud_cover': parse_search_field({'type': 'double', 'offset': ['cloud_cover']}),
+}
+COLUMNS = ['id', 'time_begin', 'time_end', 'lat_begin', 'lat_end', 'extent', 'platform', 'cloud_cover']
+
+
+def test_rows_to_pandas():
+    rows = _sample_rows(5)
+    df = rows_to_table(FIELDS, [rows[:2], [], rows[2:]], SEARCH_FIELDS)
+
+    assert list(df.columns) == COLUMNS
+    assert len(df) == 5
+    assert df['id'].dtype == 'string'
+    assert list(df['id']) == [str(r[0]) for r in rows]
+    assert str(df['time_begin'].dtype) == 'datetime64[ns, UTC]'
+    assert df['time_end'][3] == pd.Timestamp('2020-01-04T01:00', tz='UTC')
+    assert list(df['lat_begin']) == [0, 1, 2, 3, 4]
+    assert df['lat_begin'].dtype == float
+    assert df['extent'][0] is None
+    assert df['extent'][1] == box(1, 0, 2, 1, 'EPSG:4326').geom.wkb
+    assert df['cloud_cover'].dtype == float
+
+    # Index Range values are split too
+    df = rows_to_table(('time',), [[(Range(rows[0][1].lower, None),)]], SEARCH_FIELDS)
+    assert list(df.columns) == ['time_begin', 'time_end']
+
+    # Columns and types come from the fields, not from the values of a batch
+    df = rows_to_table(FIELDS, [[(None,) * len(FIELDS)], rows[:1]], SEARCH_FIELDS)
+    assert list(df.columns) == COLUMNS
+    assert str(df['time_begin'].dtype) == 'datetime64[ns, UTC]'
+    assert df['lat_end'].dtype == float
+
+    empty = rows_to_table(FIELDS, [], SEARCH_FIELDS)
+    assert list(empty.columns) == COLUMNS and len(empty) == 0
+    assert str(empty['time_begin'].dtype) == 'datetime64[ns, UTC]'
+    assert empty['id'].dtype == 'string'
+
+    with pytest.raises(ValueError):
+        rows_to_table(FIELDS, [rows], SEARCH_FIELDS, output='excel')
+
+
+def test_rows_to_arrow():
+    pa = pytest.importorskip('pyarrow')
+    rows = _sample_rows(5)
+    table = rows_to_table(FIELDS, [rows[:2], rows[2:]], SEARCH_FIELDS, output='arrow')
+
+    assert table.num_rows == 5
+    assert table.schema.field('time_begin').type == pa.timestamp('us', tz='UTC')
+    assert table.column('lat_end').to_pylist() == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert table.column('extent').type == pa.binary()
+    assert table.column('cloud_cover').type == pa.float64()
+
+    empty = rows_to_table(FIELDS, [], SEARCH_FIELDS, output='arrow')
+    assert empty.column_names == COLUMNS
+    assert empty.schema.field('time_end').type == pa.timestamp('us', tz='UTC')
+    assert empty.schema.field('id').type == table.schema.field('id').type
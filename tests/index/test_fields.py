@@ -122,3 +122,27 @@ def test_get_range_field():
     assert isinstance(field, RangeDocField)
     extracted = field.extract({'extents': {'geospatial_lat_min': 2, 'geospatial_lat_max': 4}})
     assert extracted == Range(begin=2, end=4)
+
+
+@pytest.mark.parametrize('metadata_type_name', ['eo3', 'eo'])
+def test_search_query_compiled_cache_key(metadata_type_name):
+    from datetime import datetime
+    from datacube.drivers.postgres._api import PostgresDbAPI, get_dataset_fields
+    from datacube.index import fields
+    from datacube.index.abstract import default_metadata_type_docs
+
+    mdt, = [d for d in default_metadata_type_docs() if d['name'] == metadata_type_name]
+    dataset_fields = get_dataset_fields(mdt)
+
+    def cache_key(day, lat, **query):
+        exprs = fields.to_expressions(dataset_fields.get,
+                                      time=Range(datetime(2020, 1, day), datetime(2020, 2, 1)),
+                                      lat=Range(lat, lat + 10),
+                                      dataset_type_id=3,
+                                      **query)
+        return PostgresDbAPI.search_datasets_query(tuple(exprs), limit=10)._generate_cache_key()
+
+    # Same shaped searches share compiled SQL, different shapes don't
+    assert cache_key(1, -30) is not None
+    assert cache_key(1, -30) == cache_key(2, -20)
+    assert cache_key(1, -30) != cache_key(1, -30, platform='landsat-8')
@@ -0,0 +1,57 @@
+# This file is part of the Open Data Cube, see https://opendatacube.org for more information
+#
+# Copyright (c) 2015-2024 ODC Contributors
+# SPDX-License-Identifier: Apache-2.0
+from sqlalchemy import create_engine, text
+
+from datacube.index._instrument import QueryStats, record_queries, execute_instrumented, materialise, \
+    current_query_stats
+
+
+def test_query_stats():
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn:
+        # Not recording: plain results
+        assert current_query_stats() is None
+        assert not hasattr(execute_instrumented(conn, text("select 1"), "one"), "query_event")
+
+        stats = QueryStats()
+        with record_queries(stats) as s:
+            assert s is stats and current_query_stats() is stats
+            inner = QueryStats()
+            with record_queries(inner):
+                assert execute_instrumented(conn, text("select 1"), "one").scalar() == 1
+            assert current_query_stats() is stats
+
+            rows = execute_instrumented(conn, text("select 1 union select 2 union select 3"), "three")
+            assert list(materialise(rows, lambda row: row[0] * 10)) == [10, 20, 30]
+            assert execute_instrumented(conn, text("select 4"), "one").scalar() == 4
+        assert current_query_stats() is None
+
+    assert [ev.operation for ev in inner.events] == ["one"]
+    assert [ev.operation for ev in stats.events] == ["three", "one"]
+    ev = stats.events[0]
+    assert ev.rows == 3
+    assert ev.sql == "select 1 union select 2 union select 3"
+    assert ev.db_seconds > 0
+    assert ev.python_seconds > 0
+    assert ev.explain is None
+
+    summary = stats.summary()
+    assert set(summary) == {"one", "three"}
+    assert summary["three"]["calls"] == 1
+    assert summary["three"]["rows"] == 3
+    assert "three" in str(stats)
+
+
+def test_query_stats_compiled_cache():
+    engine = create_engine("sqlite://")
+    stats = QueryStats()
+    with engine.connect() as conn, record_queries(stats):
+        for x in range(3):
+            execute_instrumented(conn, text("select :x").bindparams(x=x), "x").scalar()
+
+    assert [ev.compiled_cache for ev in stats.events] == ['miss', 'hit', 'hit']
+    assert stats.summary()['x']['compiled_cache_hits'] == 2
+    assert stats.compiled_cache_hit_rate == 2 / 3
+    assert QueryStats().compiled_cache_hit_rate is None
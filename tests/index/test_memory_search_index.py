@@ -0,0 +1,114 @@
+# This file is part of the Open Data Cube, see https://opendatacube.org for more information
+#
+# Copyright (c) 2015-2024 ODC Contributors
+# SPDX-License-Identifier: Apache-2.0
+import datetime
+import random
+from uuid import uuid4
+
+import pytest
+
+from datacube.index import fields
+from datacube.index.memory._search_index import ProductSearchIndex
+from datacube.model import Range, Not
+from datacube.model.fields import get_dataset_fields
+
+METADATA = {
+    'dataset': {
+        'search_fields': {
+            'platform': {'offset': ['platform']},
+            'cloud': {'type': 'double', 'offset': ['cloud']},
+            'time': {'type': 'datetime-range', 'min_offset': [['t0']], 'max_offset': [['t1']]},
+            'lat': {'type': 'double-range', 'min_offset': [['y0']], 'max_offset': [['y1']]},
+            'lon': {'type': 'double-range', 'min_offset': [['x0']], 'max_offset': [['x1']]},
+        }
+    }
+}
+FIELDS = get_dataset_fields(METADATA)
+T0 = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def _doc(rnd, i):
+    x, y = rnd.uniform(100, 150), rnd.uniform(-40, -10)
+    start = T0 + datetime.timedelta(hours=rnd.randint(0, 24 * 365))
+    doc = dict(platform=rnd.choice(['landsat-8', 'landsat-9', 'sentinel-2a']),
+               cloud=rnd.uniform(0, 100),
+               t0=start.isoformat(), t1=(start + datetime.timedelta(minutes=rnd.randint(0, 90))).isoformat(),
+               x0=x, x1=x + 1, y0=y, y1=y + 1)
+    if i % 50 == 0:
+        del doc['t1'], doc['y0']
+    return doc
+
+
+@pytest.fixture
+def indexed():
+    rnd = random.Random(42)
+    index = ProductSearchIndex()
+    docs = {}
+    for i in range(500):
+        id_ = uuid4()
+        docs[id_] = _doc(rnd, i)
+        index.add(id_, docs[id_])
+    return index, docs
+
+
+def _check(index, docs, **query):
+    exprs = fields.to_expressions(FIELDS.get, **query)
+    expected = [id_ for id_, doc in docs.items() if all(e.evaluate(doc) for e in exprs)]
+    candidates = index.candidates(exprs)
+    found = [id_ for id_ in candidates if all(e.evaluate(docs[id_]) for e in exprs)]
+    assert found == expected
+    return candidates, expected
+
+
+QUERIES = [
+    dict(platform='landsat-8'),
+    dict(platform=['landsat-8', 'sentinel-2a']),
+    dict(platform=Not('landsat-8')),
+    dict(time=Range(T0 + datetime.timedelta(days=30), T0 + datetime.timedelta(days=37))),
+    dict(time=Range(None, T0 + datetime.timedelta(days=3))),
+    dict(lat=Range(-30, -25), lon=Range(120, 125)),
+    dict(lat=Range(-30, -25)),
+    dict(lat=Range(-30, -25), lon=Range(120, 125), platform='landsat-9',
+         time=Range(T0, T0 + datetime.timedelta(days=100))),
+    dict(cloud=Range(10, 20)),
+]
+
+
+@pytest.mark.parametrize('query', QUERIES)
+def test_candidates_match_full_scan(indexed, query):
+    index, docs = indexed
+    candidates, _ = _check(index, docs, **query)
+    if 'platform' not in query or not isinstance(query['platform'], Not):
+        if 'cloud' not in query:
+            # Narrowed down by an index
+            assert len(candidates) < len(docs)
+
+
+def test_index_maintenance(indexed):
+    index, docs = indexed
+    query = dict(lat=Range(-30, -25), lon=Range(120, 125), time=Range(T0, T0 + datetime.timedelta(days=200)))
+    # Build all indexes, then change things underneath them
+    _check(index, docs, platform='landsat-8', **query)
+
+    rnd = random.Random(7)
+    ids = list(docs)
+    for id_ in ids[:100]:
+        index.remove(id_)
+        del docs[id_]
+    # Few enough changes that the STRtree is not rebuilt yet
+    _check(index, docs, **query)
+    for id_ in ids[100:200]:
+        # Update in place: keeps its position in the order
+        docs[id_] = _doc(rnd, 1)
+        index.add(id_, docs[id_])
+    for i in range(100):
+        id_ = uuid4()
+        docs[id_] = _doc(rnd, i)
+        index.add(id_, docs[id_])
+
+    assert len(index) == len(docs)
+    _check(index, docs, platform='landsat-8', **query)
+    _check(index, docs, **query)
+    _check(index, docs, platform='sentinel-2a')
+    assert index.candidates([]) == list(docs)
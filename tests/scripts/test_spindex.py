@@ -0,0 +1,101 @@
+# This file is part of the Open Data Cube, see https://opendatacube.org for more information
+#
+# Copyright (c) 2015-2024 ODC Contributors
+# SPDX-License-Identifier: Apache-2.0
+from types import SimpleNamespace
+
+import pytest
+from click.testing import CliRunner
+
+from datacube.scripts.cli_app import cli
+from datacube.utils.geometry import CRS
+
+
+class FakeIndex:
+    def __init__(self, product_names, fail_on=None):
+        self.products = SimpleNamespace(get_all=lambda: [SimpleNamespace(name=name) for name in product_names])
+        self.fail_on = fail_on
+        self.calls = []
+
+    def spatial_indexes(self, refresh=False):
+        return [CRS('EPSG:4326')]
+
+    def update_spatial_index(self, crses=[], product_names=[], dataset_ids=[], batch_size=1000,
+                             progress_cbk=None):
+        self.calls.append((crses, product_names, batch_size))
+        for name in product_names:
+            if name == self.fail_on:
+                raise RuntimeError('database went away')
+            progress_cbk(name, 3)
+        return 3*len(product_names)
+
+    def update_search_index(self, product_names=[], dataset_ids=[], batch_size=1000, progress_cbk=None):
+        self.calls.append((product_names, batch_size))
+        for name in product_names:
+            if name == self.fail_on:
+                raise RuntimeError('database went away')
+            progress_cbk(name, 2)
+        return 2*len(product_names)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def run_spindex(monkeypatch, tmp_path):
+    config = tmp_path/'datacube.conf'
+    config.write_text('[datacube]\nindex_driver: memory\n')
+
+    def _run(fake_index, *args):
+        monkeypatch.setattr('datacube.ui.click.index_connect', lambda *a, **kw: fake_index)
+        return CliRunner().invoke(cli, ['--config', str(config), 'spindex', *args])
+    return _run
+
+
+def test_spindex_update(run_spindex):
+    index = FakeIndex(['wo', 'ls8', 'ls9'])
+    result = run_spindex(index, 'update', 'EPSG:3577', '--batch-size', '10')
+    assert result.exit_code == 0, result.output
+    assert index.calls == [([CRS('EPSG:3577')], ['ls8', 'ls9', 'wo'], 10)]
+    assert 'ls9: 3 entries' in result.output
+    assert 'Updated 9 spatial index entries for 3 products' in result.output
+
+    index = FakeIndex(['wo', 'ls8', 'ls9'])
+    result = run_spindex(index, 'update', '--start-from', 'ls9')
+    assert result.exit_code == 0, result.output
+    assert index.calls == [([], ['ls9', 'wo'], 1000)]
+
+    index = FakeIndex(['wo', 'ls8', 'ls9'])
+    result = run_spindex(index, 'update', '-p', 'wo', '-p', 'ls8', '--start-from', 'ls9')
+    assert result.exit_code == 0, result.output
+    assert index.calls == [([], ['wo'], 1000)]
+
+    result = run_spindex(FakeIndex(['ls8']), 'update', '--start-from', 'wo')
+    assert result.exit_code == 0, result.output
+    assert 'No products to update' in result.output
+
+
+def test_spindex_update_resume_hint(run_spindex):
+    result = run_spindex(FakeIndex(['wo', 'ls8', 'ls9'], fail_on='ls9'), 'update')
+    assert result.exit_code == 1
+    assert 'resume with --start-from ls9' in result.output
+
+
+def test_spindex_update_bad_crs(run_spindex):
+    result = run_spindex(FakeIndex(['ls8']), 'update', 'not-a-crs')
+    assert result.exit_code == 2
+
+
+def test_spindex_update_search(run_spindex):
+    index = FakeIndex(['wo', 'ls8', 'ls9'])
+    result = run_spindex(index, 'update-search', '--batch-size', '10')
+    assert result.exit_code == 0, result.output
+    assert index.calls == [(['ls8', 'ls9', 'wo'], 10)]
+    assert 'ls9: 2 datasets' in result.output
+    assert 'Updated search fields of 6 datasets for 3 products' in result.output
+
+    index = FakeIndex(['wo', 'ls8', 'ls9'], fail_on='wo')
+    result = run_spindex(index, 'update-search', '--start-from', 'ls9')
+    assert result.exit_code == 1
+    assert index.calls == [(['ls9', 'wo'], 1000)]
+    assert 'resume with --start-from wo' in result.output
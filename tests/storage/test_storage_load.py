@@ -81,3 +81,37 @@ def test_new_xr_load(data_folder):
 
     np.testing.assert_array_equal(im[0], xx.a.values[0])
     np.testing.assert_array_equal(im[1], xx.b.values[0])
+
+
+def test_new_xr_load_pipelined(data_folder):
+    from datacube.drivers.rio._reader import RDEntry
+
+    base = "file://" + str(data_folder) + "/metadata.yml"
+    rdr = RDEntry().new_instance({'max_workers': 4})
+
+    im, meta = rio_slurp(str(data_folder) + '/test.tif')
+    dss = [mk_sample_dataset([dict(name='a', path='test.tif', band=band)], base)
+           for band in (1, 2, 1)]
+    sources = Datacube.group_datasets(dss, 'time')
+
+    # non-commutative fuser: records the order datasets were fused in
+    fused = []
+
+    def last_wins(dst, src):
+        fused.append(src.sum())
+        dst[:] = src
+
+    band_sums = {b: im[b - 1].sum() for b in (1, 2)}
+    assert band_sums[1] != band_sums[2]
+    expect = [band_sums[ds.measurements['a']['band']] for ds in sources.values[0]]
+
+    measurements = [dss[0].product.measurements['a']]
+    measurements[0]['fuser'] = last_wins
+
+    for max_in_flight in (1, 2, 8):
+        fused = []
+        xx, ctx = xr_load(sources, meta.gbox, measurements, rdr, max_in_flight=max_in_flight)
+        assert xx.a.shape == (1,) + im[0].shape
+        assert fused == expect
+        np.testing.assert_array_equal(im[sources.values[0][-1].measurements['a']['band'] - 1],
+                                      xx.a.values[0])
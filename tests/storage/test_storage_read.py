@@ -3,13 +3,16 @@
 # Copyright (c) 2015-2024 ODC Contributors
 # SPDX-License-Identifier: Apache-2.0
 from affine import Affine
+import logging
 import numpy as np
+import pytest
 
 from datacube.storage._read import (
     can_paste,
     read_time_slice,
     read_time_slice_v2,
     pick_read_scale,
+    pick_overview,
     rdr_geobox)
 
 from datacube.testutils.io import RasterFileDataSource
@@ -38,6 +41,38 @@ def test_pick_read_scale():
     assert pick_read_scale(2.3) == 2
     assert pick_read_scale(1.99999) == 2
 
+    class FakeReader:
+        overviews = (2, 4, 8)
+
+    rdr = FakeReader()
+    assert pick_read_scale(7.3, rdr) == 7
+    assert pick_read_scale(7.3, rdr, overview_mode='nearest-finer') == 4
+    assert pick_read_scale(7.3, rdr, overview_mode='nearest') == 8
+    assert pick_read_scale(7.3, rdr, overview_mode='off') == 1
+    assert pick_read_scale(0.5, rdr, overview_mode='nearest') == 1
+    assert pick_read_scale(7.3, None, overview_mode='nearest') == 7
+
+    with pytest.raises(ValueError):
+        pick_read_scale(2, rdr, overview_mode='no-such-mode')
+
+
+def test_pick_overview():
+    assert pick_overview(3, ()) is None
+    assert pick_overview(1.5, (2, 4)) is None
+    assert pick_overview(1.5, (2, 4), 'nearest') == 2
+    assert pick_overview(1.3, (2, 4), 'nearest') is None
+    assert pick_overview(3.99999, (2, 4)) == 4
+    assert pick_overview(100, (4, 2, 8)) == 8
+    assert pick_overview(5, (2, 4, 8), 'nearest') == 4
+    assert pick_overview(6, (2, 4, 8), 'nearest') == 8
+    # modes differ: 4 is the coarsest overview finer than 7, 8 is closest to it
+    assert pick_overview(7, (2, 4, 8)) == 4
+    assert pick_overview(7, (2, 4, 8), 'nearest-finer') == 4
+    assert pick_overview(7, (2, 4, 8), 'nearest') == 8
+
+    with pytest.raises(ValueError):
+        pick_overview(3, (2,), 'off')
+
 
 def test_can_paste():
     src = AlbersGS.tile_geobox((17, -40))
@@ -362,3 +397,124 @@ def test_read_with_reproject_v2(tmpdir):
     nvalid = (yy != -999).sum()
     nempty = (yy == -999).sum()
     assert nvalid > nempty
+
+
+def test_read_from_overviews(tmpdir, caplog):
+    from datacube.testutils import mk_test_image
+    from datacube.testutils.io import write_gtiff
+    from pathlib import Path
+    import rasterio
+    from rasterio.enums import Resampling as RioResampling
+
+    pp = Path(str(tmpdir))
+    xx = mk_test_image(256, 256, nodata=None)
+    mm = write_gtiff(pp/'tst-read-overviews-256x256-int16.tif', xx, nodata=-999)
+
+    with rasterio.open(str(mm.path), 'r+') as f:
+        f.build_overviews([2, 4, 8], RioResampling.average)
+
+    def _read(overview_mode, scale=4.3):
+        gbox = gbx.zoom_out(mm.gbox, scale)
+        with RasterFileDataSource(mm.path, 1).open() as rdr:
+            assert rdr.overviews == (2, 4, 8)
+            yy = np.full(gbox.shape, -999, dtype=rdr.dtype)
+            scales = []
+            caplog.clear()
+            with caplog.at_level(logging.DEBUG, logger='datacube.storage._read'):
+                read_time_slice(rdr, yy, gbox, 'nearest', -999, overview_mode=overview_mode,
+                                read_scale_cbk=scales.append)
+            assert len(scales) == 1
+            return yy, caplog.messages[-1], scales[0]
+
+    yy, msg, scale = _read('nearest-finer')
+    assert msg.endswith('with shrink factor 4: overview level 1')
+    assert scale == 4
+
+    yy, msg, scale = _read('nearest')
+    assert msg.endswith('with shrink factor 4: overview level 1')
+    assert scale == 4
+
+    yy, msg, scale = _read('auto')
+    assert msg.endswith('with shrink factor 4: overview level 1')
+    assert scale == 4
+
+    yy_full, msg, scale = _read('off')
+    assert msg.endswith('with shrink factor 1: full resolution')
+    assert scale == 1
+    assert yy_full.shape == yy.shape
+
+    # nearest-finer and nearest pick different overviews
+    _, msg, scale = _read('nearest-finer', 7)
+    assert msg.endswith('with shrink factor 4: overview level 1')
+    assert scale == 4
+
+    _, msg, scale = _read('nearest', 7)
+    assert msg.endswith('with shrink factor 8: overview level 2')
+    assert scale == 8
+
+    _, msg, scale = _read('auto', 7)
+    assert msg.endswith('with shrink factor 7: overview level chosen by GDAL')
+    assert scale == 7
+
+
+def test_read_nd(tmpdir):
+    from datacube.testutils import mk_test_image
+    from datacube.testutils.io import write_gtiff
+    from datacube.storage import reproject_and_fuse
+    from pathlib import Path
+
+    pp = Path(str(tmpdir))
+    xx = np.stack([mk_test_image(128, 64, nodata=None) + i for i in range(5)]).astype('int16')
+    mm = write_gtiff(pp/'tst-read-nd-5x128x64-int16.tif', xx, nodata=-999)
+    assert mm.count == 5
+
+    class LayerAtATime:
+        """ Reader without native nD read support """
+        def __init__(self, rdr):
+            self._rdr = rdr
+            self.n_reads = 0
+
+        def __getattr__(self, name):
+            return getattr(self._rdr, name)
+
+        supports_nd_read = False
+
+        def read(self, window=None, out_shape=None):
+            assert not isinstance(window[0], slice)
+            self.n_reads += 1
+            return self._rdr.read(window, out_shape)
+
+    def _read(gbox, extra_dim_index, wrap=False, resampling='nearest'):
+        with RasterFileDataSource(mm.path, 1).open() as rdr:
+            if wrap:
+                rdr = LayerAtATime(rdr)
+            yy = np.full((3,) + gbox.shape, -999, dtype='int16')
+            roi = read_time_slice(rdr, yy, gbox, resampling, -999, extra_dim_index)
+            return yy, roi, rdr
+
+    # paste
+    yy, roi, _ = _read(mm.gbox, slice(1, 4))
+    assert roi == np.s_[0:64, 0:128]
+    np.testing.assert_array_equal(xx[1:4], yy)
+
+    yy, roi, rdr = _read(gbx.flipy(mm.gbox), slice(2, 5), wrap=True)
+    assert rdr.n_reads == 3
+    np.testing.assert_array_equal(xx[2:5, ::-1, :], yy)
+
+    # reproject: each layer same as a single layer read
+    gbox = gbx.zoom_out(mm.gbox, 1.3)
+    yy, roi, _ = _read(gbox, slice(1, 4), resampling='average')
+    yy_, _, _ = _read(gbox, slice(1, 4), resampling='average', wrap=True)
+    np.testing.assert_array_equal(yy, yy_)
+
+    for i in range(3):
+        with RasterFileDataSource(mm.path, 2 + i).open() as rdr:
+            zz = np.full(gbox.shape, -999, dtype='int16')
+            read_time_slice(rdr, zz, gbox, 'average', -999)
+        np.testing.assert_array_equal(zz, yy[i])
+
+    # fuse from several sources in one go
+    dst = np.full((2,) + mm.gbox.shape, -999, dtype='int16')
+    srcs = [RasterFileDataSource(mm.path, 1), RasterFileDataSource(mm.path, 1)]
+    reproject_and_fuse(srcs, dst, mm.gbox, -999, extra_dim_index=slice(3, 5))
+    np.testing.assert_array_equal(xx[3:5], dst)
@@ -175,6 +175,17 @@ def test_gbox_tiles():
 
     assert list(tt.tiles(gbox[:h, :w].extent)) == [(0, 0)]
 
+    # many polygons at once, tiles only touching a polygon are not included
+    polys = [gbox.extent, gbox[:h, :w].extent, gbox[3:5, 7:12].extent.to_crs('epsg:4326')]
+    ipoly, idx = tt.tiles_incidence(polys)
+    assert idx.shape == (len(ipoly), 2)
+    assert ipoly.tolist() == [0]*6 + [1, 2, 2]
+    assert [tuple(i) for i in idx[:6].tolist()] == list(tt.tiles(gbox.extent))
+    assert idx[6:].tolist() == [[0, 0], [0, 0], [0, 1]]
+
+    ipoly, idx = tt.tiles_incidence([])
+    assert ipoly.shape == (0,) and idx.shape == (0, 2)
+
     (H, W) = (11, 22)
     (h, w) = (10, 20)
     tt = gbx.GeoboxTiles(GeoBox(W, H, A, epsg3857), (h, w))
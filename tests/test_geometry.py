@@ -1343,6 +1343,33 @@ def test_compute_reproject_roi():
     assert roi_shape(rr.roi_dst) == src[roi_].shape
 
 
+def test_compute_reproject_roi_cache():
+    from datacube.utils.geometry import reproject_roi_cache_info, reproject_roi_cache_clear
+
+    src = AlbersGS.tile_geobox((15, -40))
+    dst = src[113:-100, 33:-10]
+
+    reproject_roi_cache_clear()
+    assert reproject_roi_cache_info().currsize == 0
+
+    rr = compute_reproject_roi(src, dst)
+    rr.roi_src = None  # callers get their own copy
+    for _ in range(3):
+        rr_ = compute_reproject_roi(src, GeoBox(dst.width, dst.height, dst.affine, dst.crs))
+        assert rr_.roi_src == np.s_[113:src.height-100, 33:src.width-10]
+
+    info = reproject_roi_cache_info()
+    assert info.hits == 3
+    assert info.misses == 1
+    assert info.currsize == 1
+
+    compute_reproject_roi(src, dst, padding=1)
+    assert reproject_roi_cache_info().misses == 2
+
+    reproject_roi_cache_clear()
+    assert reproject_roi_cache_info().currsize == 0
+
+
 def test_compute_reproject_roi_issue647():
     """ In some scenarios non-overlapping geoboxes will result in non-empty
     `roi_dst` even though `roi_src` is empty.
@@ -1477,6 +1504,60 @@ def test_crs_hash():
     assert len(set([crs, crs2])) == 1
 
 
+def test_crs_cache():
+    from concurrent.futures import ThreadPoolExecutor
+    from datacube.utils.geometry import crs_cache_info, crs_cache_clear
+
+    crs_cache_clear()
+    assert all(info.hits == info.misses == 0 for info in crs_cache_info().values())
+
+    a, b = CRS("epsg:3577"), CRS("EPSG:3577")
+    assert crs_cache_info()['crs'].hits == 1
+    assert a.proj is b.proj
+
+    # equality of CRSs without EPSG code is computed once
+    wkt = CRS(SAMPLE_WKT_WITHOUT_AUTHORITY)
+    wkt_ = CRS(wkt.proj.to_json())
+    for _ in range(3):
+        assert wkt != CRS("epsg:4326")
+        assert (wkt == wkt_) is (wkt.proj == wkt_.proj)
+    assert crs_cache_info()['equality'].currsize == 2
+
+    # transformers are per thread
+    def to_4326(x):
+        return a.transformer_to_crs(CRS("epsg:4326"))(x, -x)
+
+    for _ in range(3):
+        to_4326(1.0)
+    info = crs_cache_info()['transformer']
+    assert (info.hits, info.misses, info.currsize) == (2, 1, 1)
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pool.submit(to_4326, 1.0).result()
+    assert crs_cache_info()['transformer'].misses == 2
+
+    crs_cache_clear()
+    info = crs_cache_info()
+    assert info['crs'].currsize == info['transformer'].currsize == 0
+    assert CRS("epsg:3577") == a
+
+
+def test_intern_crs():
+    from datacube.utils.geometry import intern_crs, crs_cache_info, crs_cache_clear
+
+    crs_cache_clear()
+    a = intern_crs("EPSG:3577")
+    assert a is intern_crs("EPSG:3577")
+    assert a == CRS("epsg:3577")
+    assert intern_crs(SAMPLE_WKT_WITHOUT_AUTHORITY) is intern_crs(SAMPLE_WKT_WITHOUT_AUTHORITY)
+    info = crs_cache_info()['interned']
+    assert (info.hits, info.misses, info.currsize) == (2, 2, 2)
+
+    with pytest.raises(geometry.CRSError):
+        intern_crs("no such crs")
+    assert crs_cache_info()['interned'].currsize == 2
+
+
 def test_base_internals():
     assert _make_crs_key("epsg:3577") == "EPSG:3577"
     no_epsg_crs = CRS(SAMPLE_WKT_WITHOUT_AUTHORITY)
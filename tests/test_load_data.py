@@ -6,6 +6,7 @@ from datacube import Datacube
 from datacube.api.query import query_group_by
 import numpy as np
 from types import SimpleNamespace
+import uuid
 import pytest
 
 from pathlib import Path
@@ -211,6 +212,133 @@ def test_load_data_cbk(tmpdir):
     assert progress_call_data == [(1, 4), (2, 4)]
 
 
+def test_load_data_concurrent(tmpdir):
+    from datacube.api import TerminateCurrentLoad
+
+    tmpdir = Path(str(tmpdir))
+
+    spatial = dict(resolution=(15, -15),
+                   offset=(11230, 1381110),)
+
+    nodata = -999
+    aa = mk_test_image(96, 64, 'int16', nodata=nodata)
+
+    bands = [SimpleNamespace(name=name, values=aa, nodata=nodata)
+             for name in ['aa', 'bb']]
+
+    ds1, gbox = gen_tiff_dataset(bands, tmpdir, prefix='ds1-', timestamp='2018-07-19', **spatial)
+    ds2, _ = gen_tiff_dataset(bands, tmpdir, prefix='ds2-', timestamp='2018-07-19', **spatial)
+    ds3, _ = gen_tiff_dataset(bands, tmpdir, prefix='ds3-', timestamp='2018-07-20', **spatial)
+    dss = [ds1, ds2, ds3]
+
+    sources = Datacube.group_datasets(dss, 'time')
+    mm = dss[0].product.measurements
+
+    def custom_fuser(dest, delta):
+        dest[:] += delta
+
+    expect = Datacube.load_data(sources, gbox, mm, fuse_func=custom_fuser)
+
+    progress_call_data = []
+
+    def progress_cbk(n, nt):
+        progress_call_data.append((n, nt))
+
+    ds_data = Datacube.load_data(sources, gbox, mm, fuse_func=custom_fuser,
+                                 progress_cbk=progress_cbk,
+                                 max_concurrent_reads=4)
+
+    assert 'dc_partial_load' not in ds_data.attrs
+    assert progress_call_data == [(n, 6) for n in range(1, 7)]
+    np.testing.assert_array_equal(expect.aa.values, ds_data.aa.values)
+    np.testing.assert_array_equal(expect.bb.values, ds_data.bb.values)
+    np.testing.assert_array_equal(nodata + aa + aa, ds_data.aa.values[0])
+    np.testing.assert_array_equal(aa, ds_data.bb.values[1])
+
+    def progress_cbk_fail_early(n, nt):
+        progress_call_data.append((n, nt))
+        raise TerminateCurrentLoad()
+
+    progress_call_data = []
+    ds_data = Datacube.load_data(sources, gbox, mm,
+                                 progress_cbk=progress_cbk_fail_early,
+                                 max_concurrent_reads=2)
+
+    assert ds_data.dc_partial_load is True
+    assert progress_call_data[0] == (1, 6)
+    assert len(progress_call_data) <= 2
+
+
+def test_load_data_compact(tmpdir):
+    from datacube.model import CompactDataset
+
+    tmpdir = Path(str(tmpdir))
+
+    spatial = dict(resolution=(15, -15),
+                   offset=(11230, 1381110),)
+
+    nodata = -999
+    aa = mk_test_image(96, 64, 'int16', nodata=nodata)
+
+    bands = [SimpleNamespace(name=name, values=aa, nodata=nodata)
+             for name in ['aa', 'bb']]
+
+    ds1, gbox = gen_tiff_dataset(bands, tmpdir, prefix='ds1-', timestamp='2018-07-19', **spatial)
+    ds2, _ = gen_tiff_dataset(bands, tmpdir, prefix='ds2-', timestamp='2018-07-20', **spatial)
+    ds2.metadata_doc['id'] = str(uuid.uuid4())
+    by_id = {ds.id: ds for ds in (ds1, ds2)}
+    mm = ds1.product.measurements
+    expect = Datacube.load_data(Datacube.group_datasets([ds1, ds2], 'time'), gbox, mm)
+
+    for dask_chunks in (None, {'x': 32, 'y': 32}):
+        calls = []
+
+        def loader(ids):
+            calls.append(list(ids))
+            return [by_id[id_] for id_ in ids]
+
+        dss = [CompactDataset.from_dataset(ds, loader=loader) for ds in (ds1, ds2)]
+        sources = Datacube.group_datasets(dss, 'time')
+        assert calls == []
+
+        xx = Datacube.load_data(sources, gbox, mm, dask_chunks=dask_chunks)
+        assert calls == [[ds1.id, ds2.id]]
+        np.testing.assert_array_equal(expect.aa.values, xx.aa.values)
+        np.testing.assert_array_equal(expect.bb.values, xx.bb.values)
+
+
+def test_load_data_read_scale(tmpdir):
+    import rasterio
+    from rasterio.enums import Resampling as RioResampling
+    from datacube.api.core import per_band_load_data_settings
+    from datacube.utils.geometry import gbox as gbx
+
+    tmpdir = Path(str(tmpdir))
+    nodata = -999
+    aa = mk_test_image(256, 256, 'int16', nodata=nodata)
+    bands = [SimpleNamespace(name=name, values=aa, nodata=nodata)
+             for name in ['aa', 'bb', 'cc']]
+    ds, gbox = gen_tiff_dataset(bands, tmpdir, prefix='ds1-', timestamp='2018-07-19',
+                                resolution=(15, -15), offset=(11230, 1381110))
+    for name in ['aa', 'bb', 'cc']:
+        with rasterio.open(str(tmpdir/f'ds1-{name}.tiff'), 'r+') as f:
+            f.build_overviews([2, 4, 8], RioResampling.average)
+
+    sources = Datacube.group_datasets([ds], 'time')
+    mm = per_band_load_data_settings(ds.product.measurements,
+                                     overview_mode={'aa': 'nearest-finer', 'bb': 'nearest', 'cc': 'off'})
+
+    for max_concurrent_reads in (None, 3):
+        xx = Datacube.load_data(sources, gbx.zoom_out(gbox, 7), mm, max_concurrent_reads=max_concurrent_reads)
+        assert xx.aa.dc_read_scale == (4,)
+        assert xx.bb.dc_read_scale == (8,)
+        assert xx.cc.dc_read_scale == (1,)
+
+    # nothing to read
+    xx = Datacube.load_data(sources, gbx.translate_pix(gbox, 1000, 1000), mm)
+    assert 'dc_read_scale' not in xx.aa.attrs
+
+
 def test_hdf5_lock_release_on_failure():
     from datacube.storage._rio import RasterDatasetDataSource, HDF5_LOCK
     from datacube.storage import BandInfo
@@ -396,3 +524,247 @@ def test_native_load(tmpdir):
     xx = native_load(ds, ['cc'])
     assert xx.geobox == gbox_cc
     np.testing.assert_array_equal(cc, xx.isel(time=0).cc.values)
+
+
+def test_dask_chunks_auto_native(tmpdir, caplog):
+    import dask
+    from datacube.api.core import _calculate_chunk_sizes
+    from datacube.utils.geometry import gbox as gbx
+
+    tmpdir = Path(str(tmpdir))
+    spatial = dict(resolution=(15, -15),
+                   offset=(11230, 1381110),)
+
+    nodata = -999
+    aa = mk_test_image(512, 256, 'int16', nodata=nodata)
+
+    ds, gbox = gen_tiff_dataset([SimpleNamespace(name='aa', values=aa, nodata=nodata)],
+                                tmpdir,
+                                prefix='ds1-',
+                                timestamp='2018-07-19',
+                                blocksize=32,
+                                **spatial)
+    sources = Datacube.group_datasets([ds], 'time')
+    mm = [ds.product.measurements['aa']]
+
+    # 32x32 int16 tiles: 2KiB, budget allows for 4x4 tiles per chunk
+    with dask.config.set({'array.chunk-size': '33KiB'}):
+        assert _calculate_chunk_sizes(sources, gbox, 'auto-native', measurements=mm) == ((1,), (128, 128))
+        assert _calculate_chunk_sizes(sources, gbox, {'x': 'auto-native'}, measurements=mm) == ((1,), (256, 128))
+
+        # output at half the resolution: each source tile covers 16x16 output pixels
+        gbox2 = gbx.zoom_out(gbox, 2)
+        assert _calculate_chunk_sizes(sources, gbox2, 'auto-native', measurements=mm) == ((1,), (128, 128))
+
+    # chunks are clamped to the output shape
+    assert _calculate_chunk_sizes(sources, gbox, 'auto-native', measurements=mm) == ((1,), (256, 512))
+
+    with pytest.raises(ValueError):
+        _calculate_chunk_sizes(sources, gbox, {'time': 'auto-native'}, measurements=mm)
+
+    with pytest.raises(ValueError):
+        _calculate_chunk_sizes(sources, gbox, 'auto', measurements=mm)
+
+    xx = Datacube.load_data(sources, gbox, mm, dask_chunks='auto-native')
+    assert xx.aa.data.chunksize == (1, 256, 512)
+    np.testing.assert_array_equal(aa, xx.aa.values[0])
+
+    # files are found through patch_url, failures to open them are logged
+    fname, = tmpdir.glob('ds1-*.tiff')
+    moved = fname.rename(fname.with_name('moved.tiff'))
+
+    def patch_url(url):
+        return url.replace(fname.name, moved.name)
+
+    with dask.config.set({'array.chunk-size': '33KiB'}):
+        assert _calculate_chunk_sizes(sources, gbox, 'auto-native', measurements=mm,
+                                      patch_url=patch_url) == ((1,), (128, 128))
+        assert not caplog.records
+
+        # no tile size: square chunks within the budget, not aligned to 32x32 tiles
+        assert _calculate_chunk_sizes(sources, gbox, 'auto-native', measurements=mm) == ((1,), (129, 129))
+        assert any(r.levelname == 'WARNING' and 'tile shape' in r.getMessage() for r in caplog.records)
+
+    xx = Datacube.load_data(sources, gbox, mm, dask_chunks='auto-native', patch_url=patch_url)
+    np.testing.assert_array_equal(aa, xx.aa.values[0])
+
+
+def test_dask_load_graph(tmpdir):
+    from dask.highlevelgraph import MaterializedLayer
+    from datacube.api.core import _LoadLayer
+    from datacube.utils.geometry import gbox as gbx
+
+    tmpdir = Path(str(tmpdir))
+    spatial = dict(resolution=(15, -15),
+                   offset=(11230, 1381110),)
+
+    nodata = -999
+    aa = mk_test_image(64, 32, 'int16', nodata=nodata)
+    ds, gbox = gen_tiff_dataset([SimpleNamespace(name='aa', values=aa, nodata=nodata),
+                                 SimpleNamespace(name='bb', values=aa + 1, nodata=nodata)],
+                                tmpdir,
+                                prefix='ds1-',
+                                timestamp='2018-07-19',
+                                **spatial)
+    sources = Datacube.group_datasets([ds], 'time')
+    mm = [ds.product.measurements[n] for n in ('aa', 'bb')]
+
+    # dataset covers top-left corner only, most chunks are empty
+    gbox = gbx.pad_wh(gbox, 64*8, 32*8)
+    xx = Datacube.load_data(sources, gbox, mm, dask_chunks={'x': 64, 'y': 32})
+    assert xx.aa.data.numblocks == (1, 8, 8)
+
+    graphs = [xx[n].data.__dask_graph__() for n in ('aa', 'bb')]
+    layers = [[layer for layer in g.layers.values() if isinstance(layer, _LoadLayer)][0] for g in graphs]
+    ds_layers = [[name for name, layer in g.layers.items() if isinstance(layer, MaterializedLayer)]
+                 for g in graphs]
+
+    # datasets are shared between measurements, only non-empty chunks are stored
+    assert ds_layers[0] == ds_layers[1]
+    assert len(ds_layers[0]) == 1
+    for layer in layers:
+        assert len(layer.srcs) == 1
+        assert len(layer) == 64
+        assert not layer.is_materialized()
+        assert len(layer.get_output_keys()) == 64
+        with pytest.raises(KeyError):
+            layer[(layer.name, 0, 8, 0)]
+
+    yy = Datacube.load_data(sources, gbox, mm)
+    np.testing.assert_array_equal(yy.aa.values, xx.aa.values)
+    np.testing.assert_array_equal(yy.bb.values, xx.bb.values)
+    np.testing.assert_array_equal(aa + 1, xx.bb.values[0, :32, :64])
+    assert (xx.aa.values[0, 32:, :] == nodata).all()
+
+
+def test_dask_group_bands_shared_roi(tmpdir, monkeypatch):
+    from datacube.api.core import per_band_load_data_settings
+    from datacube.storage import _read
+    from datacube.utils.geometry import gbox as gbx
+
+    tmpdir = Path(str(tmpdir))
+    nodata = -999
+    aa = mk_test_image(96, 64, 'int16', nodata=nodata)
+    names = ('aa', 'bb', 'cc')
+    ds, gbox = gen_tiff_dataset([SimpleNamespace(name=name, values=aa + i, nodata=nodata)
+                                 for i, name in enumerate(names)],
+                                tmpdir, prefix='ds1-', timestamp='2018-07-19',
+                                resolution=(15, -15), offset=(11230, 1381110))
+    sources = Datacube.group_datasets([ds], 'time')
+    mm = per_band_load_data_settings([ds.product.measurements[n] for n in names], resampling='bilinear')
+
+    # ROI each band read starts from, before it is padded for the warp
+    rois = []
+    compute_reproject_roi = _read.compute_reproject_roi
+
+    def spy(*args, **kwargs):
+        rr = compute_reproject_roi(*args, **kwargs)
+        rois.append((rr.roi_src, rr.roi_dst))
+        return rr
+
+    monkeypatch.setattr(_read, 'compute_reproject_roi', spy)
+
+    # sub-pixel shift inside the source: all band files have the same geobox and
+    # share one (cached) ROI
+    dst_gbox = gbx.translate_pix(gbox, 0.3, 0.3)[10:40, 20:60]
+    xx = Datacube.load_data(sources, dst_gbox, mm, dask_chunks={}, dask_group_bands=True)
+    xx = xx.compute(scheduler='synchronous')
+
+    # later bands are not padded again
+    assert len(rois) == len(names)
+    assert rois.count(rois[0]) == len(names)
+
+    for m in mm:
+        yy = Datacube.load_data(sources, dst_gbox, [m])
+        np.testing.assert_array_equal(yy[m.name].values, xx[m.name].values)
+
+
+def test_dask_load_graph_cull(tmpdir):
+    import pickle
+    import dask
+    from datacube.api.core import _LoadLayer, _BandsLoadLayer
+    from datacube.utils.geometry import gbox as gbx
+
+    tmpdir = Path(str(tmpdir))
+    nodata = -999
+    aa = mk_test_image(64, 32, 'int16', nodata=nodata)
+    ds, gbox = gen_tiff_dataset([SimpleNamespace(name='aa', values=aa, nodata=nodata),
+                                 SimpleNamespace(name='bb', values=aa + 1, nodata=nodata)],
+                                tmpdir, prefix='ds1-', timestamp='2018-07-19',
+                                resolution=(15, -15), offset=(11230, 1381110))
+    sources = Datacube.group_datasets([ds], 'time')
+    mm = [ds.product.measurements[n] for n in ('aa', 'bb')]
+    gbox = gbx.pad_wh(gbox, 64*8, 32*8)
+
+    for group_bands in (False, True):
+        xx = Datacube.load_data(sources, gbox, mm, dask_chunks={'x': 64, 'y': 32}, dask_group_bands=group_bands)
+        arr = xx.bb.data
+        graph = arr.__dask_graph__()
+        name = arr.name
+
+        # one empty chunk: no load task and no dataset survive
+        culled = graph.cull({(name, 0, 7, 7)})
+        assert len(dict(culled)) == 1
+        assert all(isinstance(layer, _LoadLayer) and not layer.is_materialized()
+                   for layer in culled.layers.values())
+        assert len(pickle.dumps(culled)) < len(pickle.dumps(graph))
+
+        # the non-empty chunk keeps its dataset (and multi-band task)
+        culled = graph.cull({(name, 0, 0, 0), (name, 0, 7, 7)})
+        layer = culled.layers[name]
+        assert isinstance(layer, _LoadLayer) and len(layer) == 2 and len(layer.srcs) == 1
+        assert len(dict(culled)) == (4 if group_bands else 3)
+        if group_bands:
+            assert any(isinstance(layer, _BandsLoadLayer) and len(layer) == 1 for layer in culled.layers.values())
+        with pytest.raises(KeyError):
+            layer[(name, 0, 1, 1)]
+
+        yy = dask.threaded.get(culled, [(name, 0, 0, 0), (name, 0, 7, 7)])
+        np.testing.assert_array_equal(yy[0][0], aa + 1)
+        assert (yy[1] == nodata).all()
+
+        # optimising a slice culls the graph the same way
+        corner, = dask.optimize(arr[:, :32, :64])
+        np.testing.assert_array_equal(corner.compute(scheduler='synchronous')[0], aa + 1)
+        assert len(corner.__dask_graph__()) < len(graph)
+
+
+def test_dask_group_bands(data_folder, monkeypatch):
+    import rasterio
+    from datacube.api.core import _BandsLoadLayer
+    from datacube.storage import _rio
+
+    base = "file://" + str(data_folder) + "/metadata.yml"
+    im, meta = rio_slurp(str(data_folder) + '/test.tif')
+    ds = mk_sample_dataset([dict(name='a', path='test.tif'),
+                            dict(name='b', path='test.tif', band=2)], base, geobox=meta.gbox)
+    sources = Datacube.group_datasets([ds], 'time')
+    mm = [ds.product.measurements[n] for n in ('a', 'b')]
+
+    n_opens = 0
+    rio_open = rasterio.open
+
+    def counting_open(*args, **kw):
+        nonlocal n_opens
+        n_opens += 1
+        return rio_open(*args, **kw)
+
+    monkeypatch.setattr(_rio.rasterio, 'open', counting_open)
+
+    xx = Datacube.load_data(sources, meta.gbox, mm, dask_chunks={}, dask_group_bands=True)
+    layers = [layer for layer in xx.a.data.__dask_graph__().layers.values()
+              if isinstance(layer, _BandsLoadLayer)]
+    assert len(layers) == 1
+    assert layers[0].band_names == ['a', 'b']
+    assert len(layers[0]) == 1
+
+    xx = xx.compute(scheduler='synchronous')
+    np.testing.assert_array_equal(im[0], xx.a.values[0])
+    np.testing.assert_array_equal(im[1], xx.b.values[0])
+    assert n_opens == 1
+
+    n_opens = 0
+    yy = Datacube.load_data(sources, meta.gbox, mm, dask_chunks={}).compute(scheduler='synchronous')
+    assert n_opens == 2
+    np.testing.assert_array_equal(yy.a.values, xx.a.values)
+    np.testing.assert_array_equal(yy.b.values, xx.b.values)
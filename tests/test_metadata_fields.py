@@ -199,3 +199,34 @@ def test_bad_field_definition():
 def test_expression():
     assert Expression() == Expression()
     assert (Expression() == object()) is False
+
+
+def test_range_expressions():
+    xx = get_dataset_fields(METADATA_DOC_RANGES)
+    x_range, t_range = xx['x_range'], xx['t_range']
+
+    assert x_range.between(0, 1).evaluate(SAMPLE_DOC_RANGES)
+    assert x_range.between(2, 3).evaluate(SAMPLE_DOC_RANGES)
+    assert x_range.between(4, None).evaluate(SAMPLE_DOC_RANGES)
+    assert not x_range.between(4.5, 7).evaluate(SAMPLE_DOC_RANGES)
+    assert not x_range.between(None, 0.5).evaluate(SAMPLE_DOC_RANGES)
+    assert not x_range.between(0, 10).evaluate({})
+
+    assert (x_range == 2.5).evaluate(SAMPLE_DOC_RANGES)
+    assert not (x_range == 5).evaluate(SAMPLE_DOC_RANGES)
+
+    # Naive datetimes in documents are treated as UTC
+    utc = datetime.timezone.utc
+    assert t_range.between(datetime.datetime(1999, 4, 15, 12, tzinfo=utc), None).evaluate(SAMPLE_DOC_RANGES)
+    assert not t_range.between(datetime.datetime(1999, 4, 17, tzinfo=utc),
+                               datetime.datetime(1999, 4, 18, tzinfo=utc)).evaluate(SAMPLE_DOC_RANGES)
+
+
+def test_value_between_expression():
+    xx = get_dataset_fields(METADATA_DOC)
+    assert xx['x_integer'].between(4466778, 4466779).evaluate(SAMPLE_DOC)
+    assert xx['x_integer'].between(None, 4466778).evaluate(SAMPLE_DOC)
+    assert not xx['x_integer'].between(0, 10).evaluate(SAMPLE_DOC)
+    assert not xx['x_integer'].between(0, 10).evaluate({})
+    assert xx['x_datetime'].between(datetime.datetime(1999, 1, 1, tzinfo=datetime.timezone.utc),
+                                    None).evaluate(SAMPLE_DOC)
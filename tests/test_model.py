@@ -4,10 +4,12 @@
 # SPDX-License-Identifier: Apache-2.0
 import pytest
 import numpy
+import uuid
 from copy import deepcopy
 from datacube.testutils import mk_sample_dataset, mk_sample_product
 from datacube.model import (DatasetType, GridSpec, Measurement,
-                            MetadataType, Range, ranges_overlap)
+                            MetadataType, Range, ranges_overlap, CompactDataset,
+                            materialise_datasets)
 from datacube.utils import geometry
 from datacube.utils.documents import InvalidDocException
 from datacube.storage import measurement_paths
@@ -38,6 +40,23 @@ def test_gridspec():
     assert (gs == {}) is False
 
 
+def test_gridspec_tiles_incidence():
+    gs = GridSpec(crs=geometry.CRS('EPSG:4326'), tile_size=(1, 1), resolution=(-0.1, 0.1), origin=(10, 10))
+    polys = [geometry.polygon([(10, 12.2), (10.8, 13), (13, 10.8), (12.2, 10), (10, 12.2)], crs=gs.crs),
+             gs.tile_geobox((3, 4)).extent,
+             gs.tile_geobox((-1, 2)).extent.to_crs('EPSG:3857')]
+
+    for tile_buffer in (None, (0.15, 0.15)):
+        ipoly, tile_index = gs.tiles_incidence(polys, tile_buffer=tile_buffer)
+        expect = [(i, idx) for i, poly in enumerate(polys)
+                  for idx, _ in gs.tiles_from_geopolygon(poly, tile_buffer=tile_buffer)]
+        assert list(zip(ipoly.tolist(), map(tuple, tile_index.tolist()))) == expect
+
+    # neighbours of a tile only touch it
+    ipoly, tile_index = gs.tiles_incidence(polys[1:2])
+    assert tile_index.tolist() == [[3, 4]]
+
+
 def test_gridspec_upperleft():
     """ Test to ensure grid indexes can be counted correctly from bottom left or top left
     """
@@ -74,6 +93,92 @@ def test_dataset_basics():
     assert ds.transform is None
 
 
+def test_dataset_crs_is_shared():
+    gbox = AlbersGS.tile_geobox((15, -40))
+    ds1 = mk_sample_dataset([dict(name='a')], geobox=gbox)
+    ds2 = mk_sample_dataset([dict(name='a')], geobox=gbox, id='0a2b3c4d-8484-44fc-8102-79184eab85dd')
+    assert ds1.crs == gbox.crs
+    assert ds1.crs is ds2.crs
+    assert ds1._gs is ds1._gs
+
+
+def test_compact_dataset():
+    import pickle
+
+    ds = mk_sample_dataset([dict(name='a')], geobox=AlbersGS.tile_geobox((15, -40)))
+    loaded = []
+
+    def loader(ids):
+        loaded.extend(ids)
+        return [ds]
+
+    cds = CompactDataset.from_dataset(ds, loader=loader)
+    assert cds.id == ds.id
+    assert cds.product is ds.product
+    assert cds.type is ds.product
+    assert cds.center_time == ds.center_time
+    assert cds.crs == ds.crs
+    assert cds.extent == ds.extent
+    assert cds.uris == ds.uris
+    assert cds.is_active
+    assert cds == ds and ds == cds
+    assert hash(cds) == hash(ds)
+    assert str(cds) == repr(cds)
+    assert not hasattr(cds, '__dict__')
+    assert loaded == []
+    assert not cds.is_materialised
+
+    # anything else is read back on first access
+    assert cds.format == 'GeoTiff'
+    assert cds.metadata_doc is ds.metadata_doc
+    assert loaded == [ds.id]
+    assert cds.is_materialised
+
+    # pickles as the full dataset
+    ds2 = pickle.loads(pickle.dumps(CompactDataset.from_dataset(ds, loader=loader)))
+    assert not isinstance(ds2, CompactDataset)
+    assert ds2.metadata_doc == ds.metadata_doc
+
+    # without a loader the dataset is kept
+    assert CompactDataset.from_dataset(ds).materialise() is ds
+
+    with pytest.raises(ValueError):
+        _ = CompactDataset.from_dataset(ds, loader=lambda ids: []).metadata_doc
+
+    # from fields read without the metadata document
+    cds = CompactDataset.from_grid_spatial(ds.id, ds.product, ds.time, ds._gs, uris=ds.uris, loader=loader)
+    assert cds.crs is ds.crs
+    assert cds.extent == ds.extent
+    assert cds.center_time == ds.center_time
+    assert not cds.is_materialised
+    assert CompactDataset.from_grid_spatial(ds.id, ds.product, ds.time, None).extent is None
+
+
+def test_materialise_datasets():
+    gbox = AlbersGS.tile_geobox((15, -40))
+    dss = [mk_sample_dataset([dict(name='a')], geobox=gbox, id=str(uuid.uuid4())) for _ in range(5)]
+    by_id = {ds.id: ds for ds in dss}
+    calls = []
+
+    def loader(ids):
+        calls.append(list(ids))
+        # missing datasets are skipped
+        return [by_id[id_] for id_ in ids if id_ != dss[-1].id]
+
+    compact = [CompactDataset.from_dataset(ds, loader=loader) for ds in dss]
+    # duplicates, full and already materialised datasets are not read again
+    materialise_datasets(compact + compact[:1] + [dss[0], CompactDataset.from_dataset(dss[1])], batch_size=2)
+    assert calls == [[ds.id for ds in dss[:2]], [ds.id for ds in dss[2:4]], [dss[4].id]]
+    assert all(cds.materialise() is ds for cds, ds in zip(compact[:4], dss))
+    assert not compact[4].is_materialised
+
+    calls.clear()
+    materialise_datasets(compact)
+    assert calls == [[dss[4].id]]
+    with pytest.raises(ValueError):
+        compact[4].materialise()
+
+
 def test_dataset_measurement_paths():
     format = 'GeoTiff'
 
@@ -7,7 +7,9 @@ Test utility functions from :module:`datacube.utils`
 
 
 """
+import datetime
 import os
+from io import BytesIO
 from pathlib import Path
 from collections import OrderedDict
 from types import SimpleNamespace
@@ -36,6 +38,13 @@ from datacube.utils.documents import (
     _set_doc_offset,
     transform_object_tree,
     metadata_subset,
+    load_from_json,
+    load_from_yaml,
+    set_document_loader,
+    get_document_loader,
+    _yaml_loader,
+    NoDatesSafeLoader,
+    NoDatesPySafeLoader,
 )
 from datacube.utils.serialise import jsonify_document
 from datacube.utils.uris import as_url
@@ -157,6 +166,45 @@ def test_parse_yaml():
     assert parse_yaml('a: 10') == {'a': 10}
 
 
+@pytest.fixture
+def document_loader():
+    previous = get_document_loader()
+    yield set_document_loader
+    set_document_loader(previous)
+
+
+def test_document_loaders(document_loader, sample_document_files, data_folder):
+    docs = {}
+    for name in ('fast', 'python'):
+        document_loader(name)
+        assert get_document_loader() == name
+        docs[name] = [list(read_documents(fname)) for fname, _ in sample_document_files]
+        docs[name].append(list(read_documents(os.path.join(data_folder, 'eo3.yaml'))))
+        docs[name].append(list(load_from_json(BytesIO(b'{"a": NaN, "b": [1, 2.5, "2020-01-01"]}'))))
+
+    assert docs['fast'] == docs['python']
+
+    with pytest.raises(ValueError):
+        document_loader('no-such-loader')
+
+
+def test_document_loaders_yaml_dates(document_loader):
+    doc = b"time: 2020-01-01T10:20:30Z\ndates: [2020-01-01, '2020-01-02']\n"
+
+    for name in ('fast', 'python'):
+        document_loader(name)
+        assert _yaml_loader() is (NoDatesPySafeLoader if name == 'python' else NoDatesSafeLoader)
+        # Unquoted timestamps are not parsed into dates
+        [parsed] = load_from_yaml(BytesIO(doc))
+        assert parsed == {'time': '2020-01-01T10:20:30Z', 'dates': ['2020-01-01', '2020-01-02']}
+        assert isinstance(parsed['time'], str)
+        assert isinstance(parsed['dates'][0], str)
+
+        [parsed] = load_from_yaml(BytesIO(doc), parse_dates=True)
+        assert isinstance(parsed['time'], datetime.datetime)
+        assert isinstance(parsed['dates'][0], datetime.date)
+
+
 def test_read_docs_from_local_path(sample_document_files):
     _test_read_docs_impl(sample_document_files)
 
@@ -2,10 +2,15 @@
 #
 # Copyright (c) 2015-2024 ODC Contributors
 # SPDX-License-Identifier: Apache-2.0
+from concurrent.futures import ThreadPoolExecutor
 from queue import Queue
+
+import pytest
+
 from datacube.utils.generic import (
     qmap,
     it2q,
+    ordered_executor_map,
     map_with_lookahead,
     thread_local_cache,
 )
@@ -25,6 +30,34 @@ def test_map_with_lookahead():
     assert list(map_with_lookahead(iter([1]), if_many=if_many)) == [1]
 
 
+def test_ordered_executor_map():
+    consumed = []
+
+    def src(n):
+        for i in range(n):
+            consumed.append(i)
+            yield i
+
+    def slow_square(x):
+        if x == 7:
+            raise ValueError(x)
+        return x * x
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        assert list(ordered_executor_map(slow_square, src(7), pool, 3)) == [x * x for x in range(7)]
+
+        consumed.clear()
+        results = ordered_executor_map(slow_square, src(100), pool, 4)
+        assert next(results) == 0
+        assert len(consumed) <= 5
+        results.close()
+
+        results = ordered_executor_map(slow_square, src(10), pool, 2)
+        assert [next(results) for _ in range(7)] == [x * x for x in range(7)]
+        with pytest.raises(ValueError):
+            next(results)
+
+
 def test_qmap():
     q = Queue(maxsize=100)
     it2q(range(10), q)
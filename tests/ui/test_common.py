@@ -99,3 +99,29 @@ def test_ui_path_doc_stream(httpserver):
     for input_path, (doc, resolved_path) in zip(input_paths, ui_path_doc_stream(input_paths)):
         assert doc == {}
         assert input_path == resolved_path
+
+
+@pytest.mark.parametrize("processes", [False, True])
+def test_ui_path_doc_stream_workers(processes):
+    files = {f'ds{i}.yaml': f'id: {i}\n' for i in range(10)}
+    files['ds3.yaml'] = 'id: 3\n---\nid: 33\n'
+    files['ds5.yaml'] = 'id: [5\n'
+    out_dir = Path(write_files(files))
+    input_paths = [out_dir / f'ds{i}.yaml' for i in range(10)] + [out_dir / 'missing.yaml']
+
+    class Logger:
+        def __init__(self):
+            self.errors = []
+
+        def error(self, msg, *args):
+            self.errors.append(msg % args)
+
+    serial_log, parallel_log = Logger(), Logger()
+    expect = [(uri, doc.doc) for uri, doc in ui_path_doc_stream(input_paths, logger=serial_log)]
+    got = [(uri, doc.doc) for uri, doc in ui_path_doc_stream(input_paths, logger=parallel_log,
+                                                             workers=3, processes=processes)]
+
+    assert got == expect
+    assert [doc['id'] for _, doc in got] == [0, 1, 2, 3, 33, 4, 6, 7, 8, 9]
+    assert sorted(parallel_log.errors) == sorted(serial_log.errors)
+    assert len(parallel_log.errors) == 2
@@ -6,6 +6,8 @@
 Module
 """
 
+import pytest
+
 from datacube.ui.task_app import task_app, run_tasks, wrap_task
 import datacube.executor
 
@@ -182,6 +184,109 @@ def test_run_tasks():
     run_tasks(tasks, executor, task_func)
 
 
+@pytest.mark.parametrize('batch_size', [1, 2, 10])
+def test_run_tasks_batches_retries_and_stats(batch_size):
+    executor = datacube.executor.SerialExecutor()
+    attempts = {}
+
+    def task_func(task):
+        attempts[task['val']] = attempts.get(task['val'], 0) + 1
+        if task['val'] == 1 and attempts[1] < 3:
+            raise RuntimeError('flaky')
+        if task['val'] == 4:
+            raise RuntimeError('broken')
+        return task['val']
+
+    results = []
+    stats = []
+    summary = run_tasks(({'val': i, 'tile_index': (i, 0)} for i in range(7)), executor, task_func,
+                        results.append, queue_size=3, batch_size=batch_size, max_retries=2,
+                        on_stats=stats.append)
+
+    assert sorted(results) == [0, 1, 2, 3, 5, 6]
+    assert (summary.successful, summary.failed, summary.skipped, summary.retried) == (6, 1, 0, 4)
+    assert attempts == {0: 1, 1: 3, 2: 1, 3: 1, 4: 3, 5: 1, 6: 1}
+    assert sorted(s.task_id for s in stats) == [str((i, 0)) for i in (0, 1, 2, 3, 5, 6)]
+    assert [s.attempts for s in stats if s.task_id == '(1, 0)'] == [3]
+    assert all(s.seconds >= 0 for s in stats)
+    assert summary.max_task_seconds >= 0
+
+
+class _ThreadExecutor:
+    """ Same interface as the datacube executors, over a thread pool """
+    def __init__(self, workers):
+        from concurrent.futures import ThreadPoolExecutor
+        self._pool = ThreadPoolExecutor(workers)
+
+    def submit(self, func, *args, **kwargs):
+        return self._pool.submit(func, *args, **kwargs)
+
+    def map(self, func, iterable):
+        return [self.submit(func, data) for data in iterable]
+
+    @staticmethod
+    def next_completed(futures, default):
+        from concurrent.futures import wait, FIRST_COMPLETED
+        done, pending = wait(futures, return_when=FIRST_COMPLETED)
+        future = next(iter(done), default)
+        return future, [f for f in futures if f is not future]
+
+    @staticmethod
+    def result(future):
+        return future.result()
+
+    @staticmethod
+    def release(future):
+        pass
+
+
+def test_run_tasks_keeps_queue_full():
+    import threading
+
+    executor = _ThreadExecutor(2)
+    release_slow = threading.Event()
+    done = []
+
+    def task_func(task):
+        if task == 'slow':
+            # only released once every quick task has been processed
+            assert release_slow.wait(10)
+        return task
+
+    def process_result(result):
+        done.append(result)
+        if len(done) == 5:
+            release_slow.set()
+
+    tasks = ['slow'] + ['quick%d' % i for i in range(5)]
+    summary = run_tasks(iter(tasks), executor, task_func, process_result, queue_size=2)
+    assert summary.failed == 0
+    assert done[-1] == 'slow'
+    assert sorted(done[:-1]) == sorted(tasks[1:])
+
+
+def test_run_tasks_checkpoint(tmpdir):
+    executor = datacube.executor.SerialExecutor()
+    checkpoint = str(tmpdir.join('done.txt'))
+    done = []
+
+    def task_func(task):
+        if task == 'c':
+            raise RuntimeError('interrupted')
+        return task
+
+    summary = run_tasks(iter('abcd'), executor, task_func, done.append, checkpoint_file=checkpoint)
+    assert (summary.successful, summary.failed, summary.skipped) == (3, 1, 0)
+    assert open(checkpoint).read().split() == done == ['a', 'b', 'd']
+
+    # resumed run only does what is left
+    done.clear()
+    summary = run_tasks(iter('abcd'), executor, lambda task: task, done.append, checkpoint_file=checkpoint)
+    assert (summary.successful, summary.failed, summary.skipped) == (1, 0, 3)
+    assert done == ['c']
+    assert sorted(open(checkpoint).read().split()) == ['a', 'b', 'c', 'd']
+
+
 def test_wrap_task():
     def task_with_args(task, a, b):
         return (task, a, b)